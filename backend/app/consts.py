@@ -54,6 +54,19 @@ ALL_COLLECTION_LIST = [
     Collection.OTHER_RP,
 ]
 
+# Resource types of the collections which are indexed within all_collection
+ALL_COLLECTION_TYPES = {
+    Collection.PUBLICATION: ResourceType.PUBLICATION,
+    Collection.DATASET: ResourceType.DATASET,
+    Collection.SOFTWARE: ResourceType.SOFTWARE,
+    Collection.SERVICE: ResourceType.SERVICE,
+    Collection.DATA_SOURCE: ResourceType.DATA_SOURCE,
+    Collection.TRAINING: ResourceType.TRAINING,
+    Collection.GUIDELINE: ResourceType.GUIDELINE,
+    Collection.BUNDLE: ResourceType.BUNDLE,
+    Collection.OTHER_RP: ResourceType.OTHER_RP,
+}
+
 
 ResearchProductCollection: TypeAlias = Literal[
     Collection.PUBLICATION, Collection.DATASET, Collection.SOFTWARE, Collection.OTHER_RP
@@ -122,6 +135,7 @@ DEFAULT_QF = (
 )
 
 SortUi: TypeAlias = Literal["pdmr", "pdlr", "dmr", "dlr", "mp", "r", "default", ""]
+ExportFormat: TypeAlias = Literal["csv", "jsonl"]
 
 DEFAULT_SORT = ["score desc", "id asc"]
 DEFAULT_SPECIAL_COL_SORT = ["eosc_score desc", "score desc", "id asc"]
@@ -1,11 +1,11 @@
 """Base for repositories"""
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 # pylint: disable=too-few-public-methods
 class BaseRepository:
     """Base for repositories"""
 
-    def __init__(self, db: Session) -> None:
+    def __init__(self, db: AsyncSession) -> None:
         self.db = db
@@ -12,12 +12,12 @@ from app.models import Dump
 class DumpsRepository(BaseRepository):
     """All database actions associated with Dumps"""
 
-    def create_dump(self, *, new_dump: Dump):
+    async def create_dump(self, *, new_dump: Dump):
         """Creates a new Dump"""
         self.db.add(new_dump)
-        self.db.commit()
+        await self.db.commit()
 
-    def list_all_dumps(self) -> list[DumpModel]:
+    async def list_all_dumps(self) -> list[DumpModel]:
         """
         Select all Dumps and its DumpElements, and return its API mapping.
         """
@@ -26,7 +26,7 @@ class DumpsRepository(BaseRepository):
             .options(selectinload(Dump.elements))
             .order_by(Dump.created_at.desc())
         )
-        dumps = self.db.execute(stmt).scalars().all()
+        dumps = (await self.db.execute(stmt)).scalars().all()
 
         out = []
         for dump in dumps:
@@ -1,24 +1,25 @@
 """Database-specific dependencies"""
 
-from typing import Callable, Type
+from typing import AsyncIterator, Callable, Type
 
 from fastapi import Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.requests import Request
 
 from app.db.repositories.base import BaseRepository
 
 
-def get_db(request: Request) -> Session:
-    """Extract Session from application state"""
+async def get_db(request: Request) -> AsyncIterator[AsyncSession]:
+    """Session of the request, taking a connection from the application DB pool"""
     # pylint: disable=protected-access
-    return request.app.state._db
+    async with request.app.state._session_local() as db:
+        yield db
 
 
 def get_repo(repo_type: Type[BaseRepository]) -> Callable:
     """Dynamically return a getter for a repo_type"""
 
-    def get_repository(db: Session = Depends(get_db)) -> repo_type:
+    def get_repository(db: AsyncSession = Depends(get_db)) -> repo_type:
         return repo_type(db)
 
     return get_repository
@@ -1,5 +1,6 @@
 """UserActions-specific dependencies"""
 
+import asyncio
 import datetime
 import json
 import logging
@@ -8,20 +9,35 @@ from typing import Optional, Union
 from urllib.parse import urlparse
 
 import stomp
-from stomp.exception import ConnectFailedException
+from stomp.exception import NotConnectedException
 
 from app.schemas.session_data import SessionData
 from app.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Queued after the last user action to stop the sending task
+_STOP = object()
+
 
 class UserActionClient:
-    """Wrapper for the STOMP client which sends valid user action to the databus"""
+    """
+    Wrapper for the STOMP client which sends valid user actions to the databus.
+
+    The connection is kept open between sends, with heartbeats enabled,
+    and it's re-established once it's lost.
+    """
 
     # pylint: disable=too-many-arguments
     def __init__(
-        self, host: str, port: int, username: str, password: str, topic: str, ssl: bool
+        self,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        topic: str,
+        ssl: bool,
+        heartbeat: int = 0,
     ):
         self.host = host
         self.port = port
@@ -30,16 +46,47 @@ class UserActionClient:
         self.topic = topic
         self.ssl = ssl
         hosts_and_ports = [(self.host, self.port)]
-        self.client = stomp.Connection(host_and_ports=hosts_and_ports)
+        self.client = stomp.Connection(
+            host_and_ports=hosts_and_ports, heartbeats=(heartbeat, heartbeat)
+        )
         if self.ssl:
             self.client.set_ssl(hosts_and_ports)
 
     def connect(self) -> None:
-        """Connect stomp internal client, this function must be called before using `send`"""
-        self.client.connect(self.username, self.password, wait=True)
+        """Connect stomp internal client unless it's already connected"""
+        if not self.client.is_connected():
+            self.client.connect(self.username, self.password, wait=True)
+
+    def send_messages(self, messages: list[str]) -> None:
+        """
+        Send serialized user actions to databus.
+        Reconnects and resends the unsent messages once if the connection is lost.
+        """
+        sent = 0
+        for attempt in range(2):
+            try:
+                self.connect()
+                for message in messages[sent:]:
+                    self.client.send(
+                        self.topic, message, content_type="application/json"
+                    )
+                    sent += 1
+                return
+            except (NotConnectedException, OSError):
+                if attempt:
+                    raise
+                logger.warning("Connection to databus lost, reconnecting")
+                self.disconnect()
+
+    def disconnect(self) -> None:
+        """Disconnect stomp internal client, ignoring errors of a broken connection"""
+        try:
+            self.client.disconnect()
+        except (NotConnectedException, OSError):
+            pass
 
     # pylint: disable=too-many-arguments
-    def send(
+    def make_message(
         self,
         session: SessionData,
         url: str,
@@ -49,8 +96,8 @@ class UserActionClient:
         recommendation: bool,
         target_id: str,
         recommendation_visit_id: Optional[str],
-    ) -> None:
-        """Send user data to databus. Ensure that `.connect()` method has been called before."""
+    ) -> str:
+        """Create serialized user action, as expected by databus consumers"""
 
         # this hack is required for legacy purposes.
         message = json.dumps(
@@ -66,13 +113,7 @@ class UserActionClient:
                 recommendation_visit_id,
             )
         )
-
-        self.client.send(
-            self.topic,
-            json.dumps(message),
-            content_type="application/json",
-        )
-        self.client.disconnect()
+        return json.dumps(message)
 
     # pylint: disable=too-many-arguments
     def _make_user_action(
@@ -128,45 +169,113 @@ class UserActionClient:
         return user_action
 
 
-def user_actions_client() -> UserActionClient | None:
-    """User actions databus client dependency"""
+class UserActionPublisher:
+    """
+    Publishes user actions to databus in the background.
+
+    Actions are buffered in a bounded queue and sent in batches through a single
+    persistent connection, so requests are never blocked by the databus.
+    Actions are dropped when the queue is full or when the publisher isn't running.
+    """
+
+    def __init__(self, client: UserActionClient, queue_size: int, batch_size: int):
+        self.client = client
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    # pylint: disable=too-many-arguments
+    def publish(
+        self,
+        session: SessionData,
+        url: str,
+        page_id: str,
+        resource_id: Union[str, int],
+        resource_type: str,
+        recommendation: bool,
+        target_id: str,
+        recommendation_visit_id: Optional[str],
+    ) -> bool:
+        """Queue user action to be sent. Returns whether it was queued"""
+        if self._queue is None:
+            logger.debug("User actions publisher is not running, user action not sent")
+            return False
+
+        message = self.client.make_message(
+            session,
+            url,
+            page_id,
+            resource_id,
+            resource_type,
+            recommendation,
+            target_id,
+            recommendation_visit_id,
+        )
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            logger.warning("User actions queue is full, user action dropped")
+            return False
+        return True
+
+    def start(self) -> None:
+        """Start sending the queued user actions in the background"""
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._task = asyncio.create_task(self._send_continuously(self._queue))
+
+    async def stop(self) -> None:
+        """
+        Stop accepting user actions, wait until the queued ones are sent and disconnect.
+        The sending task isn't cancelled, as a batch being sent in a worker thread
+        can't be interrupted. Instead, it's signalled to finish once the queue is drained.
+        """
+        if self._task is None:
+            return
+        queue, self._queue = self._queue, None
+        await queue.put(_STOP)
+        await self._task
+        self._task = None
+        await asyncio.to_thread(self.client.disconnect)
+
+    async def _send_continuously(self, queue: asyncio.Queue) -> None:
+        while True:
+            message = await queue.get()
+            if message is _STOP:
+                return
+            messages = [message]
+            while len(messages) < self.batch_size and not queue.empty():
+                message = queue.get_nowait()
+                if message is _STOP:
+                    await self._flush(messages)
+                    return
+                messages.append(message)
+            await self._flush(messages)
+
+    async def _flush(self, messages: list[str]) -> None:
+        try:
+            await asyncio.to_thread(self.client.send_messages, messages)
+        # pylint: disable=broad-except
+        except Exception:
+            logger.exception("Could not send %s user actions", len(messages))
 
-    client = UserActionClient(
+
+user_actions_publisher = UserActionPublisher(
+    UserActionClient(
         settings.STOMP_HOST,
         settings.STOMP_PORT,
         settings.STOMP_LOGIN,
         settings.STOMP_PASS,
         settings.STOMP_USER_ACTIONS_TOPIC,
         settings.STOMP_SSL,
-    )
-    try:
-        client.connect()
-        return client
-    except ConnectFailedException:
-        logger.exception("Could not instantiate mqtt client")
-        return None
-
-
-# pylint: disable=too-many-arguments
-def send_user_action_bg_task(
-    client: UserActionClient,
-    session: SessionData,
-    url: str,
-    page_id: str,
-    resource_id: str,
-    resource_type: str,
-    recommendation: bool,
-    target_id: str,
-    recommendation_visit_id: Optional[str],
-):
-    """Simple wrapper function which can be used 'as is' in fastapi's BackgroundTask"""
-    client.send(
-        session,
-        url,
-        page_id,
-        resource_id,
-        resource_type,
-        recommendation,
-        target_id,
-        recommendation_visit_id,
-    )
+        settings.STOMP_HEARTBEAT,
+    ),
+    queue_size=settings.USER_ACTIONS_QUEUE_SIZE,
+    batch_size=settings.USER_ACTIONS_BATCH_SIZE,
+)
+
+
+def get_user_actions_publisher() -> UserActionPublisher:
+    """User actions databus publisher dependency"""
+    return user_actions_publisher
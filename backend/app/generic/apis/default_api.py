@@ -51,4 +51,4 @@ async def dumps_get(
 ) -> DumpResults:
     """Returns available dumps"""
     # pylint: disable=unused-argument
-    return DumpResults(dumps=dumps_repo.list_all_dumps())
+    return DumpResults(dumps=await dumps_repo.list_all_dumps())
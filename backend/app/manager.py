@@ -1,21 +1,30 @@
 """Manage application from cmd"""
 
+import asyncio
 from datetime import datetime, timezone
 
 import typer
 
 from .db.repositories.dumps import DumpsRepository
 from .models import Dump, DumpElement
-from .tasks import create_session_local
+from .tasks import create_db_engine, create_session_local
 
 db_group = typer.Typer()
 
 
+async def _create_dump(new_dump: Dump):
+    engine = create_db_engine()
+    try:
+        async with create_session_local(engine)() as db:
+            dumps_repo = DumpsRepository(db)
+            await dumps_repo.create_dump(new_dump=new_dump)
+    finally:
+        await engine.dispose()
+
+
 def create_dump(new_dump: Dump):
     """Create dump using a fresh DB session"""
-    with create_session_local()() as db:
-        dumps_repo = DumpsRepository(db)
-        dumps_repo.create_dump(new_dump=new_dump)
+    asyncio.run(_create_dump(new_dump))
 
 
 @db_group.command()
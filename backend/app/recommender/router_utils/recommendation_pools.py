@@ -0,0 +1,114 @@
+"""Pools of random items served when the recommender is unavailable"""
+
+import asyncio
+import logging
+import random
+import uuid
+from typing import Optional
+
+from httpx import AsyncClient
+
+from app.consts import COLLECTION_TO_PANEL_ID_MAP, Collection, PanelId
+from app.settings import settings
+from app.solr.operations import search
+from app.utils.http_client import Upstream, http_clients
+
+logger = logging.getLogger(__name__)
+
+# Type of the documents a panel is filled with
+PANEL_ID_TO_TYPE_MAP = {
+    PanelId.ALL: "publication",
+    PanelId.DATA_SOURCES: "data source",
+    PanelId.DATASETS: Collection.DATASET.value,
+    PanelId.OTHER_RESEARCH_PRODUCT: Collection.OTHER_RP.value,
+    PanelId.PUBLICATIONS: Collection.PUBLICATION.value,
+    PanelId.SERVICES: Collection.SERVICE.value,
+    PanelId.TRAININGS: Collection.TRAINING.value,
+    PanelId.SOFTWARE: Collection.SOFTWARE.value,
+    PanelId.BUNDLE: Collection.BUNDLE.value,
+}
+
+
+class RecommendationPools:
+    """
+    Id-only pools of random items per panel.
+
+    Pools are refreshed periodically in the background, so samples are served
+    without requests to Solr. A pool missing on request (e.g. before the first refresh)
+    is fetched on demand.
+    """
+
+    def __init__(self, size: int, refresh_interval: float):
+        self.size = size
+        self.refresh_interval = refresh_interval
+        self._pools: dict[PanelId, list[str]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def sample(self, collection: Collection, count: int = 3) -> list[str]:
+        """Return ids of random items of the collection panel"""
+        panel_id = COLLECTION_TO_PANEL_ID_MAP[collection]
+        pool = self._pools.get(panel_id)
+        if pool is None:
+            pool = await self.refresh_pool(http_clients.get(Upstream.SOLR), panel_id)
+        return random.sample(pool, k=min(count, len(pool)))
+
+    async def refresh(self, client: AsyncClient) -> None:
+        """Refresh the pools of all the panels"""
+        await asyncio.gather(
+            *(self.refresh_pool(client, panel_id) for panel_id in PANEL_ID_TO_TYPE_MAP)
+        )
+
+    async def refresh_pool(self, client: AsyncClient, panel_id: PanelId) -> list[str]:
+        """Replace the pool of the panel with a new random set of items.
+        The previous pool is kept if the refresh fails."""
+        try:
+            response = await search(
+                client,
+                Collection.ALL_COLLECTION,
+                q="*",
+                qf="id",
+                fq=[
+                    f'type:("{PANEL_ID_TO_TYPE_MAP[panel_id]}")',
+                    'language:"English"',
+                ],
+                # A new seed of the random sort field gives a new set of items
+                sort=[f"random_{uuid.uuid4().hex} asc"],
+                rows=self.size,
+                exact="false",
+                highlight=False,
+                fl=["id"],
+            )
+        # pylint: disable=broad-except
+        except Exception:
+            logger.exception("Could not refresh %s recommendation pool", panel_id.value)
+            return self._pools.get(panel_id, [])
+
+        pool = [doc["id"] for doc in response.data["response"]["docs"]]
+        self._pools[panel_id] = pool
+        return pool
+
+    def start(self) -> None:
+        """Start refreshing the pools in the background"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._refresh_periodically())
+
+    async def stop(self) -> None:
+        """Stop refreshing the pools"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            await self.refresh(http_clients.get(Upstream.SOLR))
+            await asyncio.sleep(self.refresh_interval)
+
+
+recommendation_pools = RecommendationPools(
+    settings.RECOMMENDATION_POOL_SIZE, settings.RECOMMENDATION_POOL_REFRESH_INTERVAL
+)
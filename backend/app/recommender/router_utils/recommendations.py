@@ -1,9 +1,7 @@
 import datetime
-import random
 import uuid
 
 import httpx
-from async_lru import alru_cache
 from httpx import AsyncClient
 
 from app.consts import Collection
@@ -12,9 +10,11 @@ from app.recommender.router_utils.common import (
     SolrRetrieveError,
     _get_panel,
 )
+from app.recommender.router_utils.recommendation_pools import recommendation_pools
 from app.schemas.session_data import SessionData
 from app.settings import settings
-from app.solr.operations import get, search
+from app.solr.error_handling import SolrDocumentNotFoundError
+from app.solr.operations import get_many
 
 
 async def get_recommended_uuids(
@@ -61,41 +61,29 @@ async def get_recommended_uuids(
         raise RecommenderError(message="Connection error") from e
 
 
-async def get_recommended_items(client: AsyncClient, uuids: list[str]):
+async def get_recommended_items(
+    client: AsyncClient, uuids: list[str], skip_missing: bool = False
+):
+    """Fetch the items with a single request, keeping the order of uuids"""
     try:
-        items = []
-        for item_uuid in uuids:
-            item = await get(client, Collection.ALL_COLLECTION, item_uuid)
-            items.append(item["doc"])
-        return items
+        docs = await get_many(client, Collection.ALL_COLLECTION, uuids)
     except httpx.ConnectError as e:
         raise SolrRetrieveError("Connection Error") from e
 
+    docs_by_id = {doc["id"]: doc for doc in docs}
+    if not skip_missing and any(
+        str(item_uuid) not in docs_by_id for item_uuid in uuids
+    ):
+        raise SolrDocumentNotFoundError()
+    return [
+        docs_by_id[str(item_uuid)]
+        for item_uuid in uuids
+        if str(item_uuid) in docs_by_id
+    ]
+
 
-# pylint: disable=unused-argument
-@alru_cache(maxsize=512)
 async def get_fixed_recommendations(
     collection: Collection, count: int = 3
 ) -> list[str]:
-    rows = 100
-    if collection == Collection.DATA_SOURCE:
-        collection = "data source"
-    if collection == Collection.ALL_COLLECTION:
-        collection = "publication"
-    fq = [f'type:("{collection}")', 'language:"English"']
-    async with httpx.AsyncClient() as client:
-        response = await search(
-            client,
-            Collection.ALL_COLLECTION,
-            q="*",
-            qf="id",
-            fq=fq,
-            sort=["id desc"],
-            rows=rows,
-            exact="false",
-        )
-    docs: list = response.data["response"]["docs"]
-    if len(docs) == 0:
-        return []
-
-    return [doc["id"] for doc in random.sample(docs, k=min(count, len(docs)))]
+    """Random items of the collection, served when the recommender is unavailable"""
+    return await recommendation_pools.sample(collection, count)
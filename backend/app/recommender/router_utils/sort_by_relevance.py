@@ -91,6 +91,9 @@ async def perform_sort_by_relevance(
 
 async def sort_docs(uuids: list[str], docs: list[dict]) -> list[dict]:
     """Sort documents based on returned uuids by sorting by relevance"""
-    sorted_docs = [doc for uuid in uuids for doc in docs if uuid == doc["id"]]
+    docs_by_id = {}
+    for doc in docs:
+        docs_by_id.setdefault(doc["id"], []).append(doc)
+    sorted_docs = [doc for uuid in uuids for doc in docs_by_id.get(uuid, [])]
 
     return sorted_docs
@@ -3,4 +3,5 @@
 from .recommend import recommend_post
 from .router import internal_api_router
 from .search import search_post
+from .stats import search_cache_stats
 from .web import web_api_router
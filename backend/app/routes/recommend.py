@@ -9,7 +9,8 @@ from app.consts import DEFAULT_SORT
 from app.recommender.operations import recommendations
 from app.routes.router import internal_api_router
 from app.settings import settings
-from app.solr.operations import search_dep
+from app.solr.operations import search_dep, solr_client_dep
+from app.utils.http_client import Upstream, http_clients
 
 from ..schemas.recommend_request import RecommendRequest
 
@@ -39,6 +40,7 @@ async def recommend_post(
         },
     ),
     search=Depends(search_dep),
+    client: AsyncClient = Depends(solr_client_dep),
 ):
     """
     Do a search against the specified collection, pass results to RS.
@@ -46,30 +48,29 @@ async def recommend_post(
     The q, qf, fq, sort params correspond to
     https://solr.apache.org/guide/8_11/query-syntax-and-parsing.html.
     """
-    async with AsyncClient() as client:
-        solr_response = await search(
-            client,
+    solr_response = await search(
+        client,
+        collection,
+        q=q,
+        qf=qf,
+        fq=fq,
+        sort=sort + DEFAULT_SORT,
+        rows=settings.RS_ROWS,
+        cursor="*",
+    )
+    try:
+        rs_response = await recommendations(
+            http_clients.get(Upstream.RECOMMENDER),
             collection,
+            solr_response.data["response"]["docs"],
+            context=request,
             q=q,
             qf=qf,
             fq=fq,
-            sort=sort + DEFAULT_SORT,
-            rows=settings.RS_ROWS,
-            cursor="*",
+            sort=sort,
         )
-        try:
-            rs_response = await recommendations(
-                client,
-                collection,
-                solr_response.data["response"]["docs"],
-                context=request,
-                q=q,
-                qf=qf,
-                fq=fq,
-                sort=sort,
-            )
-        except TransportError as e:
-            raise HTTPException(status_code=500, detail="Try again later") from e
+    except TransportError as e:
+        raise HTTPException(status_code=500, detail="Try again later") from e
     if rs_response.is_error:
         try:
             detail = rs_response.json()["detail"]
@@ -5,7 +5,7 @@ from httpx import AsyncClient
 
 from app.consts import DEFAULT_SORT
 from app.schemas.search_request import SearchRequest
-from app.solr.operations import search_dep
+from app.solr.operations import search_dep, solr_client_dep
 
 from .router import internal_api_router
 
@@ -29,6 +29,7 @@ async def search_post(
     cursor: str = Query("*", description="Cursor"),
     request: SearchRequest = Body(..., description="Request body"),
     search=Depends(search_dep),
+    client: AsyncClient = Depends(solr_client_dep),
 ):
     """
     Do a search against the specified collection.
@@ -41,19 +42,18 @@ async def search_post(
     Facets can be specified in the request body, they allow a subset of functionality from
     https://solr.apache.org/guide/8_11/json-facet-api.html.
     """
-    async with AsyncClient() as client:
-        response = await search(
-            client,
-            collection,
-            q=q,
-            qf=qf,
-            fq=fq,
-            sort=sort + DEFAULT_SORT,
-            rows=rows,
-            exact=exact,
-            cursor=cursor,
-            facets=request.facets,
-        )
+    response = await search(
+        client,
+        collection,
+        q=q,
+        qf=qf,
+        fq=fq,
+        sort=sort + DEFAULT_SORT,
+        rows=rows,
+        exact=exact,
+        cursor=cursor,
+        facets=request.facets,
+    )
     res_json = response.data
     out = {
         "results": res_json["response"]["docs"],
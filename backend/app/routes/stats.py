@@ -0,0 +1,11 @@
+"""The Stats endpoints"""
+
+from app.solr.cache import search_cache
+
+from .router import internal_api_router
+
+
+@internal_api_router.get("/stats/search-cache", name="apis:search-cache-stats")
+async def search_cache_stats():
+    """Return hit and miss counters of the Solr search results cache"""
+    return search_cache.stats()
@@ -4,7 +4,7 @@ import asyncio
 import logging
 
 from fastapi import APIRouter
-from httpx import AsyncClient, HTTPError
+from httpx import HTTPError
 
 from app.consts import DOI_BASE_URL
 from app.schemas.bibliography_response import (
@@ -18,6 +18,7 @@ from app.schemas.bibliography_response import (
     CitationStyle,
     EntryFormat,
 )
+from app.utils.http_client import Upstream, http_clients
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -55,28 +56,26 @@ async def _get_bibliography_record(
         entry_format: requested format (BibTeX, RIS or JSON-LD)
     """
     content_type = CONTENT_TYPES_MAPPING[entry_format]
-    async with AsyncClient() as client:
-        headers = {"Accept": content_type}
-        url = f"{DOI_BASE_URL}/{pid}"
-        try:
-            response = await client.get(url=url, headers=headers, follow_redirects=True)
-        except HTTPError as err:
-            return BibliographyRecordErrorResponse(
-                pid=pid, type=entry_format, record=repr(err)
-            )
-        if response.status_code == 200:
-            return BibliographyRecordResponse(
-                type=entry_format, record=response.content
-            )
-        message = ERROR_MESSAGES_MAP.get(response.status_code)
-        if not message and response.status_code >= 500:
-            message = "Server is not responding. Try again later"
+    client = http_clients.get(Upstream.DOI)
+    headers = {"Accept": content_type}
+    url = f"{DOI_BASE_URL}/{pid}"
+    try:
+        response = await client.get(url=url, headers=headers, follow_redirects=True)
+    except HTTPError as err:
         return BibliographyRecordErrorResponse(
-            pid=pid,
-            type=entry_format,
-            record=message,
-            error_status_code=response.status_code,
+            pid=pid, type=entry_format, record=repr(err)
         )
+    if response.status_code == 200:
+        return BibliographyRecordResponse(type=entry_format, record=response.content)
+    message = ERROR_MESSAGES_MAP.get(response.status_code)
+    if not message and response.status_code >= 500:
+        message = "Server is not responding. Try again later"
+    return BibliographyRecordErrorResponse(
+        pid=pid,
+        type=entry_format,
+        record=message,
+        error_status_code=response.status_code,
+    )
 
 
 @router.get("/bibliography-cite", name="web:cite")
@@ -109,19 +108,19 @@ async def _get_citation(pid: str, style: CitationStyle):
         PID of the document (currently only DOI)
         style: one of the supported citation formats
     """
-    async with AsyncClient() as client:
-        headers = {"Accept": f"text/x-bibliography; style={style}"}
-        try:
-            response = await client.get(
-                f"{DOI_BASE_URL}/{pid}", headers=headers, follow_redirects=True
-            )
-            if response.status_code == 200:
-                return CitationResponse(style=style, citation=response.content)
-            return CitationEmptyResponse(
-                doi=pid,
-                style=style,
-                error_status_code=response.status_code,
-                error=response.json()["message"]["message"],
-            )
-        except HTTPError as err:
-            return CitationEmptyResponse(doi=pid, style=style, error=repr(err))
+    client = http_clients.get(Upstream.DOI)
+    headers = {"Accept": f"text/x-bibliography; style={style}"}
+    try:
+        response = await client.get(
+            f"{DOI_BASE_URL}/{pid}", headers=headers, follow_redirects=True
+        )
+        if response.status_code == 200:
+            return CitationResponse(style=style, citation=response.content)
+        return CitationEmptyResponse(
+            doi=pid,
+            style=style,
+            error_status_code=response.status_code,
+            error=response.json()["message"]["message"],
+        )
+    except HTTPError as err:
+        return CitationEmptyResponse(doi=pid, style=style, error=repr(err))
@@ -4,7 +4,6 @@
 import logging
 import uuid
 
-import httpx
 from fastapi import APIRouter, HTTPException, Request
 from httpx import ReadTimeout
 from starlette.responses import JSONResponse
@@ -28,6 +27,7 @@ from app.recommender.router_utils.sort_by_relevance import (
 )
 from app.settings import settings
 from app.solr.error_handling import SolrDocumentNotFoundError
+from app.utils.http_client import Upstream, http_clients
 
 router = APIRouter()
 
@@ -43,35 +43,37 @@ async def get_recommendations(panel_id: Collection, request: Request):
         return []
     session, _ = await get_session(request)
     try:
-        async with httpx.AsyncClient(timeout=None) as client:
-            recommendation_visit_id = str(uuid.uuid4())
+        rs_client = http_clients.get(Upstream.RECOMMENDER)
+        solr_client = http_clients.get(Upstream.SOLR)
+        recommendation_visit_id = str(uuid.uuid4())
 
-            try:
-                uuids = await get_recommended_uuids(
-                    client, session, panel_id, recommendation_visit_id
+        try:
+            uuids = await get_recommended_uuids(
+                rs_client, session, panel_id, recommendation_visit_id
+            )
+            items = await get_recommended_items(solr_client, uuids)
+            resp = JSONResponse({"recommendations": items, "isRand": False})
+            # Let's store the recommendation visit id for retrieval in the user actions
+            resp.set_cookie("recommendation_visit_id", recommendation_visit_id)
+            return resp
+        except (RecommenderError, ReadTimeout, SolrDocumentNotFoundError) as error:
+            items = []
+            if settings.SHOW_RANDOM_RECOMMENDATIONS:
+                uuids = await get_fixed_recommendations(panel_id)
+                items = await get_recommended_items(
+                    solr_client, uuids, skip_missing=True
                 )
-                items = await get_recommended_items(client, uuids)
-                resp = JSONResponse({"recommendations": items, "isRand": False})
-                # Let's store the recommendation visit id for retrieval in the user actions
-                resp.set_cookie("recommendation_visit_id", recommendation_visit_id)
-                return resp
-            except (RecommenderError, ReadTimeout, SolrDocumentNotFoundError) as error:
-                items = []
-                if settings.SHOW_RANDOM_RECOMMENDATIONS:
-                    uuids = await get_fixed_recommendations(panel_id)
-                    items = await get_recommended_items(client, uuids)
 
-                resp = JSONResponse({
-                    "recommendations": items,
-                    "isRand": bool(items),
-                    "message": (
-                        str(error)
-                        or "Solr or external recommender service read timeout"
-                    ),
-                })
-                # We're storing the visit id for fixed recommendations just in case as well
-                resp.set_cookie("recommendation_visit_id", recommendation_visit_id)
-                return resp
+            resp = JSONResponse({
+                "recommendations": items,
+                "isRand": bool(items),
+                "message": (
+                    str(error) or "Solr or external recommender service read timeout"
+                ),
+            })
+            # We're storing the visit id for fixed recommendations just in case as well
+            resp.set_cookie("recommendation_visit_id", recommendation_visit_id)
+            return resp
 
     except (RecommenderError, SolrRetrieveError) as e:
         logger.error("%s. %s", str(e), e.data)
@@ -86,27 +88,26 @@ async def sort_by_relevance(
     session, _ = await get_session(request)
 
     try:
-        async with httpx.AsyncClient(timeout=None) as client:
-            try:
-                candidates_ids = await parse_candidates(documents)
-                uuids = await perform_sort_by_relevance(
-                    client, session, panel_id, candidates_ids
-                )
-                items = await sort_docs(uuids, documents)
-                return {"recommendations": items, "message": ""}
-            except (
-                RecommenderError,
-                SolrRetrieveError,
-                ReadTimeout,
-                ValueError,
-            ) as error:
-                return {
-                    "recommendations": [],
-                    "message": (
-                        str(error)
-                        or "Solr or external recommender service read timeout"
-                    ),
-                }
+        client = http_clients.get(Upstream.RECOMMENDER)
+        try:
+            candidates_ids = await parse_candidates(documents)
+            uuids = await perform_sort_by_relevance(
+                client, session, panel_id, candidates_ids
+            )
+            items = await sort_docs(uuids, documents)
+            return {"recommendations": items, "message": ""}
+        except (
+            RecommenderError,
+            SolrRetrieveError,
+            ReadTimeout,
+            ValueError,
+        ) as error:
+            return {
+                "recommendations": [],
+                "message": (
+                    str(error) or "Solr or external recommender service read timeout"
+                ),
+            }
     except (RecommenderError, SolrRetrieveError) as e:
         logger.error("%s. %s", str(e), e.data)
         raise HTTPException(status_code=500, detail=str(e)) from e
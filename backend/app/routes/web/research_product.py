@@ -10,7 +10,7 @@ from pydantic import ValidationError
 
 from app.consts import ResearchProductCollection
 from app.schemas.research_product_response import ResearchProductResponse, RPUrlPath
-from app.solr.operations import get_dep
+from app.solr.operations import get_dep, solr_client_dep
 
 router = APIRouter()
 
@@ -19,7 +19,10 @@ logger = logging.getLogger(__name__)
 
 @router.get("/research-product/{resource_type}/{rp_id}")
 async def get_rp_by_id(
-    resource_type: ResearchProductCollection, rp_id: str, solr_get=Depends(get_dep)
+    resource_type: ResearchProductCollection,
+    rp_id: str,
+    solr_get=Depends(get_dep),
+    async_client: AsyncClient = Depends(solr_client_dep),
 ) -> Optional[ResearchProductResponse]:
     """
     Main function responsible for getting details for a given Solr document.
@@ -27,10 +30,10 @@ async def get_rp_by_id(
         resource_type (str): string literal - one of permitted collections
         rp_id (str: ID of a research product to be found
         solr_get (callable): solr.operations `get` function
+        async_client (AsyncClient): pooled Solr client
     """
-    async with AsyncClient() as async_client:
-        response = await solr_get(async_client, resource_type, rp_id)
-        response = response["doc"]
+    response = await solr_get(async_client, resource_type, rp_id)
+    response = response["doc"]
     if response is None:
         raise HTTPException(status_code=404, detail="Research product not found")
     urls = []
@@ -1,24 +1,21 @@
 """The UI Search endpoint"""
 
-import asyncio
 import logging
-from typing import Callable
 
 from fastapi import APIRouter, Body, Depends, HTTPException, Query
 from httpx import AsyncClient
 from starlette.status import HTTP_500_INTERNAL_SERVER_ERROR
 
 from app.consts import DEFAULT_SORT, Collection
-from app.schemas.search_request import SearchRequest, StatFacet, TermsFacet
-from app.solr.operations import search_dep
-from app.utils.http_client import make_async_http_client
+from app.schemas.search_request import SearchRequest
+from app.solr.operations import search_dep, solr_client_dep
 
 router = APIRouter()
 
 logger = logging.getLogger(__name__)
 
 
-# pylint: disable=too-many-arguments,too-many-locals
+# pylint: disable=too-many-arguments,unused-argument
 @router.post("/search-filters", name="web:post-search-filters")
 async def search_filters(
     collection: Collection = Query(..., description="Collection"),
@@ -34,16 +31,18 @@ async def search_filters(
     exact: str = Query(..., description="Exact match"),
     request: SearchRequest = Body(..., description="Request body"),
     search=Depends(search_dep),
+    client: AsyncClient = Depends(solr_client_dep),
 ):
     """
     Do a search for filters for specified (multiple) facets.
 
-    The q, qf, fq, sort params correspond to
+    All the facets are computed within a single Solr request, without documents
+    and highlighting. Each facet excludes filters on its own field to create
+    "OR" type logic within the same facet. The rows and cursor params are ignored.
+
+    The q, qf, fq params correspond to
     https://solr.apache.org/guide/8_11/query-syntax-and-parsing.html.
-    Paging is cursor-based, see
-    https://solr.apache.org/guide/8_11/pagination-of-results.html#fetching-a-large-number-of-sorted-results-cursors.
     """
-    results = {}
     if request.facets is None:
         raise HTTPException(status_code=500)
     if collection == Collection.PROJECT:
@@ -52,14 +51,20 @@ async def search_filters(
     if collection == Collection.ORGANISATION:
         request.facets = parse_organisation_facets(request.facets)
 
-    client = make_async_http_client()
-    coroutines = [
-        _search(collection, q, qf, fq, rows, cursor, key, value, exact, search, client)
-        for key, value in request.facets.items()
-    ]
-
     try:
-        gathered = await asyncio.gather(*coroutines)
+        response = await search(
+            client,
+            collection,
+            q=q,
+            qf=qf,
+            fq=fq,
+            sort=DEFAULT_SORT,
+            rows=0,
+            exact=exact,
+            facets=request.facets,
+            highlight=False,
+            facets_exclude_own_filters=True,
+        )
     except Exception as e:
         logger.exception("Filters errored")
         raise HTTPException(
@@ -67,46 +72,13 @@ async def search_filters(
             detail="Could not retrieve filters from DB",
         ) from e
 
-    for key, result in zip(request.facets.keys(), gathered):
-        results.update(result)
-
-    return results
-
-
-async def _search(
-    collection: Collection,
-    q: str,
-    qf: str,
-    fq: list[str],
-    rows: int,
-    cursor: str,
-    facet_key: str,
-    facet_value: TermsFacet | StatFacet,
-    exact: str,
-    search: Callable,
-    client: AsyncClient,
-) -> dict:
-    response = await search(
-        client,
-        collection,
-        q=q,
-        qf=qf,
-        # filter out fq within the same facet to create "OR" type logic
-        fq=list(filter(lambda term: not term.startswith(facet_key + ":"), fq)),
-        sort=DEFAULT_SORT,
-        rows=rows,
-        cursor=cursor,
-        facets={facet_key: facet_value},
-        exact=exact,
-    )
-
     return create_output(response.data)
 
 
 def create_output(res_json: dict) -> dict:
     """Create an output"""
     facets_json = res_json.get("facets", {})
-    del facets_json["count"]
+    facets_json.pop("count", None)
 
     out = {}
     for filter_name, buckets in facets_json.items():
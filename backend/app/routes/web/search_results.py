@@ -1,13 +1,11 @@
 """The UI Search endpoint"""
 
-import copy
 import csv
 import itertools
-import json
 import logging
 from contextlib import suppress
 from io import StringIO
-from typing import Iterator, Optional
+from typing import AsyncIterator, Iterator, Optional
 
 from fastapi import APIRouter, Body, Depends, Query, Request
 from httpx import AsyncClient
@@ -18,21 +16,31 @@ from app.consts import (
     DEFAULT_SPECIAL_COL_SORT,
     RP_AND_ALL_COLLECTIONS_LIST,
     SORT_UI_TO_SORT_MAP,
+    ExportFormat,
     SortUi,
 )
 from app.routes.web.recommendation import sort_by_relevance
 from app.schemas.search_request import SearchRequest
-from app.schemas.solr_response import Collection, ExportData, OrganisationResponse
+from app.schemas.solr_response import Collection
 from app.settings import settings
-from app.solr.error_handling import SolrDocumentNotFoundError
-from app.solr.operations import get, search_advanced_dep, search_dep
+from app.solr.operations import (
+    get_many,
+    search_advanced_dep,
+    search_dep,
+    solr_client_dep,
+)
+from app.solr.projections import FIELD_PROFILES, View, fields_for
+from app.solr.utils import any_of_filter
+from app.utils import fast_json
+from app.utils.fast_json import JSONResponseClass
 from app.utils.ig_related_services import extend_ig_with_related_services
 
 router = APIRouter()
 
 logger = logging.getLogger(__name__)
 
-DOWNLOAD_RESULT_FIELDS = ["title", "type", "description", "best_access_right"]
+DOWNLOAD_RESULT_FIELDS = FIELD_PROFILES[View.EXPORT]
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "jsonl": "application/x-ndjson"}
 
 
 # pylint: disable=too-many-arguments, too-many-locals
@@ -55,8 +63,15 @@ async def search_post(
     rows: int = Query(10, description="Row count", gte=3, le=2000),
     cursor: str = Query("*", description="Cursor"),
     return_csv: bool = False,
+    export: Optional[ExportFormat] = Query(
+        None, description="Stream all the results in the given format"
+    ),
+    export_max_rows: Optional[int] = Query(
+        None, description="Max exported row count", ge=1
+    ),
     request: SearchRequest = Body(..., description="Request body"),
     search=Depends(search_dep),
+    client: AsyncClient = Depends(solr_client_dep),
 ):
     """
     Do a search against the specified collection.
@@ -65,14 +80,49 @@ async def search_post(
     https://solr.apache.org/guide/8_11/query-syntax-and-parsing.html.
     Paging is cursor-based, see
     https://solr.apache.org/guide/8_11/pagination-of-results.html#fetching-a-large-number-of-sorted-results-cursors.
+
+    With `export`, the whole result set (up to `export_max_rows`) is streamed
+    as csv or jsonl, instead of a single page.
     """
     final_solr_sorting = await define_sorting(sort_ui, sort, collection)
 
+    if export is not None:
+        return StreamingResponse(
+            await stream_export(
+                search,
+                client,
+                collection,
+                q=q,
+                qf=qf,
+                fq=fq,
+                sort=final_solr_sorting,
+                exact=exact,
+                export_format=export,
+                max_rows=export_max_rows,
+            ),
+            media_type=EXPORT_MEDIA_TYPES[export],
+        )
+
     if request.facets is not None and len(request.facets) > 0:
         if "title" in request.facets:
             request.facets = None
 
-    async with AsyncClient(timeout=None) as client:
+    if sort_ui == "r":
+        res_json = await search_sorted_by_relevance(
+            request_session,
+            search,
+            client,
+            collection,
+            q=q,
+            qf=qf,
+            fq=fq,
+            sort=final_solr_sorting,
+            rows=rows,
+            exact=exact,
+            cursor=cursor,
+            facets=request.facets,
+        )
+    else:
         response = await search(
             client,
             collection,
@@ -80,30 +130,28 @@ async def search_post(
             qf=qf,
             fq=fq,
             sort=final_solr_sorting,
-            rows=settings.MAX_ITEMS_SORT_RELEVANCE if sort_ui == "r" else rows,
+            rows=rows,
             exact=exact,
             cursor=cursor,
             facets=request.facets,
+            fl=fields_for(View.LIST, collection),
         )
         res_json = response.data
+        collection = response.collection
 
-        # Extend results with bundles
-        if collection in [Collection.ALL_COLLECTION, Collection.BUNDLE]:
-            await extend_results_with_bundles(client, res_json)
-        if collection in [Collection.ALL_COLLECTION, Collection.GUIDELINE]:
-            try:
-                new_docs = await extend_ig_with_related_services(
-                    client, res_json["response"]["docs"]
-                )
-                res_json["response"]["docs"] = copy.deepcopy(new_docs)
-            except (Exception,):  # pylint: disable=broad-except
-                logger.exception("Exception happened during related services extension")
+    # Extend results with bundles
+    if collection in [Collection.ALL_COLLECTION, Collection.BUNDLE]:
+        await extend_results_with_bundles(client, res_json)
+    if collection in [Collection.ALL_COLLECTION, Collection.GUIDELINE]:
+        try:
+            await extend_ig_with_related_services(client, res_json["response"]["docs"])
+        except (Exception,):  # pylint: disable=broad-except
+            logger.exception("Exception happened during related services extension")
 
-    collection = response.collection
-    out = await create_output(request_session, res_json, collection, sort_ui)
+    out = await create_output(res_json, collection)
 
     if not return_csv:
-        return out
+        return JSONResponseClass(out)
 
     results = cleanup_download_results(out["results"])
     return StreamingResponse(
@@ -133,6 +181,7 @@ async def search_post_advanced(
     return_csv: bool = False,
     request: SearchRequest = Body(..., description="Request body"),
     search=Depends(search_advanced_dep),
+    client: AsyncClient = Depends(solr_client_dep),
 ):
     """
     Do a search against the specified collection.
@@ -143,30 +192,32 @@ async def search_post_advanced(
     https://solr.apache.org/guide/8_11/pagination-of-results.html#fetching-a-large-number-of-sorted-results-cursors.
     """
     final_solr_sorting = await define_sorting(sort_ui, sort, collection)
-    async with AsyncClient(timeout=None) as client:
-        response = await search(
-            client,
-            collection,
-            q=q,
-            qf=qf,
-            fq=fq,
-            sort=final_solr_sorting,
-            rows=settings.MAX_ITEMS_SORT_RELEVANCE if sort_ui == "r" else rows,
-            exact=exact,
-            cursor=cursor,
-            facets=request.facets,
-        )
+    response = await search(
+        client,
+        collection,
+        q=q,
+        qf=qf,
+        fq=fq,
+        sort=final_solr_sorting,
+        rows=settings.MAX_ITEMS_SORT_RELEVANCE if sort_ui == "r" else rows,
+        exact=exact,
+        cursor=cursor,
+        facets=request.facets,
+        fl=fields_for(View.LIST, collection),
+    )
 
-        res_json = response.data
+    res_json = response.data
 
-        # Extent the results with bundles
-        if collection in [Collection.ALL_COLLECTION, Collection.BUNDLE]:
-            await extend_results_with_bundles(client, res_json)
+    # Extent the results with bundles
+    if collection in [Collection.ALL_COLLECTION, Collection.BUNDLE]:
+        await extend_results_with_bundles(client, res_json)
     collection = response.collection
-    out = await create_output(request_session, res_json, collection, sort_ui)
+    out = await create_output(res_json, collection)
+    if sort_ui == "r":
+        await sort_output_by_relevance(request_session, out, collection)
 
     if not return_csv:
-        return out
+        return JSONResponseClass(out)
 
     results = cleanup_download_results(out["results"])
     return StreamingResponse(
@@ -174,7 +225,7 @@ async def search_post_advanced(
     )
 
 
-async def _extract_doi_from_url(url_string):
+def _extract_doi_from_url(url_string):
     """Function extracting doi from url"""
     try:
         _, doi = url_string.split("doi.org")
@@ -183,64 +234,82 @@ async def _extract_doi_from_url(url_string):
     return doi
 
 
-async def _parse_export_data(instance):
-    """Function responsible for creating ExportData object for each instance
-    of a single document.
+def _parse_export_data(instance_data: dict) -> dict:
+    """Function responsible for creating export and cite data for an instance
+    indexed in the former form, with keys in the camel case expected by front-end.
     """
     doi = None
-    instance_data = json.loads(instance)
     urls = instance_data["url"]
     for url in urls:
-        doi = await _extract_doi_from_url(url)
+        doi = _extract_doi_from_url(url)
         if doi:
             break
-    instance_data["url"] = urls[0]
-    instance_data["hostedby"] = (
-        ""
-        if instance_data["hostedby"] == "Unknown Repository"
-        else instance_data["hostedby"]
-    )
 
-    instance = ExportData(**instance_data, extracted_doi=doi)
-
-    return instance.serialize_to_camel_case()
+    return {
+        "url": urls[0],
+        "documentType": instance_data["document_type"],
+        "publicationYear": instance_data.get("publication_year"),
+        "license": instance_data.get("license"),
+        "hostedby": (
+            ""
+            if instance_data["hostedby"] == "Unknown Repository"
+            else instance_data["hostedby"]
+        ),
+        "extractedDoi": doi,
+    }
 
 
-async def parse_single_export(doc) -> list:
-    """Parse single document"""
+def parse_single_export(doc) -> list:
+    """
+    Parse exportation data of a single document.
+    Instances are indexed in the form expected by front-end and they are embedded
+    as JSON by Solr, so they are forwarded as they are. Instances retrieved as strings
+    are parsed, and those indexed in the former form are converted.
+    """
     data = []
     with suppress(TypeError):
         for instance in doc["exportation"]:
-            instance_export_data = await _parse_export_data(instance)
-            if instance:
-                data.append(instance_export_data)
+            if isinstance(instance, str):
+                instance = fast_json.loads(instance)
+            if "documentType" not in instance:
+                instance = _parse_export_data(instance)
+            data.append(instance)
     return data
 
 
 async def parse_single_organisation(doc) -> dict:
     """Creates an output for a single document"""
-    return OrganisationResponse(
-        id=doc["id"],
-        title=doc.get("title", ""),
-        abbreviation=doc.get("abbreviation", ""),
-        country=doc.get("country", [""])[0],
-        url=doc.get("url", ""),
-        type=doc["type"],
-        alternative_names=doc.get("alternative_names", [""]),
-        related_publication_number=len(doc.get("related_publication_ids", [])),
-        related_software_number=len(doc.get("related_software_ids", [])),
-        related_dataset_number=len(doc.get("related_dataset_ids", [])),
-        related_other_number=len(doc.get("related_other_ids", [])),
-        related_project_number=len(doc.get("related_project_ids", [])),
-    ).dict()
-
-
-async def create_parsed_docs_for_export_data(docs):
+    return {
+        "id": doc["id"],
+        "country": doc.get("country", [""])[0],
+        "title": doc.get("title", ""),
+        "abbreviation": doc.get("abbreviation", ""),
+        "type": doc["type"],
+        "url": doc.get("url", ""),
+        "alternative_names": doc.get("alternative_names", [""]),
+        "related_publication_number": _get_related_number(doc, "publication"),
+        "related_dataset_number": _get_related_number(doc, "dataset"),
+        "related_other_number": _get_related_number(doc, "other"),
+        "related_project_number": _get_related_number(doc, "project"),
+        "related_software_number": _get_related_number(doc, "software"),
+    }
+
+
+def _get_related_number(doc: dict, related_type: str) -> int:
+    """Number of related resources indexed with the document.
+    Documents indexed without it are counted by their related ids."""
+    number = doc.get(f"related_{related_type}_number")
+    if number is None:
+        number = len(doc.get(f"related_{related_type}_ids", []))
+    return number
+
+
+def create_parsed_docs_for_export_data(docs):
     """Injects exportation data into response"""
     parsed_docs = []
     for doc in docs:
         if doc.get("exportation"):
-            doc["exportation"] = await parse_single_export(doc)
+            doc["exportation"] = parse_single_export(doc)
         parsed_docs.append(doc)
     return parsed_docs
 
@@ -261,31 +330,19 @@ async def create_parsed_docs_for_organisation(docs):
     return parsed_docs
 
 
-async def create_output(
-    request_session: Request, res_json: dict, collection: Collection, sort_ui: str
-) -> dict:
+async def create_output(res_json: dict, collection: Collection) -> dict:
     """Create an output"""
     docs = res_json["response"]["docs"]
 
     if docs and collection in RP_AND_ALL_COLLECTIONS_LIST:
-        docs = await create_parsed_docs_for_export_data(docs)
+        docs = create_parsed_docs_for_export_data(docs)
     elif docs and collection == Collection.ORGANISATION:
         docs = await create_parsed_docs_for_organisation(docs)
     out = {
         "numFound": res_json["response"]["numFound"],
         "nextCursorMark": res_json["nextCursorMark"],
+        "results": docs,
     }
-
-    if sort_ui == "r":
-        # Sort by relevance
-        rel_sorted_items = await sort_by_relevance(request_session, collection, docs)
-        out["results"] = rel_sorted_items["recommendations"]
-        out["numFound"] = len(out["results"])
-        if not out["numFound"]:
-            out["nextCursorMark"] = "*"
-
-    else:
-        out["results"] = docs
     if "facets" in res_json:
         out["facets"] = res_json["facets"]
 
@@ -295,70 +352,153 @@ async def create_output(
     return out
 
 
-# pylint: disable=logging-fstring-interpolation, too-many-locals, useless-suppression
-async def extend_results_with_bundles(client, res_json):
-    """Extend bundles in search results with information about offers and services"""
+async def sort_output_by_relevance(
+    request_session: Request, out: dict, collection: Collection
+) -> None:
+    """Sort all the results of the output by relevance"""
+    rel_sorted_items = await sort_by_relevance(
+        request_session, collection, out["results"]
+    )
+    out["results"] = rel_sorted_items["recommendations"]
+    out["numFound"] = len(out["results"])
+    if not out["numFound"]:
+        out["nextCursorMark"] = "*"
+
+
+# pylint: disable=too-many-arguments
+async def search_sorted_by_relevance(
+    request_session: Request,
+    search,
+    client: AsyncClient,
+    collection: Collection,
+    *,
+    q: str,
+    qf: str,
+    fq: list[str],
+    sort: list[str],
+    rows: int,
+    exact: str,
+    cursor: str = "*",
+    facets: Optional[dict] = None,
+) -> dict:
+    """
+    Two-phase retrieval of the results sorted by relevance.
 
-    bundle_results = list(
-        filter(lambda doc: doc["type"] == "bundle", res_json["response"]["docs"])
+    Only ids and types of the candidates are retrieved and sorted by the recommender.
+    Full documents and highlights are then fetched for the requested page only.
+    The cursor is the offset of the page within the sorted candidates.
+    """
+    candidates = await search(
+        client,
+        collection,
+        q=q,
+        qf=qf,
+        fq=fq,
+        sort=sort,
+        rows=settings.MAX_ITEMS_SORT_RELEVANCE,
+        exact=exact,
+        facets=facets,
+        highlight=False,
+        fl=fields_for(View.CANDIDATE, collection),
     )
-    if bundle_results:
-        # Combine main offer with other offers
-        bundle_offers = [
-            (
-                [bundle["main_offer_id"]] + bundle["offer_ids"]
-                if bundle.get("offer_ids")
-                else [bundle["main_offer_id"]]
-            )
-            for bundle in bundle_results
-        ]
-        offer_ids = set(itertools.chain(*bundle_offers))
-
-        # Extend bundles with offers and services data
-        if offer_ids:
-            offers = {}
-            offer_results = []
-            for offer_id in offer_ids:
-                with suppress(SolrDocumentNotFoundError):
-                    response = await get(client, Collection.OFFER, offer_id)
-                    item = response["doc"]
-                    if item is None:
-                        logger.warning(f"No offer with id={offer_id}")
-                        continue
-                    offer_results.append(item)
-
-            services_ids: set[int] = set()
-
-            for offer in offer_results:
-                offers[offer["id"]] = offer
-                services_ids.add(offer["service_id"])
-
-            services = {}
-            service_results = []
-            for service_id in services_ids:
-                with suppress(SolrDocumentNotFoundError):
-                    response = await get(client, Collection.SERVICE, service_id)
-                    item = response["doc"]
-                    if item is None:
-                        logger.warning(f"No service with id={service_id}")
-                        continue
-                    service_results.append(item)
-            for service in service_results:
-                services[str(service["id"])] = service
-            for offer in offer_results:
-                offer["service"] = services.get(str(offer["service_id"]), None)
-            for bundle in bundle_results:
-                bundle["offers"] = [
-                    offers.get(str(offer_id))
-                    for offer_id in (
-                        [bundle.get("main_offer_id")] + (bundle.get("offer_ids") or [])
-                    )
-                ]
-    else:
+    sorted_candidates = (
+        await sort_by_relevance(
+            request_session, collection, candidates.data["response"]["docs"]
+        )
+    )["recommendations"]
+
+    offset = int(cursor) if cursor.isdigit() else 0
+    page_ids = [doc["id"] for doc in sorted_candidates[offset : offset + rows]]
+    next_offset = offset + len(page_ids)
+    res_json = {
+        "response": {"numFound": len(sorted_candidates), "docs": []},
+        "nextCursorMark": (
+            str(next_offset) if next_offset < len(sorted_candidates) else cursor
+        ),
+    }
+    if not sorted_candidates:
+        res_json["nextCursorMark"] = "*"
+    if "facets" in candidates.data:
+        res_json["facets"] = candidates.data["facets"]
+    if not page_ids:
+        return res_json
+
+    page = await search(
+        client,
+        collection,
+        q=q,
+        qf=qf,
+        fq=fq + [any_of_filter("id", page_ids)],
+        sort=sort,
+        rows=len(page_ids),
+        exact=exact,
+        fl=fields_for(View.LIST, collection),
+    )
+    docs_by_id = {doc["id"]: doc for doc in page.data["response"]["docs"]}
+    res_json["response"]["docs"] = [
+        docs_by_id[doc_id] for doc_id in page_ids if doc_id in docs_by_id
+    ]
+    if "highlighting" in page.data:
+        res_json["highlighting"] = page.data["highlighting"]
+    return res_json
+
+
+async def extend_results_with_bundles(client, res_json):
+    """
+    Extend bundles in search results with information about offers and services.
+    Offers and services of all the bundles are fetched in one request each,
+    unless their summaries are embedded in the bundle already.
+    """
+    bundle_results = []
+    for doc in res_json["response"]["docs"]:
+        if doc["type"] != "bundle":
+            continue
+        # Summaries of offers and services embedded at index time
+        if "offers_summary" in doc:
+            doc["offers"] = [
+                fast_json.loads(offer) for offer in doc.pop("offers_summary")
+            ]
+        else:
+            bundle_results.append(doc)
+    if not bundle_results:
         return
 
+    offer_ids = {
+        str(offer_id)
+        for offer_id in itertools.chain(*map(_get_bundle_offer_ids, bundle_results))
+        if offer_id is not None
+    }
+
+    offers = {
+        str(offer["id"]): offer
+        for offer in await get_many(client, Collection.OFFER, offer_ids)
+    }
+    for offer_id in offer_ids.difference(offers):
+        logger.warning("No offer with id=%s", offer_id)
 
-# pylint: disable=too-many-return-statements, fixme
+    services_ids = {str(offer["service_id"]) for offer in offers.values()}
+    services = {
+        str(service["id"]): service
+        for service in await get_many(client, Collection.SERVICE, services_ids)
+    }
+    for service_id in services_ids.difference(services):
+        logger.warning("No service with id=%s", service_id)
+
+    # Extend bundles with offers and services data
+    for offer in offers.values():
+        offer["service"] = services.get(str(offer["service_id"]), None)
+    for bundle in bundle_results:
+        bundle["offers"] = [
+            offers.get(str(offer_id)) for offer_id in _get_bundle_offer_ids(bundle)
+        ]
+
+
+def _get_bundle_offer_ids(bundle: dict) -> list:
+    """Combine main offer with other offers"""
+    return [bundle.get("main_offer_id")] + (bundle.get("offer_ids") or [])
+
+
+# pylint: disable=fixme
 async def define_sorting(
     sort_ui: SortUi, sort: list[str], collection: Optional[str] = None
 ):
@@ -414,3 +554,80 @@ def convert_dict_to_chunked_csv(data: list[dict]) -> Iterator[str]:
     chunk_size = 1024
     while chunk := csv_file.read(chunk_size):
         yield chunk
+
+
+# pylint: disable=too-many-arguments
+async def stream_export(
+    search,
+    client: AsyncClient,
+    collection: Collection,
+    *,
+    q: str,
+    qf: str,
+    fq: list[str],
+    sort: list[str],
+    exact: str,
+    export_format: ExportFormat,
+    max_rows: Optional[int] = None,
+) -> AsyncIterator[str]:
+    """
+    Returns an iterator yielding the search results as csv or jsonl, page by page.
+    Pages are fetched with a cursor and only the download fields,
+    so a single page is held in memory at a time.
+    The first page is fetched before the iterator is returned, so that Solr errors
+    are raised before the response is started and get a proper status code.
+    Export pages aren't cached, as each cursor page is requested once.
+    """
+    max_rows = min(max_rows or settings.EXPORT_MAX_ROWS, settings.EXPORT_MAX_ROWS)
+
+    async def fetch_page(cursor: str, exported: int):
+        return await search(
+            client,
+            collection,
+            q=q,
+            qf=qf,
+            fq=fq,
+            sort=sort,
+            rows=min(settings.EXPORT_PAGE_SIZE, max_rows - exported),
+            exact=exact,
+            cursor=cursor,
+            highlight=False,
+            fl=fields_for(View.EXPORT, collection),
+            use_cache=False,
+        )
+
+    first_page = await fetch_page("*", 0)
+
+    async def pages() -> AsyncIterator[str]:
+        if export_format == "csv":
+            yield _format_csv_rows([], header=True)
+
+        response, cursor, exported = first_page, "*", 0
+        while True:
+            docs = response.data["response"]["docs"]
+            rows = cleanup_download_results(docs)[: max_rows - exported]
+            exported += len(rows)
+            if rows:
+                yield (
+                    _format_csv_rows(rows)
+                    if export_format == "csv"
+                    else "".join(fast_json.dumps(row).decode() + "\n" for row in rows)
+                )
+
+            next_cursor = response.data["nextCursorMark"]
+            if not docs or next_cursor == cursor or exported >= max_rows:
+                break
+            cursor = next_cursor
+            response = await fetch_page(cursor, exported)
+
+    return pages()
+
+
+def _format_csv_rows(rows: list[dict], header: bool = False) -> str:
+    """Format the rows as csv with the download fields as columns"""
+    csv_file = StringIO()
+    csv_writer = csv.DictWriter(csv_file, fieldnames=DOWNLOAD_RESULT_FIELDS)
+    if header:
+        csv_writer.writeheader()
+    csv_writer.writerows(rows)
+    return csv_file.getvalue()
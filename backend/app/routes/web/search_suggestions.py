@@ -2,14 +2,21 @@
 
 import asyncio
 import logging
-from typing import Dict, Tuple
+from typing import Callable, Dict
 
 from fastapi import APIRouter, Depends, Query
 from httpx import AsyncClient
 
-from app.consts import ALL_COLLECTION_LIST, DEFAULT_SORT, PROVIDER_QF
+from app.consts import (
+    ALL_COLLECTION_LIST,
+    ALL_COLLECTION_TYPES,
+    DEFAULT_SORT,
+    PROVIDER_QF,
+)
 from app.schemas.solr_response import Collection
-from app.solr.operations import search_dep
+from app.settings import settings
+from app.solr.operations import search_dep, solr_client_dep
+from app.solr.projections import View, fields_for
 
 router = APIRouter()
 
@@ -32,10 +39,13 @@ async def search_suggestions(
         3, description="Row count per collection", gte=3, lt=10
     ),
     search=Depends(search_dep),
+    client: AsyncClient = Depends(solr_client_dep),
 ) -> Dict[str, list[Dict]]:
     """
     Main function performing the search for suggestions.
     Serves as the dispatch function for `all_collection` search request.
+    Collections indexed within all_collection are searched with a single grouped
+    request, the remaining ones with a request per collection.
     The q, qf, fq, sort params correspond to
     https://solr.apache.org/guide/8_11/query-syntax-and-parsing.html.
     """
@@ -47,13 +57,36 @@ async def search_suggestions(
             collection,
         ]
     )
+    grouped_collections = (
+        [col for col in collections if col in ALL_COLLECTION_TYPES]
+        if settings.GROUPED_SUGGESTIONS and len(collections) > 1
+        else []
+    )
 
-    gathered_result = await asyncio.gather(*[
-        _search(col, q, qf, exact, fq, results_per_collection, search)
+    coroutines = [
+        _search(col, q, qf, exact, fq, results_per_collection, search, client)
         for col in collections
-    ])
+        if col not in grouped_collections
+    ]
+    if grouped_collections:
+        coroutines.append(
+            _search_grouped(
+                grouped_collections,
+                q,
+                qf,
+                exact,
+                fq,
+                results_per_collection,
+                search,
+                client,
+            )
+        )
+    gathered_result = await asyncio.gather(*coroutines)
 
-    return dict(gathered_result)
+    results = {}
+    for result in gathered_result:
+        results.update(result)
+    return results
 
 
 async def _search(
@@ -70,22 +103,63 @@ async def _search(
         3, description="Row count per collection", gte=3, lt=10
     ),
     search=Depends(search_dep),
-) -> Tuple[str, Dict]:
+    client: AsyncClient = Depends(solr_client_dep),
+) -> Dict[str, list[Dict]]:
     """Performs the search in a single collection"""
     if "provider" in collection:
         qf = PROVIDER_QF
-    async with AsyncClient() as client:
-        response = await search(
-            client,
-            collection,
-            q=q,
-            qf=qf,
-            fq=fq,
-            sort=DEFAULT_SORT,
-            rows=results_per_collection,
-            exact=exact,
-        )
+    response = await search(
+        client,
+        collection,
+        q=q,
+        qf=qf,
+        fq=fq,
+        sort=DEFAULT_SORT,
+        rows=results_per_collection,
+        exact=exact,
+        fl=fields_for(View.SUGGESTION, collection),
+    )
 
     res_json = response.data
     collection = response.collection
-    return collection, res_json["response"]["docs"]
+    return {collection: res_json["response"]["docs"]}
+
+
+# pylint: disable=too-many-arguments
+async def _search_grouped(
+    collections: list[Collection],
+    q: str,
+    qf: str,
+    exact: str,
+    fq: list[str],
+    results_per_collection: int,
+    search: Callable,
+    client: AsyncClient,
+) -> Dict[Collection, list[Dict]]:
+    """
+    Performs the search for collections indexed within all_collection using a single
+    request, which returns at most `results_per_collection` documents per type
+    """
+    types = {ALL_COLLECTION_TYPES[col]: col for col in collections}
+    types_fq = "type:(" + " OR ".join(f'"{type_.value}"' for type_ in types) + ")"
+    response = await search(
+        client,
+        Collection.ALL_COLLECTION,
+        q=q,
+        qf=qf,
+        fq=fq + [types_fq],
+        sort=DEFAULT_SORT,
+        rows=results_per_collection * len(types),
+        exact=exact,
+        highlight=False,
+        group_by="type",
+        group_limit=results_per_collection,
+        fl=fields_for(View.SUGGESTION, Collection.ALL_COLLECTION),
+    )
+
+    results = {col: [] for col in collections}
+    for doc in response.data["response"]["docs"]:
+        col = types.get(doc.get("type"))
+        if col is not None and len(results[col]) < results_per_collection:
+            results[col].append(doc)
+    return results
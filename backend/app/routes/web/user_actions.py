@@ -1,16 +1,15 @@
-# pylint: disable=missing-module-docstring, too-many-locals
+# pylint: disable=missing-module-docstring
 import logging
 import urllib.parse
 import uuid
 from typing import Literal
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request
 from starlette.responses import RedirectResponse
 
 from app.dependencies.user_actions import (
-    UserActionClient,
-    send_user_action_bg_task,
-    user_actions_client,
+    UserActionPublisher,
+    get_user_actions_publisher,
 )
 from app.schemas.session_data import SessionData
 from app.settings import settings
@@ -27,7 +26,6 @@ logger = logging.getLogger(__name__)
 )
 async def register_navigation_user_action(
     request: Request,
-    background_tasks: BackgroundTasks,
     return_path: str,
     search_params: str,
     url: str,
@@ -50,7 +48,7 @@ async def register_navigation_user_action(
     ],
     page_id: str,
     recommendation: bool = False,
-    client: UserActionClient | None = Depends(user_actions_client),
+    publisher: UserActionPublisher = Depends(get_user_actions_publisher),
 ):
     """Registers entering a URL and redirects to the URL"""
 
@@ -84,17 +82,12 @@ async def register_navigation_user_action(
         )
         cookie.attach_to_response(response, cookie_session_id)
 
-    if not client:
-        logger.debug("No mqtt client, user action not sent")
-        return response
-
     # For now, the recommendation visit id will be stored in cookies by itself,
     # not connected to any session.
     recommendation_visit_id = request.cookies.get("recommendation_visit_id")
 
-    background_tasks.add_task(
-        send_user_action_bg_task,
-        client,
+    # Only queued here, the redirect is never delayed by the databus
+    publisher.publish(
         session,
         url,
         page_id,
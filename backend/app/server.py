@@ -10,6 +10,7 @@ from app.middlewares import LogRequestsMiddleware
 from app.routes import internal_api_router, web_api_router
 from app.settings import settings
 from app.tasks import create_start_app_handler, create_stop_app_handler
+from app.utils.fast_json import JSONResponseClass
 
 if settings.SENTRY_DSN:
     sentry_sdk.init(dsn=settings.SENTRY_DSN)
@@ -22,6 +23,7 @@ def get_app():
         title="Search Service",
         description="EOSC Search Service",
         version="1.0.0-alpha1",
+        default_response_class=JSONResponseClass,
     )
     if settings.SENTRY_DSN:
         app.add_middleware(SentryAsgiMiddleware)
@@ -0,0 +1,166 @@
+"""Cache of Solr search responses"""
+
+import hashlib
+import json
+import logging
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from cachetools import TTLCache
+from httpx import AsyncClient
+
+from app.settings import settings
+
+from .index_status import IndexStatusRegistry, index_status
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(ABC):
+    """Storage of the cached Solr response bodies"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return the cached value or None"""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes) -> None:
+        """Store the value"""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Remove all the cached values"""
+
+    def __len__(self) -> int:
+        return 0
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Local, in-process LRU cache with entries expiring after the TTL"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: bytes) -> None:
+        self._cache[key] = value
+
+    async def clear(self) -> None:
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Cache shared among backend processes. Requires the `redis` package."""
+
+    KEY_PREFIX = "ess:search:"
+
+    def __init__(self, url: str, ttl: float):
+        try:
+            # pylint: disable=import-outside-toplevel
+            from redis import asyncio as aioredis
+        except ImportError as e:
+            raise RuntimeError(
+                "SEARCH_CACHE_URL is set, but the `redis` package is not installed"
+            ) from e
+        self._redis = aioredis.from_url(url)
+        self._ttl = int(ttl)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._redis.get(self.KEY_PREFIX + key)
+
+    async def set(self, key: str, value: bytes) -> None:
+        await self._redis.set(self.KEY_PREFIX + key, value, ex=self._ttl)
+
+    async def clear(self) -> None:
+        async for key in self._redis.scan_iter(match=self.KEY_PREFIX + "*"):
+            await self._redis.delete(key)
+
+
+class SearchCache:
+    """
+    Cache of Solr search responses.
+
+    Keys are made of the normalized Solr request and the version of the collection index,
+    so entries are no longer hit once the index changes or the alias is switched.
+    """
+
+    def __init__(self, backend: CacheBackend, index_statuses: IndexStatusRegistry):
+        self.backend = backend
+        self.index_statuses = index_statuses
+        self.hits = 0
+        self.misses = 0
+
+    async def make_key(
+        self, client: AsyncClient, solr_collection: str, request_body: dict
+    ) -> str:
+        """Create the cache key of the request"""
+        params = request_body["params"]
+        normalized = {
+            **request_body,
+            "params": {**params, "fq": sorted(params.get("fq") or [])},
+        }
+        version = (await self.index_statuses.get(client, solr_collection)).token
+        raw_key = json.dumps(
+            [solr_collection, version, normalized], sort_keys=True, default=str
+        )
+        return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return the cached Solr response body and count the hit or miss"""
+        try:
+            value = await self.backend.get(key)
+        # pylint: disable=broad-except
+        except Exception:
+            logger.exception("Search cache backend read failed")
+            value = None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        """Store the Solr response body"""
+        try:
+            await self.backend.set(key, value)
+        # pylint: disable=broad-except
+        except Exception:
+            logger.exception("Search cache backend write failed")
+
+    async def clear(self) -> None:
+        """Remove all the cached entries and reset the counters"""
+        await self.backend.clear()
+        self.index_statuses.invalidate()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        """Hit and miss counters"""
+        requests = self.hits + self.misses
+        return {
+            "enabled": settings.SEARCH_CACHE_ENABLED,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / requests if requests else 0.0,
+            "size": len(self.backend),
+        }
+
+
+def make_search_cache() -> SearchCache:
+    """Create search cache with the backend defined in settings"""
+    backend = (
+        RedisCacheBackend(settings.SEARCH_CACHE_URL, settings.SEARCH_CACHE_TTL)
+        if settings.SEARCH_CACHE_URL
+        else InMemoryCacheBackend(
+            settings.SEARCH_CACHE_MAXSIZE, settings.SEARCH_CACHE_TTL
+        )
+    )
+    return SearchCache(backend, index_status)
+
+
+search_cache = make_search_cache()
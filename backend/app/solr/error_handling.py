@@ -58,8 +58,6 @@ async def handle_solr_detail_response_errors(solr_request_coroutine) -> Response
         except (KeyError, JSONDecodeError):
             detail = "Unknown error structure"
         raise SolrUnknownError(status_code=response.status_code, detail=detail)
-    if response.json()["doc"] is None:
-        raise SolrDocumentNotFoundError()
     return response
 
 
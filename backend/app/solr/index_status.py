@@ -0,0 +1,86 @@
+"""Registry of the status of Solr collection indexes"""
+
+import asyncio
+import logging
+from typing import NamedTuple, Optional
+
+from cachetools import TTLCache
+from httpx import AsyncClient, HTTPError
+
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class IndexStatus(NamedTuple):
+    """Alias target, index version and document count of a collection"""
+
+    target: str
+    version: Optional[int] = None
+    num_docs: Optional[int] = None
+
+    @property
+    def token(self) -> str:
+        """Identifies the index content, empty if it's unknown"""
+        return f"{self.target}@{self.version}" if self.version is not None else ""
+
+
+class IndexStatusRegistry:
+    """
+    Tracks the alias target, the index version and the document count of Solr collections.
+    Statuses are re-checked at most once per `check_interval` seconds,
+    and all of them are invalidated once an alias is switched.
+    """
+
+    def __init__(self, check_interval: float):
+        self._statuses = TTLCache(maxsize=128, ttl=check_interval)
+        self._aliases: Optional[dict] = None
+
+    async def get(self, client: AsyncClient, solr_collection: str) -> IndexStatus:
+        """Return the status of the collection"""
+        status = self._statuses.get(solr_collection)
+        if status is None:
+            status = await self._fetch(client, solr_collection)
+            self._statuses[solr_collection] = status
+        return status
+
+    async def is_empty(
+        self, client: AsyncClient, solr_collection: str
+    ) -> Optional[bool]:
+        """Whether the collection has no documents, None if it's unknown"""
+        num_docs = (await self.get(client, solr_collection)).num_docs
+        return None if num_docs is None else num_docs == 0
+
+    def invalidate(self) -> None:
+        """Force the statuses to be re-checked"""
+        self._statuses.clear()
+
+    async def _fetch(self, client: AsyncClient, solr_collection: str) -> IndexStatus:
+        try:
+            aliases, luke = await asyncio.gather(
+                client.get(
+                    f"{settings.SOLR_URL}admin/collections",
+                    params={"action": "LISTALIASES", "wt": "json"},
+                ),
+                client.get(
+                    f"{settings.SOLR_URL}{solr_collection}/admin/luke",
+                    params={"numTerms": 0, "show": "index", "wt": "json"},
+                ),
+            )
+            aliases = aliases.json().get("aliases", {})
+            index = luke.json()["index"]
+        except (HTTPError, KeyError, ValueError):
+            logger.warning("Could not retrieve index status of %s", solr_collection)
+            return IndexStatus(target=solr_collection)
+
+        if self._aliases is not None and aliases != self._aliases:
+            self.invalidate()
+        self._aliases = aliases
+        return IndexStatus(
+            target=aliases.get(solr_collection) or solr_collection,
+            version=index.get("version"),
+            num_docs=index.get("numDocs"),
+        )
+
+
+index_status = IndexStatusRegistry(settings.INDEX_STATUS_CHECK_INTERVAL)
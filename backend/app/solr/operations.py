@@ -1,32 +1,38 @@
 #  pylint: disable=too-many-locals, too-many-arguments
 
 """Operations on Solr"""
-from typing import Dict
+import json
+from typing import Awaitable, Callable, Dict, Iterable, Optional
 
 from httpx import AsyncClient, Response
 
-from app.consts import (
-    CATALOGUE_QF,
-    DEFAULT_QF,
-    ORGANISATION_QF,
-    PROJECT_QF,
-    PROVIDER_QF,
-)
 from app.schemas.search_request import StatFacet, TermsFacet
 from app.schemas.solr_response import Collection, SolrResponse
 from app.settings import settings
+from app.utils import fast_json
+from app.utils.http_client import Upstream, http_clients
+from app.utils.single_flight import SingleFlight
 
+from .cache import search_cache
 from .error_handling import (
     SolrCollectionEmptyError,
+    SolrDocumentNotFoundError,
     handle_solr_detail_response_errors,
     handle_solr_list_response_errors,
 )
+from .index_status import index_status
 from .utils import (
+    any_of_filter,
+    exclude_own_filters,
     parse_organisation_filters,
     parse_project_filters,
     parse_providers_filters,
+    tag_filters,
 )
 
+solr_requests = SingleFlight()
+ITEMS_BY_PIDS_PAGE_SIZE = 100
+
 
 async def search(
     client: AsyncClient,
@@ -40,6 +46,12 @@ async def search(
     exact: str,
     cursor: str = "*",
     facets: dict[str, TermsFacet | StatFacet] = None,
+    highlight: bool = True,
+    facets_exclude_own_filters: bool = False,
+    group_by: Optional[str] = None,
+    group_limit: int = 1,
+    fl: Optional[list[str]] = None,
+    use_cache: bool = True,
 ) -> SolrResponse:
     # pylint: disable=line-too-long
     """
@@ -54,8 +66,85 @@ async def search(
     https://solr.apache.org/guide/8_11/pagination-of-results.html#fetching-a-large-number-of-sorted-results-cursors.
 
     Facets support a subset of parameters from: https://solr.apache.org/guide/8_11/json-facet-api.html.
+    With `facets_exclude_own_filters` each facet ignores the filters on its own field,
+    so that counts for multiple facets can be retrieved within a single request.
+
+    With `group_by` at most `group_limit` documents per value of the field are returned
+    as a flat list, see https://solr.apache.org/guide/8_11/result-grouping.html.
+    Grouping doesn't support cursors, so `cursor` is ignored and `rows` limits the documents.
+
+    `fl` restricts the returned fields of the documents.
+    With `use_cache` set to False the search response cache is bypassed,
+    e.g. for requests which are unlikely to be repeated.
     """
 
+    solr_collection = f"{settings.COLLECTIONS_PREFIX}{collection}"
+    request_body = _build_search_body(
+        collection,
+        q=q,
+        qf=qf,
+        fq=fq,
+        sort=sort,
+        rows=rows,
+        exact=exact,
+        cursor=cursor,
+        facets=facets,
+        highlight=highlight,
+        facets_exclude_own_filters=facets_exclude_own_filters,
+        group_by=group_by,
+        group_limit=group_limit,
+        fl=fl,
+    )
+
+    cache_key = None
+    if settings.SEARCH_CACHE_ENABLED and use_cache:
+        cache_key = await search_cache.make_key(client, solr_collection, request_body)
+        content = await search_cache.get(cache_key)
+        if content is not None:
+            # Parse on every hit, so callers are free to mutate the data
+            return SolrResponse(collection=collection, data=fast_json.loads(content))
+
+    async def _select() -> bytes:
+        response = await handle_solr_list_response_errors(
+            client.post(
+                f"{settings.SOLR_URL}{solr_collection}/select",
+                json=request_body,
+            )
+        )
+        return response.content
+
+    content = await _coalesce(("select", solr_collection, request_body), _select)
+    # Every caller parses the shared body on its own, so it's free to mutate the data
+    data = fast_json.loads(content)
+
+    if data["response"]["numFound"] == 0:
+        await _check_collection_sanity(client, collection)
+
+    if cache_key is not None:
+        await search_cache.set(cache_key, content)
+
+    return SolrResponse(collection=collection, data=data)
+
+
+# pylint: disable=too-many-arguments
+def _build_search_body(
+    collection: Collection,
+    *,
+    q: str,
+    qf: str,
+    fq: list[str],
+    sort: list[str],
+    rows: int,
+    exact: str,
+    cursor: str,
+    facets: Optional[dict[str, TermsFacet | StatFacet]],
+    highlight: bool,
+    facets_exclude_own_filters: bool,
+    group_by: Optional[str],
+    group_limit: int,
+    fl: Optional[list[str]],
+) -> dict:
+    """Build the JSON request body of a search, see `search` for the parameters"""
     q = q.replace("(", r"").replace(")", r"")
     q = q.replace("[", r"").replace("]", r"")
     q = q.replace("=", r"")
@@ -67,11 +156,12 @@ async def search(
     if exact == "true":
         mm_param = "100%"
         qs_param = "0"
-    solr_collection = f"{settings.COLLECTIONS_PREFIX}{collection}"
     if collection == Collection.PROJECT and fq:
         fq = parse_project_filters(fq)
     elif collection == Collection.ORGANISATION and fq:
         fq = parse_organisation_filters(fq)
+    if facets_exclude_own_filters and fq:
+        fq = tag_filters(fq)
     request_body = {
         "params": {
             "defType": "edismax",
@@ -100,7 +190,7 @@ async def search(
             "qs": qs_param,
             # Highlight, default: "false"
             # https://solr.apache.org/guide/solr/latest/query-guide/highlighting.html#highlighting-in-the-query-response
-            "hl": "on",
+            "hl": "on" if highlight else "off",
             "hl.method": "fastVector",
             "hl.fragsize": 200,
             # Highlight fields list
@@ -115,25 +205,25 @@ async def search(
             "wt": "json",
         }
     }
+    if fl:
+        request_body["params"]["fl"] = ",".join(fl)
+    if group_by:
+        del request_body["params"]["cursorMark"]
+        request_body["params"].update({
+            "group": "true",
+            "group.field": group_by,
+            "group.limit": group_limit,
+            "group.main": "true",
+        })
     if facets is not None and len(facets) > 0:
         request_body["facet"] = {
             k: v.serialize_to_solr_format() for k, v in facets.items()
         }
+        if facets_exclude_own_filters:
+            request_body["facet"] = exclude_own_filters(request_body["facet"])
         if "title" in request_body["facet"]:
             request_body["facet"] = None
-    response = await handle_solr_list_response_errors(
-        client.post(
-            f"{settings.SOLR_URL}{solr_collection}/select",
-            json=request_body,
-        )
-    )
-
-    data = response.json()
-
-    if len(data["response"]["docs"]) == 0:
-        await _check_collection_sanity(client, collection)
-
-    return SolrResponse(collection=collection, data=data)
+    return request_body
 
 
 async def search_advanced(
@@ -148,6 +238,7 @@ async def search_advanced(
     exact: str,
     cursor: str = "*",
     facets: dict[str, TermsFacet] | None,
+    fl: Optional[list[str]] = None,
 ) -> SolrResponse:
     # pylint: disable=line-too-long
     """
@@ -162,6 +253,8 @@ async def search_advanced(
     https://solr.apache.org/guide/8_11/pagination-of-results.html#fetching-a-large-number-of-sorted-results-cursors.
 
     Facets support a subset of parameters from: https://solr.apache.org/guide/8_11/json-facet-api.html.
+
+    `fl` restricts the returned fields of the documents.
     """
     q = q.replace("(", r"").replace(")", r"")
     q = q.replace("[", r"").replace("]", r"")
@@ -221,6 +314,8 @@ async def search_advanced(
             "wt": "json",
         }
     }
+    if fl:
+        request_body["params"]["fl"] = ",".join(fl)
 
     if facets is not None and len(facets) > 0:
         request_body["facet"] = {k: v.dict() for k, v in facets.items()}
@@ -233,7 +328,7 @@ async def search_advanced(
             json=request_body,
         )
     )
-    data = response.json()
+    data = fast_json.loads(response.content)
 
     if facets and len(data["response"]["docs"]) == 0:
         await _check_collection_sanity(client, collection)
@@ -245,45 +340,20 @@ async def _check_collection_sanity(client, collection):
     """
     Helper function checking if the solr collection is not empty in case of solr data request
     returns a response with no data.
+    The document count is taken from the index status registry, a cheap count query is made
+    only when it's unknown.
     """
-    if collection == Collection.PROVIDER:
-        qf = PROVIDER_QF
-    elif collection == Collection.ORGANISATION:
-        qf = ORGANISATION_QF
-    elif collection == Collection.PROJECT:
-        qf = PROJECT_QF
-    elif collection == Collection.CATALOGUE:
-        qf = CATALOGUE_QF
-
-    else:
-        qf = DEFAULT_QF
-    request_body = {
-        "params": {
-            "defType": "edismax",
-            "lowercaseOperators": "false",
-            "mm": "80%",
-            "tie": "0.1",
-            "qs": "5",
-            "hl": "on",
-            "hl.method": "fastVector",
-            "q": "*",
-            "qf": qf,
-            "pf": qf,
-            "fq": [],
-            "rows": 1,
-            "cursorMark": "*",
-            "sort": "score desc, id asc",
-            "wt": "json",
-        }
-    }
     solr_collection = f"{settings.COLLECTIONS_PREFIX}{collection}"
-    response = await handle_solr_list_response_errors(
-        client.post(
-            f"{settings.SOLR_URL}{solr_collection}/select",
-            json=request_body,
+    is_empty = await index_status.is_empty(client, solr_collection)
+    if is_empty is None:
+        response = await handle_solr_list_response_errors(
+            client.post(
+                f"{settings.SOLR_URL}{solr_collection}/select",
+                json={"params": {"q": "*:*", "rows": 0, "wt": "json"}},
+            )
         )
-    )
-    if len(response.json()["response"]["docs"]) == 0:
+        is_empty = fast_json.loads(response.content)["response"]["numFound"] == 0
+    if is_empty:
         raise SolrCollectionEmptyError()
 
 
@@ -295,10 +365,47 @@ async def get(
     """Get item from defined collection based on ID"""
     solr_collection = f"{settings.COLLECTIONS_PREFIX}{collection}"
     url = f"{settings.SOLR_URL}{solr_collection}/get?id={item_id}"
-    response = await handle_solr_detail_response_errors(client.get(url))
-    response = response.json()
 
-    return response
+    async def _get() -> bytes:
+        response = await handle_solr_detail_response_errors(client.get(url))
+        return response.content
+
+    data = fast_json.loads(await _coalesce(("get", url), _get))
+    if data["doc"] is None:
+        raise SolrDocumentNotFoundError()
+    return data
+
+
+async def _coalesce(request: tuple, fetch: Callable[[], Awaitable[bytes]]) -> bytes:
+    """Share the response body among identical concurrent Solr requests"""
+    if not settings.SOLR_SINGLE_FLIGHT_ENABLED:
+        return await fetch()
+    key = json.dumps(request, sort_keys=True, default=str)
+    return await solr_requests.do(key, fetch)
+
+
+async def get_many(
+    client: AsyncClient,
+    collection: Collection,
+    item_ids: Iterable[int | str],
+    fl: Optional[list[str]] = None,
+) -> list[Dict]:
+    """
+    Get items from defined collection based on IDs using a single real-time get request.
+    Missing items are skipped, so the result may be shorter than `item_ids`.
+    """
+    item_ids = [str(item_id) for item_id in item_ids]
+    if not item_ids:
+        return []
+    solr_collection = f"{settings.COLLECTIONS_PREFIX}{collection}"
+    params = {"ids": ",".join(item_ids)}
+    if fl:
+        params["fl"] = ",".join(fl)
+    response = await handle_solr_list_response_errors(
+        client.get(f"{settings.SOLR_URL}{solr_collection}/get", params=params)
+    )
+
+    return fast_json.loads(response.content)["response"]["docs"]
 
 
 async def get_item_by_pid(
@@ -312,6 +419,54 @@ async def get_item_by_pid(
     return await handle_solr_list_response_errors(client.get(url))
 
 
+async def get_items_by_pids(
+    client: AsyncClient,
+    collection: Collection,
+    item_pids: Iterable[str],
+) -> list[Dict]:
+    """
+    Get items from defined collection based on PIDs, paging through the matching documents.
+    A PID may be shared by several documents, e.g. a service and a data source,
+    in which case only the first one is kept.
+    Missing items are skipped, so the result may be shorter than `item_pids`.
+    """
+    item_pids = list(item_pids)
+    if not item_pids:
+        return []
+    solr_collection = f"{settings.COLLECTIONS_PREFIX}{collection}"
+    docs_by_pid = {}
+    cursor = "*"
+    while True:
+        response = await handle_solr_list_response_errors(
+            client.post(
+                f"{settings.SOLR_URL}{solr_collection}/query",
+                json={
+                    "params": {
+                        "q": any_of_filter("pid", item_pids),
+                        "rows": ITEMS_BY_PIDS_PAGE_SIZE,
+                        "sort": "id asc",
+                        "cursorMark": cursor,
+                        "wt": "json",
+                    }
+                },
+            )
+        )
+        data = fast_json.loads(response.content)
+        for doc in data["response"]["docs"]:
+            pids = doc["pid"] if isinstance(doc["pid"], list) else [doc["pid"]]
+            for pid in pids:
+                docs_by_pid.setdefault(pid, doc)
+        if data["nextCursorMark"] == cursor:
+            break
+        cursor = data["nextCursorMark"]
+
+    docs = {}
+    for pid in item_pids:
+        if pid in docs_by_pid:
+            docs.setdefault(docs_by_pid[pid]["id"], docs_by_pid[pid])
+    return list(docs.values())
+
+
 def search_dep():
     """FastAPI search method dependency"""
     return search
@@ -325,3 +480,8 @@ def search_advanced_dep():
 def get_dep():
     """get method dependency"""
     return get
+
+
+def solr_client_dep() -> AsyncClient:
+    """FastAPI pooled Solr client dependency"""
+    return http_clients.get(Upstream.SOLR)
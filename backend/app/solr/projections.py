@@ -0,0 +1,146 @@
+"""Fields of Solr documents returned per view of the results"""
+
+from enum import Enum
+from typing import Optional
+
+from app.consts import Collection
+from app.settings import settings
+
+
+class View(str, Enum):
+    """Way the retrieved documents are presented"""
+
+    LIST = "list"
+    DETAIL = "detail"
+    EXPORT = "export"
+    SUGGESTION = "suggestion"
+    CANDIDATE = "candidate"
+
+
+# Fields rendered on the result cards of the UI, read by the UI collections adapters
+_CARD_FIELDS = [
+    "id",
+    "pid",
+    "pids",
+    "type",
+    "title",
+    "abbreviation",
+    "description",
+    "url",
+    "keywords",
+    "tag_list",
+    "language",
+    "license",
+    "best_access_right",
+    "scientific_domains",
+    "categories",
+    "unified_categories",
+    "type_general",
+    "guidelines",
+    "publication_date",
+    "publication_year",
+    "publisher",
+    "author_names",
+    "document_type",
+    "resource_type",
+    "content_type",
+    "eosc_if",
+    "horizontal",
+    # Instances are stored as JSON strings, Solr embeds them as JSON objects
+    "exportation:[json]",
+    "catalogue",
+    "provider",
+    "providers",
+    "resource_organisation",
+    "related_organisation_titles",
+    "right_id",
+    "status",
+    "country",
+    "legal_status",
+    "areas_of_activity",
+    "meril_scientific_domains",
+    "usage_counts_downloads",
+    "usage_counts_views",
+]
+
+# Fields the backend extends or parses the list results with
+_COLLECTION_LIST_FIELDS = {
+    Collection.BUNDLE: [
+        "iid",
+        "service_id",
+        "bundle_goals",
+        "capabilities_of_goals",
+        "main_offer_id",
+        "offer_ids",
+        "offers_summary",
+    ],
+    Collection.GUIDELINE: [
+        "related_services",
+        "related_services_summary",
+        "related_services_updated_at",
+    ],
+    Collection.ORGANISATION: [
+        "alternative_names",
+        "related_publication_number",
+        "related_software_number",
+        "related_dataset_number",
+        "related_other_number",
+        "related_project_number",
+    ],
+    Collection.PROJECT: [
+        "code",
+        "currency",
+        "date_range",
+        "start_date",
+        "end_date",
+        "funding_stream_title",
+        "funding_title",
+        "total_cost",
+        "year_range",
+    ],
+}
+_ORGANISATION_RELATED_IDS_FIELDS = [
+    "related_publication_ids",
+    "related_software_ids",
+    "related_dataset_ids",
+    "related_other_ids",
+    "related_project_ids",
+]
+_COLLECTION_LIST_FIELDS[Collection.ALL_COLLECTION] = (
+    _COLLECTION_LIST_FIELDS[Collection.BUNDLE]
+    + _COLLECTION_LIST_FIELDS[Collection.GUIDELINE]
+)
+
+FIELD_PROFILES: dict[View, Optional[list[str]]] = {
+    View.DETAIL: None,
+    View.LIST: _CARD_FIELDS,
+    View.EXPORT: ["title", "type", "description", "best_access_right"],
+    # Fields needed to link a suggestion to its resource
+    View.SUGGESTION: ["id", "pid", "type", "title", "url", "service_id", "iid"],
+    # Fields needed to rank candidates by the recommender
+    View.CANDIDATE: ["id", "pid", "type"],
+}
+
+# Views that return all fields once the projection is disabled
+_OPTIONAL_PROJECTION_VIEWS = {View.LIST, View.SUGGESTION}
+
+
+def fields_for(view: View, collection: Collection | str) -> Optional[list[str]]:
+    """
+    Return the fields of the collection documents retrieved for the view.
+    None means all the stored fields.
+    """
+    if view in _OPTIONAL_PROJECTION_VIEWS and not settings.FIELD_PROJECTION_ENABLED:
+        return None
+    fields = FIELD_PROFILES[view]
+    if fields is None or view != View.LIST:
+        return fields
+    try:
+        collection = Collection(collection)
+    except ValueError:
+        return fields
+    fields = fields + _COLLECTION_LIST_FIELDS.get(collection, [])
+    if collection == Collection.ORGANISATION and not settings.RELATION_COUNTS_INDEXED:
+        # Organisations indexed without relation counts are counted by their ids
+        fields = fields + _ORGANISATION_RELATED_IDS_FIELDS
+    return fields
@@ -1,5 +1,6 @@
 """Module for helper utilities for solr operations module"""
 
+import re
 from datetime import date, timedelta
 
 STATUS_TO_DATE_RANGE_MAP = {
@@ -72,3 +73,47 @@ def parse_organisation_filters(fq):
     )
 
     return regular_fq
+
+
+def tag_filters(fq):
+    """
+    Function tagging each filter with the names of the fields it filters on,
+    so that a facet can exclude the filters of its own field
+    https://solr.apache.org/guide/8_11/faceting.html#tagging-and-excluding-filters
+    """
+    tagged_fq = []
+    for item in fq:
+        # Only `field:value` clauses are tagged, bare OR values have no field
+        fields = [
+            match.group(1)
+            for part in item.split(" OR ")
+            if (match := re.match(r"([\w.]+):", part))
+        ]
+        tags = list(dict.fromkeys(fields))
+        tagged_fq.append(f"{{!tag={','.join(tags)}}}{item}" if tags else item)
+    return tagged_fq
+
+
+def exclude_own_filters(facets):
+    """
+    Function excluding filters tagged with the facet name from the facet domain,
+    which results in "OR" type logic within the same facet
+    """
+    return {
+        key: (
+            {**value, "domain": {"excludeTags": key}}
+            if isinstance(value, dict)
+            else value
+        )
+        for key, value in facets.items()
+    }
+
+
+def escape_phrase(value) -> str:
+    """Escape a value to be used within a quoted Solr phrase"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def any_of_filter(field: str, values) -> str:
+    """Create a filter matching any of the values of the field"""
+    return f"{field}:(" + " OR ".join(f'"{escape_phrase(v)}"' for v in values) + ")"
@@ -5,27 +5,49 @@ import logging
 from typing import Callable
 
 from fastapi import FastAPI
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-
+from sqlalchemy import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.dependencies.user_actions import user_actions_publisher
+from app.recommender.router_utils.recommendation_pools import recommendation_pools
 from app.settings import settings
+from app.utils.http_client import http_clients
 
 logger = logging.getLogger(__name__)
 
 
-def create_session_local() -> sessionmaker:
-    """Just creates a new session_local"""
-    engine = create_engine(
-        settings.DATABASE_URI.unicode_string(), future=True, echo=True
+def create_db_engine() -> AsyncEngine:
+    """Create engine with a pool of asyncio DB connections"""
+    url = make_url(settings.DATABASE_URI.unicode_string()).set(
+        drivername="postgresql+asyncpg"
+    )
+    return create_async_engine(
+        url,
+        echo=settings.DATABASE_ECHO,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_pre_ping=True,
     )
-    return sessionmaker(engine)
 
 
-def connect_to_db(app: FastAPI, session_local: sessionmaker) -> None:
-    """Connect to DB"""
+def create_session_local(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    """Just creates a new session_local"""
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+def connect_to_db(app: FastAPI) -> None:
+    """Create DB engine, sessions are created per request"""
     try:
+        engine = create_db_engine()
         # pylint: disable=protected-access
-        app.state._db = session_local()
+        app.state._db_engine = engine
+        app.state._session_local = create_session_local(engine)
     # pylint: disable=broad-except
     except Exception as e:
         logger.warning("--- DB CONNECTION ERROR ---")
@@ -33,11 +55,11 @@ def connect_to_db(app: FastAPI, session_local: sessionmaker) -> None:
         logger.warning("--- DB CONNECTION ERROR ---")
 
 
-def close_db_connection(app: FastAPI) -> None:
-    """Close connection to DB"""
+async def close_db_connection(app: FastAPI) -> None:
+    """Close all connections of the DB pool"""
     try:
         # pylint: disable=protected-access
-        app.state._db.close()
+        await app.state._db_engine.dispose()
     # pylint: disable=broad-except
     except Exception as e:
         logger.warning("--- DB DISCONNECT ERROR ---")
@@ -49,7 +71,10 @@ def create_start_app_handler(app: FastAPI) -> Callable:
     """Start app handler"""
 
     async def start_app() -> None:
-        connect_to_db(app, create_session_local())
+        connect_to_db(app)
+        http_clients.start()
+        recommendation_pools.start()
+        user_actions_publisher.start()
 
     return start_app
 
@@ -58,6 +83,9 @@ def create_stop_app_handler(app: FastAPI) -> Callable:
     """Stop app handler"""
 
     async def stop_app() -> None:
-        close_db_connection(app)
+        await close_db_connection(app)
+        await recommendation_pools.stop()
+        await user_actions_publisher.stop()
+        await http_clients.aclose()
 
     return stop_app
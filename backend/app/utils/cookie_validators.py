@@ -11,13 +11,14 @@ https://jordanisaacs.github.io/fastapi-sessions/guide/getting_started/
 from uuid import UUID
 
 from fastapi import HTTPException
-from fastapi_sessions.backends.implementations import InMemoryBackend
+from fastapi_sessions.backends.session_backend import SessionBackend
 from fastapi_sessions.frontends.implementations import CookieParameters, SessionCookie
 from fastapi_sessions.session_verifier import SessionVerifier
 from starlette import status
 
 from app.schemas.session_data import SessionData
 from app.settings import AUTH_COOKIES_CONFIG
+from app.utils.session_backends import make_session_backend
 
 
 class BasicVerifier(SessionVerifier[UUID, SessionData]):
@@ -26,7 +27,7 @@ class BasicVerifier(SessionVerifier[UUID, SessionData]):
         *,
         identifier: str,
         auto_error: bool,
-        backend_cookie_service: InMemoryBackend[UUID, SessionData],
+        backend_cookie_service: SessionBackend[UUID, SessionData],
         auth_http_exception: HTTPException,
     ):
         self._identifier = identifier
@@ -62,7 +63,7 @@ cookie = SessionCookie(
     auto_error=AUTH_COOKIES_CONFIG["auto_error"],
     cookie_params=CookieParameters(**AUTH_COOKIES_CONFIG),
 )
-backend = InMemoryBackend[UUID, SessionData]()
+backend = make_session_backend()
 verifier = BasicVerifier(
     identifier=AUTH_COOKIES_CONFIG["identifier"],
     auto_error=AUTH_COOKIES_CONFIG["auto_error"],
@@ -0,0 +1,29 @@
+"""JSON encoding and decoding, backed by `orjson` when it's installed"""
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data: bytes | str) -> Any:
+    """Deserialize a JSON document"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to a JSON document encoded in utf-8"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# Default response class of the application
+JSONResponseClass = ORJSONResponse if orjson is not None else JSONResponse
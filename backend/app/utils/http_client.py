@@ -1,12 +1,84 @@
 """Common routes code"""
 
+import importlib.util
+import logging
+from enum import Enum
+from typing import Optional
+
 import httpx
 from httpx import AsyncClient
 
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Upstream(str, Enum):
+    """External services the backend keeps a connection pool for"""
+
+    SOLR = "solr"
+    RECOMMENDER = "recommender"
+    RELATED_SERVICES = "related_services"
+    DOI = "doi"
+
+
+def _is_http2_available() -> bool:
+    """HTTP/2 support in httpx requires the optional `h2` package"""
+    return importlib.util.find_spec("h2") is not None
+
+
+def make_pooled_http_client(upstream: Upstream) -> AsyncClient:
+    """Return a long-lived AsyncClient with a connection pool sized for the upstream"""
+    max_connections, timeout = {
+        Upstream.SOLR: (settings.SOLR_MAX_CONNECTIONS, settings.SOLR_TIMEOUT),
+        Upstream.RECOMMENDER: (settings.RS_MAX_CONNECTIONS, settings.RS_TIMEOUT),
+    }.get(upstream, (settings.HTTP_MAX_CONNECTIONS, settings.HTTP_TIMEOUT))
 
-def make_async_http_client() -> AsyncClient:
-    """Return configured AsyncClient to be used across external API calls"""
     return AsyncClient(
-        timeout=httpx.Timeout(15.0),
-        limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+        timeout=httpx.Timeout(timeout),
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        ),
+        # HTTP/2 is negotiated via ALPN, so plain http upstreams stay on HTTP/1.1
+        http2=settings.HTTP2_ENABLED and _is_http2_available(),
     )
+
+
+class HttpClientRegistry:
+    """
+    Application-scoped registry of pooled AsyncClients, one per upstream.
+
+    Clients are opened on application startup and closed on shutdown.
+    A client requested outside of that lifecycle (e.g. in tests) is created lazily.
+    """
+
+    def __init__(self) -> None:
+        self._clients: dict[Upstream, AsyncClient] = {}
+
+    def start(self) -> None:
+        """Open a client for every upstream"""
+        for upstream in Upstream:
+            self.get(upstream)
+
+    def get(self, upstream: Upstream) -> AsyncClient:
+        """Return the pooled client of the upstream"""
+        client: Optional[AsyncClient] = self._clients.get(upstream)
+        if client is None or client.is_closed:
+            client = make_pooled_http_client(upstream)
+            self._clients[upstream] = client
+        return client
+
+    async def aclose(self) -> None:
+        """Close all clients and release their connections"""
+        clients, self._clients = self._clients, {}
+        for upstream, client in clients.items():
+            try:
+                await client.aclose()
+            # pylint: disable=broad-except
+            except Exception:
+                logger.exception("Could not close %s http client", upstream.value)
+
+
+http_clients = HttpClientRegistry()
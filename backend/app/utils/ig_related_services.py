@@ -1,20 +1,29 @@
 """Helper module to inject related services data into interoperability guileliens response"""
 
 import asyncio
-import copy
 import logging
+from datetime import datetime, timezone
 from typing import Optional
 
+from cachetools import TTLCache
 from httpx import AsyncClient, ConnectError, ConnectTimeout
 
 from app.consts import ResourceType
 from app.error_handling.exceptions import RelatedServicesError
-from app.schemas.solr_response import Collection, RelatedService
+from app.schemas.solr_response import Collection
 from app.settings import settings
-from app.solr.operations import get_item_by_pid
+from app.solr.operations import get_items_by_pids
+from app.utils import fast_json
+from app.utils.http_client import Upstream, http_clients
 
 logger = logging.getLogger(__name__)
 
+# Related services of guidelines, by guideline id
+related_services_cache = TTLCache(
+    maxsize=settings.RELATED_SERVICES_CACHE_MAXSIZE,
+    ttl=settings.RELATED_SERVICES_CACHE_TTL,
+)
+
 
 def _parse_categories(categories: list, unified_categories: Optional[list]) -> list:
     categories_set = set()
@@ -28,9 +37,9 @@ def _parse_categories(categories: list, unified_categories: Optional[list]) -> l
     return list(categories_set)
 
 
-async def _get_related_records_pids(client, ig_pid):
+async def _get_related_records_pids(ig_pid):
     try:
-        response = await client.get(
+        response = await http_clients.get(Upstream.RELATED_SERVICES).get(
             f"{settings.RELATED_SERVICES_ENDPOINT}/{ig_pid}",
         )
         if response.status_code != 200:
@@ -51,59 +60,91 @@ async def _get_related_records_pids(client, ig_pid):
 
 async def extend_ig_with_related_services(client: AsyncClient, docs: list[dict]):
     """Main function responsible for extending iteroperability guideline response
-    with related services data
+    with related services data. Guidelines are extended in place and concurrently.
     """
-    new_docs = []
-    for doc in docs:
-        if doc["type"] == ResourceType.GUIDELINE:
-            related_services_pids = []
-            try:
-                related_services_pids = await _get_related_records_pids(
-                    client, doc["id"]
-                )
-            except RelatedServicesError:
-                logger.exception("Exception happened during _get_related_records_pids")
-                related_services_pids = []
-            finally:
-                if related_services_pids:
-                    doc["related_services"] = await _get_related_services(
-                        client, related_services_pids
-                    )
-                else:
-                    doc["related_services"] = []
-                new_docs.append(copy.deepcopy(doc))
-        else:
-            new_docs.append(copy.deepcopy(doc))
-
-    return new_docs
+    semaphore = asyncio.Semaphore(settings.RELATED_SERVICES_CONCURRENCY)
+
+    async def _extend(doc: dict) -> None:
+        stored = _get_stored_related_services(doc)
+        if stored is not None:
+            doc["related_services"] = stored
+            return
+        async with semaphore:
+            doc["related_services"] = await _get_ig_related_services(client, doc["id"])
+
+    await asyncio.gather(
+        *[_extend(doc) for doc in docs if doc["type"] == ResourceType.GUIDELINE]
+    )
+    return docs
 
 
-async def _get_related_services(client: AsyncClient, related_services_pids: list[str]):
-    gathered_result = await asyncio.gather(
-        *[_get_related_service(client, pid) for pid in related_services_pids]
+def _get_stored_related_services(doc: dict) -> Optional[list]:
+    """
+    Related services summaries stored on the guideline at transform time.
+    None if they are missing or older than RELATED_SERVICES_MAX_AGE,
+    then related services have to be retrieved.
+    """
+    summary = doc.pop("related_services_summary", None)
+    updated_at = doc.pop("related_services_updated_at", None)
+    if summary is None or updated_at is None:
+        return None
+    age = datetime.now(timezone.utc) - datetime.fromisoformat(
+        updated_at.replace("Z", "+00:00")
     )
-    return [result for result in gathered_result if result]
+    if age.total_seconds() > settings.RELATED_SERVICES_MAX_AGE:
+        return None
+    return [_to_related_service(service) for service in fast_json.loads(summary)]
+
 
+async def _get_ig_related_services(client: AsyncClient, ig_id: str) -> list:
+    cached = related_services_cache.get(ig_id)
+    if cached is not None:
+        return list(cached)
 
-async def _get_related_service(client, pid):
-    response = await get_item_by_pid(
-        client=client, collection=Collection.ALL_COLLECTION, item_pid=pid
+    try:
+        related_services_pids = await _get_related_records_pids(ig_id)
+    except RelatedServicesError:
+        logger.exception("Exception happened during _get_related_records_pids")
+        return []
+
+    related_services = (
+        await _get_related_services(client, related_services_pids)
+        if related_services_pids
+        else []
     )
+    related_services_cache[ig_id] = related_services
+    return list(related_services)
 
-    if response and response.json()["response"]["docs"]:
-        service = response.json()["response"]["docs"][0]
-        unified_categories = service.get("unified_categories")
-        service_obj = RelatedService(
-            pid=service["pid"],
-            best_access_right=service["best_access_right"],
-            title=service["title"][0],
-            resource_organisation=service["resource_organisation"],
-            tagline=service["tagline"],
-            joined_categories=_parse_categories(
-                service["categories"],
-                unified_categories,
-            ),
-            type=service["type"],
-        )
-        return service_obj
-    return None
+
+async def _get_related_services(client: AsyncClient, related_services_pids: list[str]):
+    """Retrieve all the related services with a single request, keeping the order of pids"""
+    services = await get_items_by_pids(
+        client, Collection.ALL_COLLECTION, related_services_pids
+    )
+    services_by_pid = {}
+    for service in services:
+        pids = service["pid"] if isinstance(service["pid"], list) else [service["pid"]]
+        for pid in pids:
+            services_by_pid.setdefault(pid, service)
+
+    return [
+        _to_related_service(services_by_pid[pid])
+        for pid in related_services_pids
+        if pid in services_by_pid
+    ]
+
+
+def _to_related_service(service: dict) -> dict:
+    unified_categories = service.get("unified_categories")
+    return {
+        "pid": service["pid"],
+        "best_access_right": service["best_access_right"],
+        "title": service["title"][0],
+        "resource_organisation": service["resource_organisation"],
+        "tagline": service["tagline"],
+        "joined_categories": _parse_categories(
+            service["categories"],
+            unified_categories,
+        ),
+        "type": service["type"],
+    }
@@ -0,0 +1,203 @@
+"""Session backends storing sessions outside of the backend process"""
+
+import asyncio
+import logging
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from contextlib import closing, contextmanager
+from typing import Iterator, Optional
+from urllib.parse import urlparse
+from uuid import UUID
+
+from cachetools import TTLCache
+from fastapi_sessions.backends.implementations import InMemoryBackend
+from fastapi_sessions.backends.session_backend import BackendError, SessionBackend
+
+from app.schemas.session_data import SessionData
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_CREATE_SESSIONS_TABLE = """
+CREATE TABLE IF NOT EXISTS sessions (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires_at REAL NOT NULL
+)
+"""
+
+
+class SessionStore(ABC):
+    """Storage of serialized sessions, expiring after their TTL"""
+
+    @abstractmethod
+    async def get(self, key: str, ttl: int) -> Optional[bytes]:
+        """
+        Return the stored value or None if it's missing or expired.
+        The value expires `ttl` seconds after it's read.
+        """
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        """Store the value for `ttl` seconds"""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove the value"""
+
+
+class RedisSessionStore(SessionStore):
+    """Store shared among backend processes and replicas. Requires the `redis` package."""
+
+    KEY_PREFIX = "ess:session:"
+
+    def __init__(self, url: str):
+        try:
+            # pylint: disable=import-outside-toplevel
+            from redis import asyncio as aioredis
+        except ImportError as e:
+            raise RuntimeError(
+                "SESSION_STORE_URL is a Redis URL, but the `redis` package is not"
+                " installed"
+            ) from e
+        self._redis = aioredis.from_url(url)
+
+    async def get(self, key: str, ttl: int) -> Optional[bytes]:
+        return await self._redis.getex(self.KEY_PREFIX + key, ex=ttl)
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        await self._redis.set(self.KEY_PREFIX + key, value, ex=ttl)
+
+    async def delete(self, key: str) -> None:
+        await self._redis.delete(self.KEY_PREFIX + key)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Store in a local SQLite file, shared among the worker processes of a single host.
+    Expired sessions are removed on write.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        with self._connect() as connection:
+            connection.execute(_CREATE_SESSIONS_TABLE)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Connection committing on exit, closed afterwards"""
+        with closing(sqlite3.connect(self._path, timeout=10.0)) as connection:
+            with connection:
+                yield connection
+
+    def _get(self, key: str, ttl: int) -> Optional[bytes]:
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE sessions SET expires_at = ? WHERE key = ? AND expires_at > ?",
+                (now + ttl, key, now),
+            )
+            row = connection.execute(
+                "SELECT value FROM sessions WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set(self, key: str, value: bytes, ttl: int) -> None:
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,))
+            connection.execute(
+                "INSERT OR REPLACE INTO sessions (key, value, expires_at)"
+                " VALUES (?, ?, ?)",
+                (key, value, now + ttl),
+            )
+
+    def _delete(self, key: str) -> None:
+        with self._connect() as connection:
+            connection.execute("DELETE FROM sessions WHERE key = ?", (key,))
+
+    async def get(self, key: str, ttl: int) -> Optional[bytes]:
+        return await asyncio.to_thread(self._get, key, ttl)
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        await asyncio.to_thread(self._set, key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._delete, key)
+
+
+class StoreSessionBackend(SessionBackend[UUID, SessionData]):
+    """
+    Session backend keeping sessions in a SessionStore.
+
+    Sessions read from the store are cached in-process for `cache_ttl` seconds,
+    so a session deleted by another process may be still valid here for that long.
+    Reading a session from the store extends its expiration to `ttl` seconds,
+    so active sessions don't expire.
+    """
+
+    def __init__(
+        self, store: SessionStore, ttl: int, cache_ttl: float, cache_maxsize: int
+    ):
+        self.store = store
+        self.ttl = ttl
+        self._cache = TTLCache(maxsize=cache_maxsize, ttl=cache_ttl)
+
+    async def create(self, session_id: UUID, data: SessionData) -> None:
+        if await self.read(session_id) is not None:
+            raise BackendError("create can't overwrite an existing session")
+        await self._write(session_id, data)
+
+    async def read(self, session_id: UUID) -> Optional[SessionData]:
+        key = str(session_id)
+        value = self._cache.get(key)
+        if value is None:
+            value = await self.store.get(key, self.ttl)
+            if value is None:
+                return None
+            self._cache[key] = value
+        return SessionData.model_validate_json(value)
+
+    async def update(self, session_id: UUID, data: SessionData) -> None:
+        if await self.read(session_id) is None:
+            raise BackendError("session does not exist, cannot update")
+        await self._write(session_id, data)
+
+    async def delete(self, session_id: UUID) -> None:
+        key = str(session_id)
+        self._cache.pop(key, None)
+        await self.store.delete(key)
+
+    async def _write(self, session_id: UUID, data: SessionData) -> None:
+        key = str(session_id)
+        value = data.model_dump_json().encode("utf-8")
+        await self.store.set(key, value, self.ttl)
+        self._cache[key] = value
+
+
+def make_session_backend() -> SessionBackend[UUID, SessionData]:
+    """
+    Create session backend with the store defined in settings.
+    Sessions are kept in the process memory when no store is set.
+    """
+    url = settings.SESSION_STORE_URL
+    if not url:
+        return InMemoryBackend[UUID, SessionData]()
+
+    scheme = urlparse(url).scheme
+    if scheme in ("redis", "rediss", "unix"):
+        store = RedisSessionStore(url)
+    elif scheme == "sqlite":
+        store = SQLiteSessionStore(url.removeprefix("sqlite://"))
+    else:
+        raise ValueError(f"Unsupported SESSION_STORE_URL scheme: {scheme}")
+    logger.info("Sessions are stored in %s store", scheme)
+
+    return StoreSessionBackend(
+        store,
+        ttl=settings.SESSION_TTL,
+        cache_ttl=settings.SESSION_CACHE_TTL,
+        cache_maxsize=settings.SESSION_CACHE_MAXSIZE,
+    )
@@ -0,0 +1,32 @@
+"""Coalescing of identical concurrent calls"""
+
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Concurrent calls with the same key await a single execution and share its result
+    (or exception). Once the execution finishes, the next call with the key starts
+    a new one, so nothing is cached.
+
+    Results are shared as they are, so they should be immutable (e.g. bytes).
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Execute `fn` unless an execution with the same key is already in flight"""
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._calls[key] = future
+            future.add_done_callback(lambda _: self._calls.pop(key, None))
+        # A cancelled caller mustn't cancel the execution awaited by the others
+        return await asyncio.shield(future)
+
+    def __len__(self) -> int:
+        return len(self._calls)
@@ -2,24 +2,26 @@
 from datetime import datetime
 
 import pytest
-from sqlalchemy import select
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.db.repositories.dumps import DumpsRepository
 from app.models import Dump, DumpElement
-from app.tasks import create_session_local
+from app.tasks import create_db_engine, create_session_local
 
 
 # pylint: disable=unused-argument
 @pytest.fixture
-def db(apply_migrations: None) -> Session:
-    session_local = create_session_local()
-    with session_local() as db:
+async def db(apply_migrations: None) -> AsyncSession:
+    engine = create_db_engine()
+    async with create_session_local(engine)() as db:
         yield db
+    await engine.dispose()
 
 
 @pytest.fixture
-def dumps_repo(db: Session) -> DumpsRepository:
+def dumps_repo(db: AsyncSession) -> DumpsRepository:
     return DumpsRepository(db)
 
 
@@ -54,19 +56,27 @@ def another_dump() -> Dump:
 
 
 @pytest.fixture
-def create_dumps(db: Session, new_dump: Dump, another_dump: Dump) -> None:
+async def create_dumps(db: AsyncSession, new_dump: Dump, another_dump: Dump) -> None:
     db.add(new_dump)
     db.add(another_dump)
-    db.commit()
+    await db.commit()
 
 
-def test_create_dump(db: Session, dumps_repo: DumpsRepository, new_dump: Dump):
-    assert db.query(Dump).count() == 0
+async def count_dumps(db: AsyncSession) -> int:
+    # pylint: disable-next=not-callable
+    return await db.scalar(select(func.count()).select_from(Dump))
 
-    dumps_repo.create_dump(new_dump=new_dump)
+
+@pytest.mark.asyncio
+async def test_create_dump(
+    db: AsyncSession, dumps_repo: DumpsRepository, new_dump: Dump
+):
+    assert await count_dumps(db) == 0
+
+    await dumps_repo.create_dump(new_dump=new_dump)
 
     stmt = select(Dump).options(selectinload(Dump.elements))
-    dumps = db.execute(stmt).scalars().all()
+    dumps = (await db.execute(stmt)).scalars().all()
 
     assert len(dumps) == 1
     assert dumps[0].name == "foo"
@@ -76,9 +86,12 @@ def test_create_dump(db: Session, dumps_repo: DumpsRepository, new_dump: Dump):
 
 
 # pylint: disable=unused-argument
-def test_list_all_dumps(db: Session, dumps_repo: DumpsRepository, create_dumps: None):
-    assert db.query(Dump).count() == 2
+@pytest.mark.asyncio
+async def test_list_all_dumps(
+    db: AsyncSession, dumps_repo: DumpsRepository, create_dumps: None
+):
+    assert await count_dumps(db) == 2
 
-    dumps = dumps_repo.list_all_dumps()
+    dumps = await dumps_repo.list_all_dumps()
 
     assert len(dumps) == 2
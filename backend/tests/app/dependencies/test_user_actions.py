@@ -0,0 +1,159 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring,redefined-outer-name
+import asyncio
+import json
+import threading
+
+import pytest
+from stomp.exception import NotConnectedException
+
+from app.dependencies.user_actions import UserActionClient, UserActionPublisher
+from app.schemas.session_data import SessionData
+
+SESSION = SessionData(
+    username=None, aai_state=None, aai_id="aai", session_uuid="session-uuid"
+)
+
+
+@pytest.fixture
+def client(mocker) -> UserActionClient:
+    client = UserActionClient("localhost", 61613, "guest", "guest", "/topic/ua", False)
+    client.client = mocker.Mock()
+    client.client.is_connected.return_value = True
+    return client
+
+
+def publish(publisher: UserActionPublisher, resource_id: str = "123") -> bool:
+    return publisher.publish(
+        SESSION,
+        "https://anothersite.org/path",
+        "/search/all",
+        resource_id,
+        "service",
+        False,
+        "target-id",
+        None,
+    )
+
+
+def sent_resource_ids(client: UserActionClient) -> list[str]:
+    return [
+        json.loads(json.loads(call.args[1]))["source"]["root"]["resource_id"]
+        for call in client.client.send.call_args_list
+    ]
+
+
+def test_make_message_is_double_encoded(client):
+    message = client.make_message(
+        SESSION,
+        "https://anothersite.org/path",
+        "/search/all",
+        "1",
+        "service",
+        False,
+        "target-id",
+        None,
+    )
+
+    user_action = json.loads(json.loads(message))
+    assert user_action["aai_uid"] == "aai"
+    assert user_action["unique_id"] == "session-uuid"
+    assert user_action["target"] == {"visit_id": "target-id", "page_id": "/path"}
+
+
+def test_send_messages_keeps_connection_open(client):
+    client.send_messages(["a", "b"])
+
+    assert client.client.send.call_count == 2
+    client.client.connect.assert_not_called()
+    client.client.disconnect.assert_not_called()
+
+
+def test_send_messages_reconnects_and_resends_unsent(client):
+    client.client.send.side_effect = [None, NotConnectedException(), None, None]
+
+    client.send_messages(["a", "b", "c"])
+
+    assert [call.args[1] for call in client.client.send.call_args_list] == [
+        "a",
+        "b",
+        "b",
+        "c",
+    ]
+    client.client.disconnect.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_publisher_sends_queued_actions_in_batches(mocker, client):
+    send_messages = mocker.spy(client, "send_messages")
+    publisher = UserActionPublisher(client, queue_size=10, batch_size=2)
+    publisher.start()
+
+    for resource_id in ("1", "2", "3"):
+        assert publish(publisher, resource_id)
+    await publisher.stop()
+
+    assert sent_resource_ids(client) == ["1", "2", "3"]
+    assert all(len(call.args[0]) <= 2 for call in send_messages.call_args_list)
+    client.client.disconnect.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_publisher_drops_actions_once_queue_is_full(client):
+    publisher = UserActionPublisher(client, queue_size=1, batch_size=1)
+    publisher.start()
+
+    assert publish(publisher, "1")
+    assert not publish(publisher, "2")
+    await publisher.stop()
+
+    assert sent_resource_ids(client) == ["1"]
+
+
+@pytest.mark.asyncio
+async def test_publisher_not_running_does_not_queue(client):
+    publisher = UserActionPublisher(client, queue_size=1, batch_size=1)
+
+    assert not publish(publisher)
+    client.client.send.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_publisher_survives_send_failures(client):
+    client.client.send.side_effect = [OSError(), OSError(), None]
+    publisher = UserActionPublisher(client, queue_size=10, batch_size=1)
+    publisher.start()
+
+    publish(publisher, "1")
+    await asyncio.sleep(0.1)
+    publish(publisher, "2")
+    await publisher.stop()
+
+    assert sent_resource_ids(client)[-1] == "2"
+
+
+@pytest.mark.asyncio
+async def test_publisher_stop_waits_for_batch_being_sent(client):
+    sending = threading.Event()
+    release = threading.Event()
+
+    def send(*_args, **_kwargs):
+        sending.set()
+        release.wait(1)
+
+    client.client.send.side_effect = send
+    publisher = UserActionPublisher(client, queue_size=10, batch_size=1)
+    publisher.start()
+
+    publish(publisher, "1")
+    publish(publisher, "2")
+    await asyncio.to_thread(sending.wait, 1)
+    stop = asyncio.create_task(publisher.stop())
+    await asyncio.sleep(0.05)
+
+    assert not publish(publisher, "3")
+    client.client.disconnect.assert_not_called()
+    release.set()
+    await stop
+
+    assert sent_resource_ids(client) == ["1", "2"]
+    client.client.disconnect.assert_called_once()
@@ -0,0 +1,54 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.consts import Collection, PanelId
+from app.recommender.router_utils.recommendation_pools import RecommendationPools
+
+
+def _mock_search(mocker, ids: list[str]) -> AsyncMock:
+    response = Mock()
+    response.data = {"response": {"docs": [{"id": _id} for _id in ids]}}
+    return mocker.patch(
+        "app.recommender.router_utils.recommendation_pools.search",
+        AsyncMock(return_value=response),
+    )
+
+
+@pytest.mark.asyncio
+async def test_sample_is_served_from_refreshed_pool(mocker) -> None:
+    search = _mock_search(mocker, ["a", "b", "c", "d"])
+    pools = RecommendationPools(size=4, refresh_interval=60)
+
+    await pools.refresh(None)
+    search.reset_mock()
+    sample = await pools.sample(Collection.DATASET, count=3)
+
+    search.assert_not_called()
+    assert len(sample) == 3
+    assert set(sample) <= {"a", "b", "c", "d"}
+
+
+@pytest.mark.asyncio
+async def test_missing_pool_is_fetched_on_demand(mocker) -> None:
+    search = _mock_search(mocker, ["a"])
+    pools = RecommendationPools(size=4, refresh_interval=60)
+
+    assert await pools.sample(Collection.DATA_SOURCE) == ["a"]
+
+    search.assert_called_once()
+    assert search.call_args.kwargs["fq"][0] == 'type:("data source")'
+    assert search.call_args.kwargs["fl"] == ["id"]
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_previous_pool(mocker) -> None:
+    search = _mock_search(mocker, ["a", "b"])
+    pools = RecommendationPools(size=4, refresh_interval=60)
+    await pools.refresh_pool(None, PanelId.SOFTWARE)
+
+    search.side_effect = RuntimeError
+    await pools.refresh_pool(None, PanelId.SOFTWARE)
+
+    assert sorted(await pools.sample(Collection.SOFTWARE)) == ["a", "b"]
@@ -70,3 +70,35 @@ async def test_search_filters_one_facet(
     )
     mock_post_search_filters.assert_called_once()
     assert res.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.asyncio
+async def test_search_filters_many_facets_single_request(
+    client: AsyncClient, mock_post_search_filters: AsyncMock
+) -> None:
+    res = await client.post(
+        SEARCH_FILTERS_PATH,
+        params={
+            "collection": "all_collection",
+            "q": "bar",
+            "qf": "bar baz",
+            "fq": ['best_access_right:("Open access")'],
+            "exact": "false",
+        },
+        json={
+            "facets": {
+                "best_access_right": {"type": "terms", "field": "best_access_right"},
+                "language": {"type": "terms", "field": "language"},
+            }
+        },
+    )
+
+    assert res.status_code == status.HTTP_200_OK
+    mock_post_search_filters.assert_called_once()
+    kwargs = mock_post_search_filters.call_args.kwargs
+    assert kwargs["fq"] == ['best_access_right:("Open access")']
+    assert kwargs["rows"] == 0
+    assert kwargs["highlight"] is False
+    assert kwargs["facets_exclude_own_filters"] is True
+    assert set(kwargs["facets"]) == {"best_access_right", "language"}
+    assert res.json()["best_access_right"][0] == {"val": "Open access", "count": 10172}
@@ -0,0 +1,257 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring
+import json
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from fastapi import HTTPException
+
+from app.routes.web.search_results import (
+    extend_results_with_bundles,
+    parse_single_export,
+    parse_single_organisation,
+    search_sorted_by_relevance,
+    stream_export,
+)
+from app.schemas.solr_response import Collection
+
+
+@pytest.mark.asyncio
+async def test_extend_results_with_bundles_batches_requests(mocker) -> None:
+    offers = [
+        {"id": "1", "service_id": 10},
+        {"id": "2", "service_id": 10},
+        {"id": "3", "service_id": 20},
+    ]
+    services = [{"id": "10"}, {"id": "20"}]
+
+    async def fake_get_many(_client, collection, _ids, fl=None):
+        # pylint: disable=unused-argument
+        return offers if collection == Collection.OFFER else services
+
+    get_many = mocker.patch(
+        "app.routes.web.search_results.get_many",
+        AsyncMock(side_effect=fake_get_many),
+    )
+    res_json = {
+        "response": {
+            "docs": [
+                {"id": "a", "type": "bundle", "main_offer_id": 1, "offer_ids": [2]},
+                {"id": "b", "type": "bundle", "main_offer_id": 3},
+                {"id": "c", "type": "bundle", "main_offer_id": 4},
+                {"id": "d", "type": "service"},
+            ]
+        }
+    }
+
+    await extend_results_with_bundles(None, res_json)
+
+    assert get_many.call_count == 2
+    assert set(get_many.call_args_list[0].args[2]) == {"1", "2", "3", "4"}
+    assert set(get_many.call_args_list[1].args[2]) == {"10", "20"}
+    docs = res_json["response"]["docs"]
+    assert [offer["id"] for offer in docs[0]["offers"]] == ["1", "2"]
+    assert docs[0]["offers"][0]["service"] == {"id": "10"}
+    assert docs[1]["offers"][0]["service"] == {"id": "20"}
+    assert docs[2]["offers"] == [None]
+    assert "offers" not in docs[3]
+
+
+def _mock_paged_search(pages: list[list[dict]]) -> AsyncMock:
+    responses = []
+    for i, docs in enumerate(pages):
+        response = Mock()
+        response.data = {
+            "response": {"docs": docs},
+            "nextCursorMark": str(min(i + 1, len(pages) - 1)),
+        }
+        responses.append(response)
+    return AsyncMock(side_effect=responses)
+
+
+async def _export(search, export_format: str, max_rows=None) -> str:
+    chunks = await stream_export(
+        search,
+        None,
+        Collection.PUBLICATION,
+        q="*",
+        qf="title",
+        fq=[],
+        sort=["score desc", "id asc"],
+        exact="false",
+        export_format=export_format,
+        max_rows=max_rows,
+    )
+    return "".join([chunk async for chunk in chunks])
+
+
+@pytest.mark.asyncio
+async def test_stream_export_walks_cursor_pages() -> None:
+    search = _mock_paged_search([
+        [{"id": "1", "title": ["a"], "type": "publication"}],
+        [{"id": "2", "title": ["b"], "type": "dataset"}],
+        [],
+    ])
+
+    out = await _export(search, "jsonl")
+
+    assert [json.loads(line) for line in out.splitlines()] == [
+        {"title": "a", "type": "publication"},
+        {"title": "b", "type": "dataset"},
+    ]
+    assert [call.kwargs["cursor"] for call in search.call_args_list] == ["*", "1", "2"]
+    assert search.call_args.kwargs["fl"] == [
+        "title",
+        "type",
+        "description",
+        "best_access_right",
+    ]
+    assert all(call.kwargs["use_cache"] is False for call in search.call_args_list)
+
+
+@pytest.mark.asyncio
+async def test_stream_export_csv_respects_max_rows() -> None:
+    search = _mock_paged_search([
+        [{"title": "a", "type": "publication"}, {"title": "b", "type": "dataset"}],
+        [{"title": "c", "type": "software"}],
+    ])
+
+    out = await _export(search, "csv", max_rows=1)
+
+    assert out.splitlines() == [
+        "title,type,description,best_access_right",
+        "a,publication,,",
+    ]
+    search.assert_called_once()
+    assert search.call_args.kwargs["rows"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_export_fetches_first_page_before_streaming() -> None:
+    search = AsyncMock(side_effect=HTTPException(status_code=500))
+
+    with pytest.raises(HTTPException):
+        await _export(search, "csv")
+
+    search.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_search_sorted_by_relevance_fetches_page_documents(mocker) -> None:
+    candidates, page = Mock(), Mock()
+    candidates.data = {
+        "response": {"docs": [{"id": str(i), "type": "dataset"} for i in range(5)]},
+        "facets": {"count": 5},
+    }
+    page.data = {
+        "response": {"docs": [{"id": "1", "title": "b"}, {"id": "3", "title": "a"}]},
+        "highlighting": {"1": {}},
+    }
+    search = AsyncMock(side_effect=[candidates, page])
+    mocker.patch(
+        "app.routes.web.search_results.sort_by_relevance",
+        AsyncMock(
+            return_value={
+                "recommendations": [
+                    {"id": doc_id, "type": "dataset"} for doc_id in "43210"
+                ]
+            }
+        ),
+    )
+
+    res_json = await search_sorted_by_relevance(
+        None,
+        search,
+        None,
+        Collection.DATASET,
+        q="*",
+        qf="title",
+        fq=["type:dataset"],
+        sort=["score desc", "id asc"],
+        rows=2,
+        exact="false",
+        cursor="1",
+        facets=None,
+    )
+
+    assert search.call_args_list[0].kwargs["fl"] == ["id", "pid", "type"]
+    assert search.call_args_list[1].kwargs["fq"] == [
+        "type:dataset",
+        'id:("3" OR "2")',
+    ]
+    assert res_json["response"] == {"numFound": 5, "docs": [{"id": "3", "title": "a"}]}
+    assert res_json["nextCursorMark"] == "3"
+    assert res_json["facets"] == {"count": 5}
+    assert res_json["highlighting"] == {"1": {}}
+
+
+@pytest.mark.asyncio
+async def test_extend_results_with_bundles_uses_embedded_summaries(mocker) -> None:
+    get_many = mocker.patch("app.routes.web.search_results.get_many", AsyncMock())
+    offer = {"id": "1", "title": "Offer", "service": {"id": "10"}}
+    res_json = {
+        "response": {
+            "docs": [
+                {"id": "a", "type": "bundle", "offers_summary": [json.dumps(offer)]}
+            ]
+        }
+    }
+
+    await extend_results_with_bundles(None, res_json)
+
+    get_many.assert_not_called()
+    assert res_json["response"]["docs"][0] == {
+        "id": "a",
+        "type": "bundle",
+        "offers": [offer],
+    }
+
+
+@pytest.mark.asyncio
+async def test_parse_single_organisation_reads_indexed_relation_counts() -> None:
+    organisation = await parse_single_organisation({
+        "id": "org",
+        "type": "organisation",
+        "related_publication_number": 250000,
+        "related_project_number": 0,
+        # Indexed without counts
+        "related_dataset_ids": ["1", "2"],
+    })
+
+    assert organisation["related_publication_number"] == 250000
+    assert organisation["related_project_number"] == 0
+    assert organisation["related_dataset_number"] == 2
+    assert organisation["related_software_number"] == 0
+
+
+def test_parse_single_export_converts_former_instances() -> None:
+    instance = {
+        "url": ["https://repo.org/1", "https://doi.org/10.1/abc"],
+        "document_type": "Article",
+        "publication_year": "2020",
+        "hostedby": "Unknown Repository",
+    }
+
+    export = parse_single_export({"exportation": [json.dumps(instance)]})
+
+    assert export == [{
+        "url": "https://repo.org/1",
+        "documentType": "Article",
+        "publicationYear": "2020",
+        "license": None,
+        "hostedby": "",
+        "extractedDoi": "/10.1/abc",
+    }]
+
+
+def test_parse_single_export_forwards_precomputed_instances() -> None:
+    instance = {
+        "url": "https://doi.org/10.1/abc",
+        "documentType": "Article",
+        "publicationYear": "2020",
+        "license": None,
+        "hostedby": "Zenodo",
+        "extractedDoi": "/10.1/abc",
+    }
+
+    assert parse_single_export({"exportation": [instance]}) == [instance]
+    assert parse_single_export({"exportation": [json.dumps(instance)]}) == [instance]
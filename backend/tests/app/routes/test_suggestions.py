@@ -43,6 +43,7 @@ async def test_suggestions_one_collection(
         sort=["score desc", "id asc"],
         rows=3,
         exact="false",
+        fl=["id", "pid", "type", "title", "url", "service_id", "iid"],
     )
 
 
@@ -50,6 +51,53 @@ async def test_suggestions_one_collection(
 async def test_suggestions_dispatch_collections(
     app: FastAPI, client: AsyncClient, mock_post_search: AsyncMock
 ) -> None:
+    res = await client.post(
+        SEARCH_SUGGESTION_PATH,
+        params={
+            "q": "bar",
+            "collection": "all_collection",
+            "qf": "bar baz",
+            "exact": "false",
+        },
+        json={},
+    )
+    assert res.status_code == status.HTTP_200_OK
+    mock_post_search.assert_called_once_with(
+        ANY,
+        "all_collection",
+        q="bar",
+        qf="bar baz",
+        fq=[
+            'type:("publication" OR "dataset" OR "software" OR "service" OR "data'
+            ' source" OR "training" OR "interoperability guideline" OR "bundle" OR'
+            ' "other")'
+        ],
+        sort=["score desc", "id asc"],
+        rows=27,
+        exact="false",
+        highlight=False,
+        group_by="type",
+        group_limit=3,
+        fl=["id", "pid", "type", "title", "url", "service_id", "iid"],
+    )
+    assert set(res.json()) == {
+        "publication",
+        "dataset",
+        "software",
+        "service",
+        "data_source",
+        "training",
+        "guideline",
+        "bundle",
+        "other_rp",
+    }
+
+
+@pytest.mark.asyncio
+async def test_suggestions_dispatch_collections_not_grouped(
+    app: FastAPI, client: AsyncClient, mock_post_search: AsyncMock, mocker
+) -> None:
+    mocker.patch("app.settings.settings.GROUPED_SUGGESTIONS", False)
     res = await client.post(
         SEARCH_SUGGESTION_PATH,
         params={
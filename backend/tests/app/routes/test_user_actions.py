@@ -11,6 +11,7 @@ from pytest_lazyfixture import lazy_fixture
 from starlette.status import HTTP_303_SEE_OTHER
 from stomp.utils import Frame
 
+from app.dependencies.user_actions import user_actions_publisher
 from app.settings import settings
 from tests.utils import UserSession
 
@@ -49,6 +50,13 @@ class MockListener(stomp.ConnectionListener):
             elapsed += 1
 
 
+@pytest.fixture(autouse=True)
+async def publisher():
+    user_actions_publisher.start()
+    yield user_actions_publisher
+    await user_actions_publisher.stop()
+
+
 async def call_navigate_api(app: FastAPI, client: AsyncClient) -> Response:
     return await client.get(
         app.url_path_for("web:register-navigation-user-action"),
@@ -0,0 +1,55 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring,redefined-outer-name
+import httpx
+import pytest
+
+from app.solr.cache import InMemoryCacheBackend, SearchCache
+from app.solr.index_status import IndexStatusRegistry
+
+REQUEST_BODY = {"params": {"q": "foo", "fq": ['b:"2"', 'a:"1"'], "rows": 10}}
+
+
+def make_client(versions: list[int]) -> httpx.AsyncClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("admin/collections"):
+            return httpx.Response(200, json={"aliases": {"publication": "pub_v1"}})
+        return httpx.Response(200, json={"index": {"version": versions[0]}})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.fixture
+def cache() -> SearchCache:
+    return SearchCache(InMemoryCacheBackend(maxsize=10, ttl=60), IndexStatusRegistry(0))
+
+
+@pytest.mark.asyncio
+async def test_counts_hits_and_misses(cache: SearchCache) -> None:
+    async with make_client([1]) as client:
+        key = await cache.make_key(client, "publication", REQUEST_BODY)
+    assert await cache.get(key) is None
+    await cache.set(key, b"{}")
+
+    assert await cache.get(key) == b"{}"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["size"] == 1
+
+
+@pytest.mark.asyncio
+async def test_key_ignores_filters_order(cache: SearchCache) -> None:
+    reordered = {"params": {**REQUEST_BODY["params"], "fq": ['a:"1"', 'b:"2"']}}
+    async with make_client([1]) as client:
+        assert await cache.make_key(
+            client, "publication", REQUEST_BODY
+        ) == await cache.make_key(client, "publication", reordered)
+
+
+@pytest.mark.asyncio
+async def test_key_changes_with_index_version(cache: SearchCache) -> None:
+    versions = [1]
+    async with make_client(versions) as client:
+        old_key = await cache.make_key(client, "publication", REQUEST_BODY)
+        versions[0] = 2
+        new_key = await cache.make_key(client, "publication", REQUEST_BODY)
+
+    assert old_key != new_key
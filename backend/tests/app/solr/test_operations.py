@@ -0,0 +1,159 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.schemas.solr_response import Collection
+from app.solr.error_handling import SolrCollectionEmptyError
+from app.solr.index_status import IndexStatusRegistry
+from app.solr.operations import get, get_items_by_pids, get_many, search
+
+
+@pytest.mark.asyncio
+async def test_get_many_uses_single_request() -> None:
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(
+            200, json={"response": {"numFound": 1, "start": 0, "docs": [{"id": "1"}]}}
+        )
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        docs = await get_many(client, Collection.OFFER, ["1", 2], fl=["id", "title"])
+
+    assert docs == [{"id": "1"}]
+    assert len(requests) == 1
+    assert requests[0].url.path.endswith("/get")
+    assert requests[0].url.params["ids"] == "1,2"
+    assert requests[0].url.params["fl"] == "id,title"
+
+
+@pytest.mark.asyncio
+async def test_get_many_skips_request_without_ids() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise AssertionError(f"Unexpected request {request.url}")
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        assert await get_many(client, Collection.OFFER, []) == []
+
+
+@pytest.mark.asyncio
+async def test_get_coalesces_identical_requests() -> None:
+    requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"doc": {"id": "1", "title": ["foo"]}})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        first, second = await asyncio.gather(
+            get(client, Collection.PUBLICATION, "1"),
+            get(client, Collection.PUBLICATION, "1"),
+        )
+
+    assert len(requests) == 1
+    assert first == second
+    first["doc"]["title"].append("bar")
+    assert second["doc"]["title"] == ["foo"]
+
+
+@pytest.mark.asyncio
+async def test_get_items_by_pids_pages_and_dedupes(mocker) -> None:
+    mocker.patch("app.solr.operations.ITEMS_BY_PIDS_PAGE_SIZE", 2)
+    pages = {
+        "*": ([{"id": "1", "pid": "a"}, {"id": "2", "pid": ["a", 'b"c']}], "p1"),
+        "p1": ([{"id": "3", "pid": "d"}], "p2"),
+        "p2": ([], "p2"),
+    }
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = json.loads(request.content)["params"]
+        requests.append(params)
+        docs, next_cursor = pages[params["cursorMark"]]
+        return httpx.Response(
+            200, json={"response": {"docs": docs}, "nextCursorMark": next_cursor}
+        )
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        docs = await get_items_by_pids(
+            client, Collection.ALL_COLLECTION, ["d", "a", 'b"c', "missing"]
+        )
+
+    assert [doc["id"] for doc in docs] == ["3", "1", "2"]
+    assert [params["cursorMark"] for params in requests] == ["*", "p1", "p2"]
+    assert requests[0]["q"] == 'pid:("d" OR "a" OR "b\\"c" OR "missing")'
+    assert all(params["rows"] == 2 for params in requests)
+
+
+@pytest.mark.asyncio
+async def test_empty_result_consults_index_status(mocker) -> None:
+    mocker.patch("app.settings.settings.SEARCH_CACHE_ENABLED", False)
+    mocker.patch("app.solr.operations.index_status", IndexStatusRegistry(60))
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        if request.url.path.endswith("admin/collections"):
+            return httpx.Response(200, json={"aliases": {}})
+        if request.url.path.endswith("admin/luke"):
+            return httpx.Response(200, json={"index": {"version": 1, "numDocs": 0}})
+        return httpx.Response(
+            200, json={"response": {"numFound": 0, "docs": []}, "nextCursorMark": "*"}
+        )
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        for _ in range(2):
+            with pytest.raises(SolrCollectionEmptyError):
+                await search(
+                    client,
+                    Collection.PUBLICATION,
+                    q="foo",
+                    qf="title",
+                    fq=[],
+                    sort=["id asc"],
+                    rows=10,
+                    exact="false",
+                )
+
+    assert [path.rsplit("/", 1)[-1] for path in requests] == [
+        "select",
+        "collections",
+        "luke",
+        "select",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_without_cache_skips_cache(mocker) -> None:
+    search_cache = mocker.patch("app.solr.operations.search_cache")
+
+    def handler(_request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            json={
+                "response": {"numFound": 1, "docs": [{"id": "1"}]},
+                "nextCursorMark": "1",
+            },
+        )
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        response = await search(
+            client,
+            Collection.PUBLICATION,
+            q="foo",
+            qf="title",
+            fq=[],
+            sort=["id asc"],
+            rows=10,
+            exact="false",
+            use_cache=False,
+        )
+
+    assert response.data["response"]["docs"] == [{"id": "1"}]
+    search_cache.make_key.assert_not_called()
+    search_cache.set.assert_not_called()
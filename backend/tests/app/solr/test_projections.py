@@ -0,0 +1,122 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring
+import re
+from pathlib import Path
+
+import pytest
+
+from app.consts import Collection
+from app.solr.projections import View, fields_for
+
+
+def test_detail_view_retrieves_all_fields() -> None:
+    assert fields_for(View.DETAIL, Collection.PUBLICATION) is None
+
+
+@pytest.mark.parametrize("collection", [Collection.PUBLICATION, "unknown"])
+def test_list_view_retrieves_card_fields(collection) -> None:
+    fields = fields_for(View.LIST, collection)
+
+    assert {"id", "type", "title", "description", "exportation:[json]"} <= set(fields)
+    assert "relations" not in fields
+    assert "offers_summary" not in fields
+
+
+def test_list_view_retrieves_fields_extended_by_backend() -> None:
+    assert {"main_offer_id", "offer_ids", "offers_summary"} <= set(
+        fields_for(View.LIST, Collection.BUNDLE)
+    )
+    assert {"offers_summary", "related_services_summary"} <= set(
+        fields_for(View.LIST, "all_collection")
+    )
+    assert "related_publication_number" in fields_for(
+        View.LIST, Collection.ORGANISATION
+    )
+
+
+@pytest.mark.parametrize("counts_indexed", [True, False])
+def test_list_view_retrieves_organisation_related_ids_until_counts_are_indexed(
+    mocker, counts_indexed: bool
+) -> None:
+    mocker.patch("app.settings.settings.RELATION_COUNTS_INDEXED", counts_indexed)
+
+    fields = fields_for(View.LIST, Collection.ORGANISATION)
+
+    assert "related_project_number" in fields
+    assert ("related_project_ids" in fields) is not counts_indexed
+
+
+def test_candidate_view_retrieves_recommender_ids() -> None:
+    assert fields_for(View.CANDIDATE, Collection.SERVICE) == ["id", "pid", "type"]
+
+
+def test_disabled_projection(mocker) -> None:
+    mocker.patch("app.settings.settings.FIELD_PROJECTION_ENABLED", False)
+
+    assert fields_for(View.LIST, Collection.PUBLICATION) is None
+    assert fields_for(View.SUGGESTION, Collection.PUBLICATION) is None
+    assert fields_for(View.CANDIDATE, Collection.PUBLICATION) == ["id", "pid", "type"]
+
+
+UI_COLLECTIONS_DATA = (
+    Path(__file__).parents[4]
+    / "ui"
+    / "apps"
+    / "ui"
+    / "src"
+    / "app"
+    / "collections"
+    / "data"
+)
+# UI collections data directories and Solr collections their adapters read
+UI_ADAPTERS_COLLECTIONS = {
+    "all": Collection.ALL_COLLECTION,
+    "bundles": Collection.BUNDLE,
+    "catalogues": Collection.CATALOGUE,
+    "data-sources": Collection.DATA_SOURCE,
+    "datasets": Collection.DATASET,
+    "guidelines": Collection.GUIDELINE,
+    "organisations": Collection.ORGANISATION,
+    "other-resources-products": Collection.OTHER_RP,
+    "projects": Collection.PROJECT,
+    "providers": Collection.PROVIDER,
+    "publications": Collection.PUBLICATION,
+    "services": Collection.SERVICE,
+    "software": Collection.SOFTWARE,
+    "trainings": Collection.TRAINING,
+}
+# Fields set by the backend, out of the retrieved ones
+BACKEND_FIELDS = {"offers"}
+
+
+def read_adapter_fields(adapter_path: Path) -> set[str]:
+    """Fields of the documents read by the UI adapter and the shared utils it calls"""
+    source = "\n".join(
+        line
+        for line in adapter_path.read_text(encoding="utf-8").splitlines()
+        if not line.startswith("import")
+    )
+    fields = set()
+    for doc in re.findall(r"adapter:\s*\(\s*(\w+)\s*:", source):
+        fields |= set(re.findall(rf"\b{doc}\??\.(\w+)", source))
+    utils = (UI_COLLECTIONS_DATA / "utils.ts").read_text(encoding="utf-8")
+    fields |= set(re.findall(r"data\['(\w+)'\]", utils))
+    return fields - BACKEND_FIELDS
+
+
+@pytest.mark.skipif(not UI_COLLECTIONS_DATA.is_dir(), reason="UI sources are missing")
+@pytest.mark.parametrize("directory,collection", UI_ADAPTERS_COLLECTIONS.items())
+def test_list_view_retrieves_fields_read_by_ui_adapters(
+    directory: str, collection: Collection
+) -> None:
+    fields = read_adapter_fields(UI_COLLECTIONS_DATA / directory / "adapter.data.ts")
+
+    assert fields
+    assert fields <= {
+        field.split(":")[0] for field in fields_for(View.LIST, collection)
+    }
+
+
+def test_card_fields_include_categories() -> None:
+    assert {"categories", "unified_categories", "type_general", "guidelines"} <= set(
+        fields_for(View.LIST, Collection.SERVICE)
+    )
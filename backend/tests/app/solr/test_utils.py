@@ -4,7 +4,12 @@ from unittest import mock
 
 import pytest
 
-from app.solr.utils import parse_organisation_filters, parse_project_filters
+from app.solr.utils import (
+    exclude_own_filters,
+    parse_organisation_filters,
+    parse_project_filters,
+    tag_filters,
+)
 
 
 class MockedDate(datetime.date):
@@ -107,3 +112,58 @@ def test_parse_project_filters(monkeypatch, original_fq, expected):
 def test_parse_organisation_filters(original_fq, expected):
     result_fq = parse_organisation_filters(original_fq)
     assert result_fq == expected
+
+
+@pytest.mark.parametrize(
+    "original_fq, expected",
+    [
+        (
+            ['best_access_right:("Open access")'],
+            ['{!tag=best_access_right}best_access_right:("Open access")'],
+        ),
+        (
+            ['language:("English" OR "Polish")', "type:(*)"],
+            [
+                '{!tag=language}language:("English" OR "Polish")',
+                "{!tag=type}type:(*)",
+            ],
+        ),
+        (
+            ['providers:("a") OR resource_organisation:("a")'],
+            [
+                "{!tag=providers,resource_organisation}"
+                'providers:("a") OR resource_organisation:("a")'
+            ],
+        ),
+        (
+            ["{!field f=date_range op=Contains}[2024-02-06 TO 2024-02-06]"],
+            ["{!field f=date_range op=Contains}[2024-02-06 TO 2024-02-06]"],
+        ),
+        (
+            ["open_access OR restricted"],
+            ["open_access OR restricted"],
+        ),
+        (
+            ["language:English OR Polish"],
+            ["{!tag=language}language:English OR Polish"],
+        ),
+    ],
+)
+def test_tag_filters(original_fq, expected):
+    assert tag_filters(original_fq) == expected
+
+
+def test_exclude_own_filters():
+    facets = {
+        "language": {"type": "terms", "field": "language"},
+        "max_year": "max(publication_year)",
+    }
+
+    assert exclude_own_filters(facets) == {
+        "language": {
+            "type": "terms",
+            "field": "language",
+            "domain": {"excludeTags": "language"},
+        },
+        "max_year": "max(publication_year)",
+    }
@@ -0,0 +1,13 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring
+from app.utils import fast_json
+
+
+def test_round_trip_keeps_unicode() -> None:
+    data = {"title": ["Zażółć"], "numFound": 1, "score": 1.5, "doc": None}
+
+    encoded = fast_json.dumps(data)
+
+    assert isinstance(encoded, bytes)
+    assert "Zażółć".encode() in encoded
+    assert fast_json.loads(encoded) == data
+    assert fast_json.loads(encoded.decode()) == data
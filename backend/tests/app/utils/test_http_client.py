@@ -0,0 +1,28 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring
+import pytest
+
+from app.utils.http_client import HttpClientRegistry, Upstream
+
+
+@pytest.mark.asyncio
+async def test_registry_reuses_client_per_upstream() -> None:
+    registry = HttpClientRegistry()
+
+    solr_client = registry.get(Upstream.SOLR)
+
+    assert registry.get(Upstream.SOLR) is solr_client
+    assert registry.get(Upstream.RECOMMENDER) is not solr_client
+    await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_registry_reopens_client_after_close() -> None:
+    registry = HttpClientRegistry()
+    registry.start()
+    solr_client = registry.get(Upstream.SOLR)
+
+    await registry.aclose()
+
+    assert solr_client.is_closed
+    assert not registry.get(Upstream.SOLR).is_closed
+    await registry.aclose()
@@ -0,0 +1,95 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring
+import json
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.utils import ig_related_services
+from app.utils.ig_related_services import extend_ig_with_related_services
+
+
+def _service(pid: str) -> dict:
+    return {
+        "pid": pid,
+        "best_access_right": "Open access",
+        "title": [f"Service {pid}"],
+        "resource_organisation": "org",
+        "tagline": "tagline",
+        "categories": ["Category>Subcategory"],
+        "type": "service",
+    }
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    ig_related_services.related_services_cache.clear()
+    yield
+    ig_related_services.related_services_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_extend_ig_with_related_services(mocker) -> None:
+    get_pids = mocker.patch(
+        "app.utils.ig_related_services._get_related_records_pids",
+        AsyncMock(side_effect=lambda ig_id: {"ig1": ["b", "a"], "ig2": []}[ig_id]),
+    )
+    get_items = mocker.patch(
+        "app.utils.ig_related_services.get_items_by_pids",
+        AsyncMock(return_value=[_service("a"), _service("b")]),
+    )
+    docs = [
+        {"id": "ig1", "type": "interoperability guideline"},
+        {"id": "ig2", "type": "interoperability guideline"},
+        {"id": "s1", "type": "service"},
+    ]
+
+    assert await extend_ig_with_related_services(None, docs) is docs
+    await extend_ig_with_related_services(
+        None, [{"id": "ig1", "type": docs[0]["type"]}]
+    )
+
+    assert [service["pid"] for service in docs[0]["related_services"]] == ["b", "a"]
+    assert docs[1]["related_services"] == []
+    assert "related_services" not in docs[2]
+    assert get_pids.call_count == 2
+    get_items.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_extend_ig_uses_stored_summaries(mocker) -> None:
+    get_pids = mocker.patch(
+        "app.utils.ig_related_services._get_related_records_pids", AsyncMock()
+    )
+    now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    docs = [{
+        "id": "ig1",
+        "type": "interoperability guideline",
+        "related_services_summary": json.dumps([_service("a")]),
+        "related_services_updated_at": now.replace("+00:00", "Z"),
+    }]
+
+    await extend_ig_with_related_services(None, docs)
+
+    get_pids.assert_not_called()
+    assert [service["pid"] for service in docs[0]["related_services"]] == ["a"]
+    assert "related_services_summary" not in docs[0]
+
+
+@pytest.mark.asyncio
+async def test_extend_ig_refreshes_stale_summaries(mocker) -> None:
+    get_pids = mocker.patch(
+        "app.utils.ig_related_services._get_related_records_pids",
+        AsyncMock(return_value=[]),
+    )
+    docs = [{
+        "id": "ig1",
+        "type": "interoperability guideline",
+        "related_services_summary": json.dumps([_service("a")]),
+        "related_services_updated_at": "2000-01-01T00:00:00Z",
+    }]
+
+    await extend_ig_with_related_services(None, docs)
+
+    get_pids.assert_called_once_with("ig1")
+    assert docs[0]["related_services"] == []
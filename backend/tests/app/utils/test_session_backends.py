@@ -0,0 +1,85 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring,redefined-outer-name
+import uuid
+
+import pytest
+from fastapi_sessions.backends.session_backend import BackendError
+
+from app.schemas.session_data import SessionData
+from app.utils.session_backends import SQLiteSessionStore, StoreSessionBackend
+
+
+@pytest.fixture
+def store(tmp_path) -> SQLiteSessionStore:
+    return SQLiteSessionStore(str(tmp_path / "sessions.db"))
+
+
+def _backend(store, ttl: int = 60) -> StoreSessionBackend:
+    return StoreSessionBackend(store, ttl=ttl, cache_ttl=60, cache_maxsize=10)
+
+
+@pytest.mark.asyncio
+async def test_sessions_are_shared_among_backends(store) -> None:
+    session_id = uuid.uuid4()
+    session = SessionData(username="user", session_uuid="1")
+
+    await _backend(store).create(session_id, session)
+
+    assert await _backend(store).read(session_id) == session
+
+
+@pytest.mark.asyncio
+async def test_session_lifecycle(store) -> None:
+    backend = _backend(store)
+    session_id = uuid.uuid4()
+    session = SessionData(username="user", session_uuid="1")
+
+    await backend.create(session_id, session)
+    with pytest.raises(BackendError):
+        await backend.create(session_id, session)
+
+    await backend.update(session_id, SessionData(username="other", session_uuid="1"))
+    assert (await _backend(store).read(session_id)).username == "other"
+
+    await backend.delete(session_id)
+    assert await backend.read(session_id) is None
+    assert await _backend(store).read(session_id) is None
+    with pytest.raises(BackendError):
+        await backend.update(session_id, session)
+
+
+@pytest.mark.asyncio
+async def test_expired_session_is_missing(store) -> None:
+    session_id = uuid.uuid4()
+
+    await _backend(store, ttl=0).create(
+        session_id, SessionData(username="user", session_uuid="1")
+    )
+
+    assert await _backend(store).read(session_id) is None
+
+
+@pytest.mark.asyncio
+async def test_sessions_are_cached(store, mocker) -> None:
+    backend = _backend(store)
+    session_id = uuid.uuid4()
+    await backend.create(session_id, SessionData(session_uuid="1"))
+    get = mocker.spy(store, "get")
+
+    await backend.read(session_id)
+
+    get.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_reading_session_extends_its_expiration(store, mocker) -> None:
+    session_id = uuid.uuid4()
+    now = 1000.0
+    mocker.patch("app.utils.session_backends.time.time", side_effect=lambda: now)
+    await _backend(store, ttl=10).create(session_id, SessionData(session_uuid="1"))
+
+    now = 1008.0
+    assert await _backend(store, ttl=10).read(session_id) is not None
+    now = 1015.0
+    assert await _backend(store, ttl=10).read(session_id) is not None
+    now = 1026.0
+    assert await _backend(store, ttl=10).read(session_id) is None
@@ -0,0 +1,44 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring
+import asyncio
+
+import pytest
+
+from app.utils.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_coalesces_concurrent_calls() -> None:
+    single_flight = SingleFlight()
+    calls = 0
+
+    async def fetch() -> bytes:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return b"result"
+
+    results = await asyncio.gather(*[single_flight.do("key", fetch) for _ in range(5)])
+
+    assert results == [b"result"] * 5
+    assert calls == 1
+    assert len(single_flight) == 0
+
+    await single_flight.do("key", fetch)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_shares_exception() -> None:
+    single_flight = SingleFlight()
+
+    async def fetch() -> bytes:
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream error")
+
+    results = await asyncio.gather(
+        single_flight.do("key", fetch),
+        single_flight.do("key", fetch),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
@@ -7,7 +7,7 @@ import pytest
 from asgi_lifespan import LifespanManager
 from fastapi import FastAPI
 from httpx import AsyncClient
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 import alembic
 from alembic.config import Config
@@ -83,7 +83,8 @@ async def managed_app(app: FastAPI, apply_migrations: None) -> FastAPI:
 
 
 @pytest.fixture
-def db(managed_app) -> Session:
-    """Extract Session from app state"""
+async def db(managed_app) -> AsyncSession:
+    """Session from the application DB pool"""
     # pylint: disable=protected-access
-    return managed_app.state._db
+    async with managed_app.state._session_local() as db:
+        yield db
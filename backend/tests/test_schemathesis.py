@@ -6,7 +6,7 @@ from datetime import datetime, timezone
 import pytest
 import schemathesis
 from hypothesis import HealthCheck, settings
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Dump, DumpElement
 
@@ -33,7 +33,7 @@ async def test_non_empty_db(case, managed_app, prepare_db) -> None:
 
 
 @pytest.fixture
-def prepare_db(db: Session) -> None:
+async def prepare_db(db: AsyncSession) -> None:
     s3_prefix = "https://s3.example.org"
     dump = Dump(
         name="foo",
@@ -49,4 +49,4 @@ def prepare_db(db: Session) -> None:
         ],
     )
     db.add(dump)
-    db.commit()
+    await db.commit()
@@ -11,14 +11,18 @@ from app.settings import settings
 logger = logging.getLogger(__name__)
 
 
-def delete_data_by_type(col_name: str) -> None:
-    """Delete solr resources based on their type"""
+def delete_data_by_type(col_name: str, commit: bool = True) -> None:
+    """Delete solr resources based on their type.
+    Without commit, deletion is visible after the next commit of the collection,
+    explicit or automatic"""
     query = {"delete": {"query": f'type:"{col_name}"'}}
     headers = {"Content-Type": "application/json"}
     solr_col_names = settings.COLLECTIONS[col_name]["SOLR_COL_NAMES"]
 
     for s_col_name in solr_col_names:
-        url = f"{settings.SOLR_URL}solr/{s_col_name}/update?commitWithin=100"
+        url = f"{settings.SOLR_URL}solr/{s_col_name}/update"
+        if commit:
+            url += "?commitWithin=100"
         try:
             req = requests.post(
                 url, data=json.dumps(query), headers=headers, timeout=180
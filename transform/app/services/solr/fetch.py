@@ -0,0 +1,78 @@
+"""Retrieve documents from Solr collections"""
+
+from itertools import islice
+from typing import Iterable, Iterator
+
+import requests
+
+from app.services.solr.errors import SolrException
+from app.settings import settings
+
+# Values per request, well below the URL length limits and maxBooleanClauses of Solr
+MAX_VALUES_PER_REQUEST = 400
+
+
+def get_docs(type_: str, ids: Iterable[str], fields: tuple[str, ...]) -> list[dict]:
+    """Get documents of the given type with real-time get requests,
+    each for up to MAX_VALUES_PER_REQUEST ids"""
+    s_col_name = settings.COLLECTIONS[type_]["SOLR_COL_NAMES"][-1]
+    docs = []
+    for ids_chunk in chunked((str(_id) for _id in ids), MAX_VALUES_PER_REQUEST):
+        req = requests.get(
+            f"{settings.SOLR_URL}solr/{s_col_name}/get",
+            params={"ids": ",".join(ids_chunk), "fl": ",".join(fields)},
+            timeout=180,
+        )
+        if req.status_code != 200:
+            raise SolrException(req.json())
+        docs.extend(req.json()["response"]["docs"])
+    return docs
+
+
+def select_docs(
+    type_: str,
+    query: str,
+    fields: tuple[str, ...],
+    rows: int = 1000,
+    s_col_name: str | None = None,
+) -> list[dict]:
+    """Get all documents of the given type matching the query, paging with a cursor.
+    `rows` is the size of a page. Documents are taken from the collection of the type,
+    unless `s_col_name` is given"""
+    s_col_name = s_col_name or settings.COLLECTIONS[type_]["SOLR_COL_NAMES"][-1]
+    docs = []
+    cursor_mark = "*"
+    while True:
+        req = requests.post(
+            f"{settings.SOLR_URL}solr/{s_col_name}/select",
+            json={
+                "params": {
+                    "q": query,
+                    "fl": ",".join(fields),
+                    "rows": rows,
+                    "sort": "id asc",
+                    "cursorMark": cursor_mark,
+                }
+            },
+            timeout=180,
+        )
+        if req.status_code != 200:
+            raise SolrException(req.json())
+        response = req.json()
+        docs.extend(response["response"]["docs"])
+        if response["nextCursorMark"] == cursor_mark:
+            return docs
+        cursor_mark = response["nextCursorMark"]
+
+
+def any_of(field: str, values: Iterable[str]) -> str:
+    """Query matching any of the values of the field"""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"') for value in values)
+    return f"{field}:(" + " OR ".join(f'"{value}"' for value in escaped) + ")"
+
+
+def chunked(values: Iterable, size: int) -> Iterator[list]:
+    """Split the values into lists of up to `size` values"""
+    values = iter(values)
+    while chunk := list(islice(values, size)):
+        yield chunk
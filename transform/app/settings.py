@@ -28,6 +28,12 @@ class GlobalSettings(BaseSettings):
     # - Solr
     SOLR_URL: AnyUrl = "http://localhost:8983"
     SOLR_COLS_PREFIX: str = ""
+    #   - Indexing of transformed data
+    SOLR_STREAMING_INDEXING: bool = True
+    SOLR_INDEX_BATCH_BYTES: int = 10_000_000
+    SOLR_INDEX_PARALLELISM: int = 8
+    SOLR_INDEX_GZIP: bool = False
+    SOLR_INDEX_RETRIES: int = 3
     #   - Default Solr collections configurations
     # See: https://github.com/cyfronet-fid/eosc-search-service/blob/7e73eb17ec730b73ac54e002608e391e58b1d1e8/transform/docs/configs.md
     SOLR_ALL_COL_CONF: str = "all_collection_oag56_v205"  # All collection
@@ -84,6 +90,9 @@ class GlobalSettings(BaseSettings):
     TRAINING_ADDRESS: AnyUrl = (
         "https://beta.providers.eosc-portal.eu/api/public/trainingResource/all?catalogue_id=all&active=true&suspended=false&quantity=10000"
     )
+    RELATED_SERVICES_ADDRESS: AnyUrl = (
+        "https://beta.providers.eosc-portal.eu/api/public/interoperabilityRecord/relatedResources"
+    )
 
     # Transformation General Settings TODO
     # INPUT_FORMAT: str = "json"
@@ -142,6 +151,15 @@ class GlobalSettings(BaseSettings):
     DATA_SOURCE_IDS_INCREMENTOR: int = 10_000_000
     CATALOGUE_IDS_INCREMENTOR: int = 100_000_000
 
+    # Bundles
+    BUNDLE_EMBED_OFFERS_SUMMARY: bool = True
+
+    # Guidelines
+    GUIDELINE_RELATED_SERVICES: bool = True
+
+    # Spark storage level of the input data persisted during transformations, NONE to disable
+    TRANSFORM_STORAGE_LEVEL: str = "MEMORY_AND_DISK"
+
     # Get config from .env
     model_config = SettingsConfigDict(env_file="../.env", env_file_encoding="utf-8")
 
@@ -4,14 +4,19 @@ import json
 import logging
 from typing import Optional
 
+from pyspark.sql import DataFrame
+
 import app.transform.transformers as trans
 from app.services.celery.task import CeleryTaskStatus
 from app.services.solr.delete import delete_data_by_type
 from app.services.spark.config import apply_spark_conf
 from app.settings import settings
+from app.transform.transformers.base.base import BaseTransformer
+from app.transform.utils.bundles import refresh_bundles_offers_summaries
 from app.transform.utils.load import load_request_data
-from app.transform.utils.send import send_json_string_to_solr
+from app.transform.utils.send import index_df_in_solr, send_json_string_to_solr
 from app.worker import celery
+from schemas.properties.data import ID
 
 logger = logging.getLogger(__name__)
 
@@ -48,21 +53,49 @@ def transform_batch(
             spark, _ = apply_spark_conf()
             input_schema = settings.COLLECTIONS[type_]["INPUT_SCHEMA"]
             df = load_request_data(spark, data, input_schema, type_)
-            df_trans = transformer(spark)(df)
+            spark_transformer = transformer(spark)
+            df_trans = spark_transformer(df)
+
+        refresh_bundles = settings.BUNDLE_EMBED_OFFERS_SUMMARY and type_ in (
+            settings.OFFER,
+            settings.SERVICE,
+        )
 
-        # df -> json
+        # df -> solr
         if type_ == settings.GUIDELINE:
-            output = df_trans.to_json(orient="records")
+            send_output(df_trans.to_json(orient="records"), type_, full_update)
+            ids = []
+        elif full_update and settings.SOLR_STREAMING_INDEXING:
+            # Live updates are small, so they keep being sent with commitWithin
+            # instead of hard commits of the collections
+            try:
+                index_output(spark_transformer, df_trans, type_)
+                # All the bundles are refreshed after a full update
+                ids = []
+            finally:
+                spark_transformer.unpersist()
         else:
-            output_list = (
-                df_trans.toJSON().map(lambda str_json: json.loads(str_json)).collect()
-            )
-            output = json.dumps(output_list)
+            try:
+                output_list = (
+                    df_trans.toJSON()
+                    .map(lambda str_json: json.loads(str_json))
+                    .collect()
+                )
+            finally:
+                spark_transformer.unpersist()
+            send_output(json.dumps(output_list), type_, full_update)
+            ids = [str(doc[ID]) for doc in output_list]
 
-        if full_update:
-            # Delete all resources of a certain type only if that is a full collection update
-            delete_data_by_type(type_)
-        send_json_string_to_solr(output, type_)  # Upload data to those collections
+        if refresh_bundles:
+            # Bundles embed summaries of their offers and services
+            try:
+                refresh_bundles_offers_summaries(type_, ids, full_update)
+            except Exception as e:
+                logger.error(f"Bundles offers summaries refresh has failed: {e}")
+                return CeleryTaskStatus(
+                    status="failure",
+                    reason=f"{type_} data was updated, but bundles offers summaries refresh has failed: {e}",
+                ).dict()
 
         logger.info(f"{type_} data update has been successful")
         return CeleryTaskStatus(status="success").dict()
@@ -70,3 +103,24 @@ def transform_batch(
     except Exception as e:
         logger.error(f"{type_} data update has failed, error message: {e}")
         return CeleryTaskStatus(status="failure", reason=str(e)).dict()
+
+
+def send_output(output: str, type_: str, full_update: bool) -> None:
+    """Send json string of all documents to solr in a single request"""
+    if full_update:
+        # Delete all resources of a certain type only if that is a full collection update
+        delete_data_by_type(type_)
+    send_json_string_to_solr(output, type_)  # Upload data to those collections
+
+
+def index_output(transformer: BaseTransformer, df: DataFrame, type_: str) -> None:
+    """Replace all documents of the type in solr, streaming them from the executors
+    without collecting them"""
+    # Transformation errors surface before the collection is cleared
+    df = transformer.persist(df)
+    df.count()
+    # Not committed explicitly, but the deletion can still become visible before
+    # the new documents are indexed, e.g. with the autoSoftCommit of all_collection.
+    # An atomic replacement would require indexing to a new collection and swapping aliases.
+    delete_data_by_type(type_, commit=False)
+    index_df_in_solr(df, type_)
@@ -18,6 +18,7 @@ from schemas.properties.data import (
     ID,
     LEGALNAME,
     RELATED_DATASET_IDS,
+    RELATED_IDS_NUMBERS,
     RELATED_ORGANISATION_TITLES,
     RELATED_OTHER_IDS,
     RELATED_PROJECT_IDS,
@@ -183,6 +184,7 @@ def update_json_file(
 ):
     """
     Update JSON file based on DataFrame group and relation mappings.
+    Along with related ids, the number of them is stored.
 
     Parameters:
         file_path (str): Path of the JSON file to update.
@@ -201,6 +203,10 @@ def update_json_file(
                 for relation_type, relation_key in relation_mappings.items():
                     if row[relation_type_key] == relation_type:
                         entry[relation_key] = row[data_key]
+                        if relation_key in RELATED_IDS_NUMBERS:
+                            entry[RELATED_IDS_NUMBERS[relation_key]] = len(
+                                row[data_key]
+                            )
 
     write_json(file_path, json_data)
 
@@ -1,15 +1,19 @@
 # pylint: disable=line-too-long, too-many-arguments), invalid-name
 """Base transformer"""
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from logging import getLogger
+from typing import Iterator
+from uuid import uuid4
 
+from pyspark import StorageLevel
 from pyspark.sql import DataFrame, SparkSession
 from pyspark.sql.functions import col, udf
 from pyspark.sql.types import StringType, StructType
 
 from app.services.solr.validate.schema.validate import validate_schema
+from app.settings import settings
 from app.transform.utils.common import add_tg_fields
-from app.transform.utils.join_dfs import create_df, join_different_dfs
 from app.transform.utils.utils import (
     add_columns,
     drop_columns_pyspark,
@@ -37,31 +41,80 @@ class BaseTransformer(ABC):
         self._cols_to_rename = cols_to_rename
         self._exp_output_schema = exp_output_schema
         self.spark = spark
-        self.harvested_properties = {}
+        self.jobs_per_stage: dict[str, int] = {}
+        self._persisted_dfs: list[DataFrame] = []
 
     def __call__(self, df: DataFrame) -> DataFrame:
-        """Transform resources"""
-        df = self.apply_simple_trans(df)
+        """Transform resources.
+        The input is persisted after simple transformations, call unpersist()
+        once the transformed dataframe is no longer needed"""
+        with self.track_jobs("simple"):
+            df = self.apply_simple_trans(df)
+            df = self.persist(df)
         if self.harvested_schema:
-            df = self.apply_complex_trans(df)
+            with self.track_jobs("complex"):
+                df = self.apply_complex_trans(df)
 
-        df = self.apply_common_trans(df)
-        df = self.cast_columns(df)
-        df = self.filter_columns(df)
-        self.validate(df)
+        with self.track_jobs("common"):
+            df = self.apply_common_trans(df)
+            df = self.cast_columns(df)
+            df = self.filter_columns(df)
+            self.validate(df)
 
         return df
 
+    def persist(self, df: DataFrame) -> DataFrame:
+        """Persist the dataframe with the storage level defined in settings,
+        so that its lineage is not recomputed by each Spark job"""
+        storage_level = getattr(StorageLevel, settings.TRANSFORM_STORAGE_LEVEL.upper())
+        if storage_level == StorageLevel.NONE:
+            return df
+
+        df = df.persist(storage_level)
+        self._persisted_dfs.append(df)
+        return df
+
+    def unpersist(self) -> None:
+        """Release dataframes persisted during the transformation"""
+        for df in self._persisted_dfs:
+            df.unpersist()
+        self._persisted_dfs.clear()
+
+    @contextmanager
+    def track_jobs(self, stage: str) -> Iterator[None]:
+        """Record the number of Spark jobs triggered by the transformation stage"""
+        spark_context = self.spark.sparkContext
+        job_group = f"{self.type}-{stage}-{uuid4().hex}"
+        spark_context.setJobGroup(job_group, f"Transform {self.type}: {stage}")
+        try:
+            yield
+        finally:
+            spark_context.setLocalProperty("spark.jobGroup.id", None)
+            spark_context.setLocalProperty("spark.job.description", None)
+            self.jobs_per_stage[stage] = len(
+                spark_context.statusTracker().getJobIdsForGroup(job_group)
+            )
+            logger.info(
+                f"{self.type} - {stage} transformations triggered {self.jobs_per_stage[stage]} Spark jobs"
+            )
+
     def apply_common_trans(self, df: DataFrame) -> DataFrame:
         """Apply common transformations"""
+        harvested_columns = self.harvested_columns
         if self._cols_to_drop:
-            df = drop_columns_pyspark(df, self._cols_to_drop)
+            # Harvested columns replace raw columns of the same name
+            df = drop_columns_pyspark(
+                df,
+                tuple(c for c in self._cols_to_drop if c not in harvested_columns),
+            )
 
-        if self.harvested_schema:
-            harvested_df = create_df(
-                self.harvested_properties, self.harvested_schema, self.spark
+        if harvested_columns:
+            df = df.withColumns(
+                {
+                    field.name: col(field.name).cast(field.dataType)
+                    for field in self.harvested_schema
+                }
             )
-            df = join_different_dfs((df, harvested_df))
 
         if self._cols_to_add:
             df = add_columns(df, self._cols_to_add)
@@ -75,6 +128,13 @@ class BaseTransformer(ABC):
 
         return df
 
+    @property
+    def harvested_columns(self) -> set[str]:
+        """Properties harvested in place as columns of the main dataframe"""
+        if not self.harvested_schema:
+            return set()
+        return set(self.harvested_schema.fieldNames())
+
     def rename_cols(self, df: DataFrame) -> DataFrame:
         """Rename columns based on the mappings dict"""
         for old_col_name, new_col_name in self._cols_to_rename.items():
@@ -1,10 +1,9 @@
 # pylint: disable=line-too-long, wildcard-import, unused-wildcard-import, invalid-name, too-many-arguments
 """Transform Marketplace's resources"""
 from abc import abstractmethod
-from itertools import chain
 
 from pyspark.sql import DataFrame, SparkSession
-from pyspark.sql.functions import col, lit
+from pyspark.sql.functions import col, lit, transform
 from pyspark.sql.types import StringType
 from pyspark.sql.utils import AnalysisException
 
@@ -68,9 +67,9 @@ class MarketplaceBaseTransformer(BaseTransformer):
         """Harvest oag properties that requires more complex transformations
         Basically from those harvested properties there will be created another dataframe
         which will be later on merged with the main dataframe"""
-        df = map_best_access_right(df, self.harvested_properties, self.type)
-        create_open_access(self.harvested_properties)
-        harvest_popularity(df, self.harvested_properties)
+        df = map_best_access_right(df, self.type)
+        df = create_open_access(df)
+        df = harvest_popularity(df)
         if self.type == settings.DATASOURCE:
             df = self.harvest_persistent_id_systems(df)
 
@@ -100,35 +99,31 @@ class MarketplaceBaseTransformer(BaseTransformer):
                 df = df.withColumn(urls, lit(None))
         return df
 
-    def harvest_persistent_id_systems(self, df: DataFrame) -> DataFrame:
+    @staticmethod
+    def harvest_persistent_id_systems(df: DataFrame) -> DataFrame:
         """
         1) Retrieve persistent_identity_systems.entity_type as arr[str, ...]
         2) Retrieve persistent_identity_systems.entity_type_schemes as arr[arr[str], ...]
         """
-        try:
-            persist_ids_collection = df.select(PERSIST_ID_SYS).collect()
-        except AnalysisException:
-            self.harvested_properties[PERSIST_ID_SYS_ENTITY_TYPE] = [None] * df.count()
-            self.harvested_properties[PERSIST_ID_SYS_ENTITY_TYPE_SCHEMES] = [
-                None
-            ] * df.count()
-            return df
-
-        types_column = []
-        schemas_column = []
-        for persist_ids in chain.from_iterable(persist_ids_collection):
-            types_row = []
-            schemas_row = []
-            for persist_id in persist_ids:
-                types_row.append(persist_id["entity_type"])
-                schemas_row.append(persist_id["entity_type_schemes"])
-            types_column.append(types_row)
-            schemas_column.append(schemas_row)
-
-        self.harvested_properties[PERSIST_ID_SYS_ENTITY_TYPE] = types_column
-        self.harvested_properties[PERSIST_ID_SYS_ENTITY_TYPE_SCHEMES] = schemas_column
-
-        return df.drop(PERSIST_ID_SYS)
+        if PERSIST_ID_SYS not in df.columns:
+            return df.withColumns(
+                {
+                    PERSIST_ID_SYS_ENTITY_TYPE: lit(None),
+                    PERSIST_ID_SYS_ENTITY_TYPE_SCHEMES: lit(None),
+                }
+            )
+
+        persist_ids = col(PERSIST_ID_SYS)
+        return df.withColumns(
+            {
+                PERSIST_ID_SYS_ENTITY_TYPE: transform(
+                    persist_ids, lambda persist_id: persist_id["entity_type"]
+                ),
+                PERSIST_ID_SYS_ENTITY_TYPE_SCHEMES: transform(
+                    persist_ids, lambda persist_id: persist_id["entity_type_schemes"]
+                ),
+            }
+        ).drop(PERSIST_ID_SYS)
 
     @staticmethod
     def cast_columns(df: DataFrame) -> DataFrame:
@@ -81,27 +81,27 @@ class OagBaseTransformer(BaseTransformer):
 
     def apply_complex_trans(self, df: DataFrame) -> DataFrame:
         """Harvest oag properties that requires more complex transformations
-        Basically from those harvested properties there will be created another dataframe
-        which will be later on merged with the main dataframe"""
-        df = map_best_access_right(df, self.harvested_properties, self.type)
-        create_open_access(self.harvested_properties)
-        df = map_language(df, self.harvested_properties)
-        harvest_author_names_and_pids(df, self.harvested_properties)
-        harvest_scientific_domains(df, self.harvested_properties)
-        harvest_sdg(df, self.harvested_properties)
-        harvest_funder(df, self.harvested_properties)
-        harvest_url_and_document_type(df, self.harvested_properties)
-        harvest_pids(df, self.harvested_properties)
-        harvest_country(df, self.harvested_properties)
-        harvest_research_community(df, self.harvested_properties)
-        harvest_relations(df, self.harvested_properties)
-        harvest_eosc_if(df, self.harvested_properties)
-        harvest_popularity(df, self.harvested_properties)
-        create_unified_categories(df, self.harvested_properties)
-        harvest_exportation(df, self.harvested_properties)
-        harvest_data_source(df, self.harvested_properties)
-        harvest_related_organisations(df, self.harvested_properties)
-        harvest_project_ids(df, self.harvested_properties)
+        Properties are harvested as columns of the main dataframe,
+        so records are processed in parallel by the executors"""
+        df = map_best_access_right(df, self.type)
+        df = create_open_access(df)
+        df = map_language(df)
+        df = harvest_author_names_and_pids(df)
+        df = harvest_scientific_domains(df)
+        df = harvest_sdg(df)
+        df = harvest_funder(df)
+        df = harvest_url_and_document_type(df)
+        df = harvest_pids(df)
+        df = harvest_country(df)
+        df = harvest_research_community(df)
+        df = harvest_relations(df)
+        df = harvest_eosc_if(df)
+        df = harvest_popularity(df)
+        df = create_unified_categories(df)
+        df = harvest_exportation(df)
+        df = harvest_data_source(df)
+        df = harvest_related_organisations(df)
+        df = harvest_project_ids(df)
 
         return df
 
@@ -1,5 +1,7 @@
-# pylint: disable=line-too-long, wildcard-import, invalid-name, unused-wildcard-import, duplicate-code
+# pylint: disable=line-too-long, logging-fstring-interpolation, wildcard-import, invalid-name, unused-wildcard-import, duplicate-code
 """Transform bundles"""
+from logging import getLogger
+
 from pyspark.sql import DataFrame, SparkSession
 from pyspark.sql.functions import col, lit, udf
 from pyspark.sql.types import (
@@ -12,11 +14,18 @@ from pyspark.sql.types import (
 
 from app.settings import settings
 from app.transform.transformers.base.base import BaseTransformer
+from app.transform.utils.bundles import (
+    OFFERS_SUMMARY,
+    get_offers_summaries,
+    summarize_bundle_offers,
+)
 from app.transform.utils.common import harvest_popularity
 from app.transform.utils.utils import sort_schema
 from schemas.old.output.bundle import bundle_output_schema
 from schemas.properties.data import ID, POPULARITY, TYPE
 
+logger = getLogger(__name__)
+
 
 class BundleTransformer(BaseTransformer):
     """Transformer used to transform bundles"""
@@ -53,15 +62,44 @@ class BundleTransformer(BaseTransformer):
         df = df.withColumn(
             "catalogue", self.get_first_element(df["catalogues"])
         )  # TODO delete
+        if settings.BUNDLE_EMBED_OFFERS_SUMMARY:
+            df = self.embed_offers_summary(df)
 
         return df
 
+    @staticmethod
+    def embed_offers_summary(df: DataFrame) -> DataFrame:
+        """Embed summaries of offers and their services, so that they don't need to be
+        fetched when bundles are displayed. Offers and services are taken from Solr"""
+        offer_ids = {
+            str(offer_id)
+            for row in df.select("main_offer_id", "offer_ids").collect()
+            for offer_id in [row["main_offer_id"]] + (row["offer_ids"] or [])
+            if offer_id is not None
+        }
+        try:
+            summaries = get_offers_summaries(offer_ids)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning(f"Offers summaries were not embedded into bundles: {e}")
+            return df.withColumn(
+                OFFERS_SUMMARY, lit(None).cast(ArrayType(StringType()))
+            )
+
+        summarize = udf(
+            lambda main_offer_id, _offer_ids: summarize_bundle_offers(
+                main_offer_id, _offer_ids, summaries
+            ),
+            ArrayType(StringType()),
+        )
+        return df.withColumn(
+            OFFERS_SUMMARY, summarize(col("main_offer_id"), col("offer_ids"))
+        )
+
     def apply_complex_trans(self, df: DataFrame) -> DataFrame:
         """Harvest oag properties that requires more complex transformations
         Basically from those harvested properties there will be created another dataframe
         which will be later on merged with the main dataframe"""
-        harvest_popularity(df, self.harvested_properties)
-        return df
+        return harvest_popularity(df)
 
     @staticmethod
     def cast_columns(df: DataFrame) -> DataFrame:
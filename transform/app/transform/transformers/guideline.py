@@ -2,12 +2,15 @@
 """Transform interoperability guidelines"""
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 import pandas as pd
+import requests
 from pandas import DataFrame
 
 from app.services.mp_pc.data import get_providers_mapping
+from app.services.solr.fetch import any_of, select_docs
 from app.services.solr.validate.schema.validate import validate_pd_schema
 from app.settings import settings
 from schemas.old.input.guideline import guideline_input_schema
@@ -51,6 +54,20 @@ RIGHT_TITLE = "right_title"
 RIGHT_URI = "right_uri"
 RIGHT_ID = "right_id"
 
+RELATED_SERVICES_SUMMARY = "related_services_summary"
+RELATED_SERVICES_UPDATED_AT = "related_services_updated_at"
+# Fields of services required to display them as related services of guidelines
+RELATED_SERVICE_FIELDS = (
+    "pid",
+    "best_access_right",
+    "title",
+    "resource_organisation",
+    "tagline",
+    "categories",
+    "unified_categories",
+    "type",
+)
+
 
 def harvest_identifiers(df: DataFrame) -> None:
     """Harvest DOI  and URI from identifierInfo of interoperability guideline"""
@@ -313,6 +330,63 @@ def map_providers(df: DataFrame) -> None:
     df["providers"] = df["providers"].replace(providers_mapping)
 
 
+def get_related_services_pids(guideline_id: str) -> list[str] | None:
+    """Get PIDs of services related to the guideline. None if they can't be retrieved"""
+    try:
+        response = requests.get(
+            f"{settings.RELATED_SERVICES_ADDRESS}/{guideline_id}", timeout=20
+        )
+        response.raise_for_status()
+        return response.json()
+    except (requests.RequestException, ValueError) as e:
+        logger.warning(f"Related services of guideline {guideline_id} failed: {e}")
+        return None
+
+
+def harvest_related_services(df: DataFrame) -> None:
+    """Resolve related services of guidelines and store their compact summaries,
+    so that they don't need to be retrieved when guidelines are displayed"""
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        related_pids = dict(
+            zip(df["id"], executor.map(get_related_services_pids, df["id"]))
+        )
+    all_pids = {pid for pids in related_pids.values() if pids for pid in pids}
+
+    services = {}
+    try:
+        if all_pids:
+            # Related resources may be services or data sources,
+            # and a PID can be shared by several documents
+            for service in select_docs(
+                settings.SERVICE,
+                any_of("pid", all_pids),
+                RELATED_SERVICE_FIELDS,
+                s_col_name=settings.COLLECTIONS[settings.SERVICE]["SOLR_COL_NAMES"][0],
+            ):
+                pids = (
+                    service["pid"]
+                    if isinstance(service["pid"], list)
+                    else [service["pid"]]
+                )
+                for pid in pids:
+                    services.setdefault(pid, service)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        logger.warning(f"Related services of guidelines were not resolved: {e}")
+        related_pids = dict.fromkeys(related_pids)
+
+    df[RELATED_SERVICES_SUMMARY] = [
+        (
+            json.dumps([services[pid] for pid in pids if pid in services])
+            if pids is not None
+            else None
+        )
+        for pids in (related_pids[guideline_id] for guideline_id in df["id"])
+    ]
+    df[RELATED_SERVICES_UPDATED_AT] = (
+        datetime.utcnow().isoformat(timespec="seconds") + "Z"
+    )
+
+
 def transform_guidelines(data: str) -> DataFrame:
     """Transform guidelines"""
     df = pd.DataFrame(data)
@@ -342,6 +416,8 @@ def transform_guidelines(data: str) -> DataFrame:
     harvest_type_info(df)
     harvest_related_standards(df)
     harvest_rights(df)
+    if settings.GUIDELINE_RELATED_SERVICES:
+        harvest_related_services(df)
     df = df.reindex(sorted(df.columns), axis=1)
 
     try:  # validate output schema
@@ -53,9 +53,9 @@ class OfferTransformer(BaseTransformer):
         """Harvest oag properties that requires more complex transformations
         Basically from those harvested properties there will be created another dataframe
         which will be later on merged with the main dataframe"""
-        df = map_best_access_right(df, self.harvested_properties, self.type)
-        create_open_access(self.harvested_properties)
-        harvest_popularity(df, self.harvested_properties)
+        df = map_best_access_right(df, self.type)
+        df = create_open_access(df)
+        df = harvest_popularity(df)
 
         return df
 
@@ -1,14 +1,28 @@
-# pylint: disable=line-too-long, wildcard-import, invalid-name, unused-wildcard-import
+# pylint: disable=line-too-long, wildcard-import, invalid-name, unused-wildcard-import, redefined-builtin
 """Transform organisations"""
-import json
 
 from pyspark.sql import DataFrame, SparkSession
-from pyspark.sql.functions import lit
+from pyspark.sql.functions import (
+    array,
+    array_distinct,
+    array_sort,
+    coalesce,
+    col,
+    filter,
+    lit,
+    lower,
+    map_from_arrays,
+    size,
+    to_json,
+    transform,
+    when,
+)
 from pyspark.sql.types import ArrayType, StringType, StructField, StructType
 
 from app.settings import settings
 from app.transform.transformers.base.base import BaseTransformer
-from app.transform.utils.utils import sort_schema
+from app.transform.utils.common import none_if_empty
+from app.transform.utils.utils import add_relation_counts, sort_schema
 from schemas.properties.data import (
     ABBREVIATION,
     ALTERNATIVE_NAMES,
@@ -18,6 +32,11 @@ from schemas.properties.data import (
     LEGALSHORTNAME,
     PID,
     PIDS,
+    RELATED_DATASET_IDS,
+    RELATED_OTHER_IDS,
+    RELATED_PROJECT_IDS,
+    RELATED_PUBLICATION_IDS,
+    RELATED_SOFTWARE_IDS,
     TITLE,
     TYPE,
     URL,
@@ -30,9 +49,15 @@ class OrganisationTransformer(BaseTransformer):
 
     def __init__(self, spark: SparkSession):
         self.type = settings.ORGANISATION
+        self.exp_output_schema = settings.COLLECTIONS[self.type]["OUTPUT_SCHEMA"]
 
         super().__init__(
-            self.type, self.cols_to_add, self.cols_to_drop, self.cols_to_rename, spark
+            self.type,
+            self.cols_to_add,
+            self.cols_to_drop,
+            self.cols_to_rename,
+            self.exp_output_schema,
+            spark,
         )
 
     def apply_simple_trans(self, df: DataFrame) -> DataFrame:
@@ -41,6 +66,16 @@ class OrganisationTransformer(BaseTransformer):
         without a need to create another dataframe and merging"""
         df = df.withColumn(TYPE, lit(self.type))
         df = self.rename_cols(df)
+        df = add_relation_counts(
+            df,
+            (
+                RELATED_DATASET_IDS,
+                RELATED_OTHER_IDS,
+                RELATED_PROJECT_IDS,
+                RELATED_PUBLICATION_IDS,
+                RELATED_SOFTWARE_IDS,
+            ),
+        )
 
         return df
 
@@ -48,9 +83,9 @@ class OrganisationTransformer(BaseTransformer):
         """Harvest oag properties that requires more complex transformations
         Basically from those harvested properties there will be created another dataframe
         which will be later on merged with the main dataframe"""
-        self.harvest_alternative_names(df, self.harvested_properties)
-        self.harvest_country(df, self.harvested_properties)
-        self.harvest_pids(df, self.harvested_properties)
+        df = self.harvest_alternative_names(df)
+        df = self.harvest_country(df)
+        df = self.harvest_pids(df)
 
         return df
 
@@ -96,84 +131,69 @@ class OrganisationTransformer(BaseTransformer):
         }
 
     @staticmethod
-    def harvest_alternative_names(df: DataFrame, harvested_properties: dict) -> None:
+    def harvest_alternative_names(df: DataFrame) -> DataFrame:
         """
-        Harvest alternative names from specified DataFrame columns and store the result in the output dictionary.
+        Harvest alternative names, other than the title and the abbreviation.
 
         Args:
             df (DataFrame): The input DataFrame containing columns for alternative names.
-            harvested_properties (Dict[str, List[List[str]]]): A dictionary to store harvested properties.
 
         Returns:
-            None: The function operates in-place, updating the `harvested_properties` dictionary.
+            DataFrame: The DataFrame with sorted alternative names or null if there are none.
         """
-        alternative_names_list = df.select(ALTERNATIVENAMES).collect()
-        title_list = df.select(TITLE).collect()
-        abbreviation_list = df.select(ABBREVIATION).collect()
-
-        alternative_names_column = []
-
-        for alternative_name_row, title_row, abbreviation_row in zip(
-            alternative_names_list, title_list, abbreviation_list
-        ):
-            alternative_names = alternative_name_row[ALTERNATIVENAMES] or []
-
-            filtered_names = [
-                name
-                for name in alternative_names
-                if name not in [title_row[TITLE], abbreviation_row[ABBREVIATION]]
-            ]
-
-            alternative_names_column.append(
-                sorted(filtered_names) if len(filtered_names) > 0 else None
+        alternative_names = array_sort(
+            filter(
+                coalesce(col(ALTERNATIVENAMES), array()),
+                lambda name: ~name.eqNullSafe(col(TITLE))
+                & ~name.eqNullSafe(col(ABBREVIATION)),
             )
+        )
 
-        harvested_properties[ALTERNATIVE_NAMES] = alternative_names_column
+        return df.withColumn(
+            ALTERNATIVE_NAMES,
+            when(size(alternative_names) > 0, alternative_names),
+        )
 
     @staticmethod
-    def harvest_country(df: DataFrame, harvested_properties: dict) -> None:
-        """Harvest country from country.element.code as string"""
-        countries_list = df.select(COUNTRY).collect()
-        country_column = []
-
-        for countries in countries_list:
-            country_raw_val = countries[COUNTRY] or None
-            country_val = country_raw_val["label"] if country_raw_val else None
-            country_column.append([country_val])
-
-        harvested_properties[COUNTRY] = country_column
+    def harvest_country(df: DataFrame) -> DataFrame:
+        """Harvest country from country.label as an array"""
+        return df.withColumn(COUNTRY, array(col(COUNTRY)["label"]))
 
     @staticmethod
-    def harvest_pids(df: DataFrame, harvested_properties: dict) -> None:
+    def harvest_pids(df: DataFrame) -> DataFrame:
         """
-        Harvest PIDs and store them in the output dictionary.
+        Harvest PIDs serialized to JSON - unique values grouped by lowercase schemes.
 
         Args:
             df (DataFrame): The input DataFrame containing columns for PID information.
-            harvested_properties (Dict[str, List[str]]): A dictionary to store harvested properties.
 
         Returns:
-            None: The function operates in-place, updating the 'harvested_properties' dictionary.
+            DataFrame: The DataFrame with serialized PIDs.
         """
-        pids_raw_column = df.select(PID).collect()
-        pids_column = []
-
-        for pids_list in pids_raw_column:
-            pids_row = {}
-            pids = pids_list[PID] or []
-            for pid in pids:
-                scheme = pid["type"].lower() or None
-                value = pid["value"] or None
-
-                if scheme in pids_row and scheme is not None:
-                    if value not in pids_row[scheme]:
-                        pids_row[scheme].append(value)
-                elif scheme is not None:
-                    pids_row[scheme] = [value]
-                else:
-                    pass  # Do nothing when scheme is None
-
-            pids_row = dict(sorted(pids_row.items()))
-            pids_column.append(json.dumps(pids_row))
-
-        harvested_properties[PIDS] = pids_column
+        pids = coalesce(col(PID), array())
+        schemes = array_sort(
+            array_distinct(
+                filter(
+                    transform(pids, lambda pid: lower(pid["type"])),
+                    lambda scheme: scheme != "",
+                )
+            )
+        )
+
+        return df.withColumn(
+            PIDS,
+            to_json(
+                map_from_arrays(
+                    schemes,
+                    transform(
+                        schemes,
+                        lambda scheme: array_distinct(
+                            transform(
+                                filter(pids, lambda pid: lower(pid["type"]) == scheme),
+                                lambda pid: none_if_empty(pid["value"]),
+                            )
+                        ),
+                    ),
+                )
+            ),
+        )
@@ -1,12 +1,22 @@
-# pylint: disable=line-too-long, wildcard-import, invalid-name, unused-wildcard-import
+# pylint: disable=line-too-long, wildcard-import, invalid-name, unused-wildcard-import, redefined-builtin
 """Transform projects"""
 
-import logging
-from datetime import datetime
-from typing import List, Optional
-
-from pyspark.sql import DataFrame, SparkSession
-from pyspark.sql.functions import col, lit, size, when
+from pyspark.sql import Column, DataFrame, SparkSession
+from pyspark.sql.functions import (
+    array,
+    array_distinct,
+    coalesce,
+    col,
+    filter,
+    format_string,
+    lit,
+    size,
+    split,
+    to_date,
+    transform,
+    trim,
+    when,
+)
 from pyspark.sql.types import (
     ArrayType,
     FloatType,
@@ -19,8 +29,8 @@ from pyspark.sql.types import (
 from app.mappings.currency import currency_mapping
 from app.settings import settings
 from app.transform.transformers.base.base import BaseTransformer
-from app.transform.utils.join_dfs import create_df, join_different_dfs
-from app.transform.utils.utils import sort_schema
+from app.transform.utils.common import lookup_values, none_if_empty
+from app.transform.utils.utils import add_relation_counts, sort_schema
 from schemas.properties.data import *
 
 
@@ -29,11 +39,15 @@ class ProjectTransformer(BaseTransformer):
 
     def __init__(self, spark: SparkSession):
         self.type = settings.PROJECT
-
-        self.logger = logging.getLogger(__name__)
+        self.exp_output_schema = settings.COLLECTIONS[self.type]["OUTPUT_SCHEMA"]
 
         super().__init__(
-            self.type, self.cols_to_add, self.cols_to_drop, self.cols_to_rename, spark
+            self.type,
+            self.cols_to_add,
+            self.cols_to_drop,
+            self.cols_to_rename,
+            self.exp_output_schema,
+            spark,
         )
 
     def apply_simple_trans(self, df: DataFrame) -> DataFrame:
@@ -42,6 +56,15 @@ class ProjectTransformer(BaseTransformer):
         without a need to create another dataframe and merging"""
         df = df.withColumn(TYPE, lit(self.type))
         df = self.rename_cols(df)
+        df = add_relation_counts(
+            df,
+            (
+                RELATED_DATASET_IDS,
+                RELATED_OTHER_IDS,
+                RELATED_PUBLICATION_IDS,
+                RELATED_SOFTWARE_IDS,
+            ),
+        )
 
         return df
 
@@ -49,11 +72,11 @@ class ProjectTransformer(BaseTransformer):
         """Harvest oag properties that requires more complex transformations
         Basically from those harvested properties there will be created another dataframe
         which will be later on merged with the main dataframe"""
-        self.harvest_granted(self, df, self.harvested_properties)
-        self.harvest_keywords(df, self.harvested_properties)
-        self.harvest_funding(df, self.harvested_properties)
-        self.harvest_eosc_score(self.spark, df, self.harvested_properties)
-        self.harvest_date_range(df, self.harvested_properties)
+        df = self.harvest_granted(df)
+        df = self.harvest_keywords(df)
+        df = self.harvest_funding(df)
+        df = self.harvest_eosc_score(df)
+        df = self.harvest_date_range(df)
 
         return df
 
@@ -109,217 +132,126 @@ class ProjectTransformer(BaseTransformer):
         }
 
     @staticmethod
-    def harvest_date_range(df: DataFrame, harvested_properties: dict) -> None:
+    def harvest_date_range(df: DataFrame) -> DataFrame:
         """
         Harvests data range from 'start_date' and 'end_date' columns.
+        Date range is set if both dates are provided, and end_date >= start_date.
 
         Parameters:
             df (DataFrame): The input DataFrame.
-            harvested_properties (dict): The dictionary to be updated with data range.
         """
-        end_date_list = df.select(END_DATE).collect()
-        start_date_list = df.select(START_DATE).collect()
-
-        def process_date_range(
-            end_date_str: Optional[str], start_date_str: Optional[str]
-        ) -> Optional[str]:
-            """
-            Returns a date range string if both 'end_date_str' and 'start_date_str' are provided,
-                and end_date >= start_date.
-            """
-            if end_date_str is None or start_date_str is None:
-                return None
-
-            end_date = datetime.strptime(end_date_str, "%Y-%m-%d").date()
-            start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
-
-            if end_date >= start_date:
-                return f"[{start_date} TO {end_date}]"
-            else:
-                return None
-
-        date_range_column = [
-            process_date_range(end_date_row[END_DATE], start_date_row[START_DATE])
-            for end_date_row, start_date_row in zip(end_date_list, start_date_list)
-        ]
-
-        harvested_properties[DATE_RANGE] = date_range_column
+        end_date = to_date(col(END_DATE), "yyyy-MM-dd")
+        start_date = to_date(col(START_DATE), "yyyy-MM-dd")
+
+        return df.withColumn(
+            DATE_RANGE,
+            when(
+                end_date >= start_date,
+                format_string(
+                    "[%s TO %s]", start_date.cast("string"), end_date.cast("string")
+                ),
+            ),
+        )
 
-    # TODO REFACTOR
     @staticmethod
-    def harvest_eosc_score(spark, df: DataFrame, harvested_properties: dict) -> None:
+    def harvest_eosc_score(df: DataFrame) -> DataFrame:
         """
-        Harvests EOSC score and updates the 'harvested_properties' dictionary.
+        Harvests EOSC score - the number of filled properties of a project.
 
         Parameters:
-            spark (SparkSession): The Spark session.
-            df (DataFrame): The input DataFrame.
-            harvested_properties (dict): The dictionary to be updated with EOSC score.
+            df (DataFrame): The input DataFrame, with already harvested properties.
         """
 
-        def create_conditions(joined_dataframe: DataFrame) -> List[when]:
-            """Create a list of conditions for EOSC score calculation."""
-            return [
-                when(
-                    (
-                        ((col(column) != "") & (col(column).isNotNull()))
-                        if joined_dataframe.schema[column].dataType == StringType()
-                        else (
-                            ((size(col(column)) > 0) & (col(column).isNotNull()))
-                            if joined_dataframe.schema[column].dataType
-                            == ArrayType(StringType())
-                            else col(column).isNotNull()
-                        )
-                    ),
-                    lit(1),
-                ).otherwise(lit(0))
-                for column in joined_dataframe.columns
-            ]
-
-        def calculate_eosc_score(
-            dataframe: DataFrame, conditions: List[when]
-        ) -> List[int]:
-            """Calculate the EOSC score and return a list of scores."""
-            eosc_score_column = sum(conditions).alias(EOSC_SCORE)
-            dataframe = dataframe.withColumn(EOSC_SCORE, eosc_score_column)
-            return dataframe.select(EOSC_SCORE).rdd.flatMap(lambda x: x).collect()
-
-        harvested_properties_schema = StructType(
-            [
-                StructField("currency", StringType(), True),
-                StructField("funding_stream_title", ArrayType(StringType()), True),
-                StructField("funding_title", ArrayType(StringType()), True),
-                StructField("keywords", ArrayType(StringType()), True),
-                StructField("total_cost", FloatType(), True),
-            ]
-        )
-
-        harvested_properties_df = create_df(
-            harvested_properties, harvested_properties_schema, spark
+        def is_filled(column: str) -> Column:
+            """Check if the column has a non-empty value"""
+            data_type = df.schema[column].dataType
+            if data_type == StringType():
+                return (col(column) != "") & col(column).isNotNull()
+            if isinstance(data_type, ArrayType):
+                return (size(col(column)) > 0) & col(column).isNotNull()
+            return col(column).isNotNull()
+
+        scored_columns = (
+            ABBREVIATION,
+            CODE,
+            CURRENCY,
+            DESCRIPTION,
+            END_DATE,
+            FUNDING_STREAM_TITLE,
+            FUNDING_TITLE,
+            KEYWORDS,
+            OPEN_ACCESS_MANDATE_FOR_DATASET,
+            OPEN_ACCESS_MANDATE_FOR_PUBLICATIONS,
+            START_DATE,
+            SUBJECT,
+            TITLE,
+            TOTAL_COST,
         )
 
-        project_df = df.select(
-            df[ABBREVIATION],
-            df[CODE],
-            df[DESCRIPTION],
-            df[END_DATE],
-            df[OPEN_ACCESS_MANDATE_FOR_DATASET],
-            df[OPEN_ACCESS_MANDATE_FOR_PUBLICATIONS],
-            df[START_DATE],
-            df[SUBJECT],
-            df[TITLE],
+        return df.withColumn(
+            EOSC_SCORE,
+            sum(
+                when(is_filled(column), lit(1)).otherwise(lit(0))
+                for column in scored_columns
+            ),
         )
 
-        joined_df = join_different_dfs((project_df, harvested_properties_df))
-        eosc_conditions = create_conditions(joined_df)
-
-        eosc_score = calculate_eosc_score(joined_df, eosc_conditions)
-
-        harvested_properties[EOSC_SCORE] = eosc_score
-
     @staticmethod
-    def harvest_funding(df: DataFrame, harvested_properties: dict) -> None:
+    def harvest_funding(df: DataFrame) -> DataFrame:
         """
-        Harvest funding information and store the result in the output dictionary.
+        Harvest funding information.
         Extracts multiple fields from the funding column and save them in EOSC convention.
 
         funding_stream_description -> funding_stream_title
         funding_name -> funding_title,
         """
-        funding_list = df.select(FUNDING).collect()
-
-        funding_stream_title_column = []
-        funding_title_column = []
-
-        for funding_row in funding_list:
-            funding_stream_title_row = set()
-            funding_title_row = set()
-
-            funding = funding_row[FUNDING] or None
-
-            if funding:
-                for fund in funding:
-                    funding_stream = fund[FUNDING_STREAM] or None
-
-                    if funding_stream:
-                        funding_stream_title = funding_stream[DESCRIPTION]
-
-                        funding_stream_title_row.add(funding_stream_title)
-
-                    funding_title = fund[NAME] or None
-
-                    funding_title_row.add(funding_title)
-
-            funding_stream_title_column.append(list(funding_stream_title_row))
-            funding_title_column.append(list(funding_title_row))
-
-        harvested_properties[FUNDING_STREAM_TITLE] = funding_stream_title_column
-        harvested_properties[FUNDING_TITLE] = funding_title_column
-
-    @staticmethod
-    def map_currency_symbol(self, currency_symbol):
-        """Maps a currency symbol to its corresponding value. Logs a warning if not found."""
-        if (
-            currency_symbol not in currency_mapping
-            and currency_symbol not in currency_mapping.values()
-        ):
-            self.logger.warning(f"Unknown {currency_symbol=}")
-
-        mapped_value = currency_mapping.get(currency_symbol, currency_symbol)
-        return mapped_value
+        funding = coalesce(col(FUNDING), array())
+
+        return df.withColumns(
+            {
+                FUNDING_STREAM_TITLE: array_distinct(
+                    transform(
+                        filter(funding, lambda fund: fund[FUNDING_STREAM].isNotNull()),
+                        lambda fund: fund[FUNDING_STREAM][DESCRIPTION],
+                    )
+                ),
+                FUNDING_TITLE: array_distinct(
+                    transform(funding, lambda fund: none_if_empty(fund[NAME]))
+                ),
+            }
+        )
 
     @staticmethod
-    def harvest_granted(self, df: DataFrame, harvested_properties: dict) -> None:
+    def harvest_granted(df: DataFrame) -> DataFrame:
         """
-        Harvest granted information and store the result in the output dictionary.
+        Harvest granted information.
 
-        Extracts three fields from the granted column: currency and totalcost.
+        Extracts two fields from the granted column: currency and totalcost.
         These values are then stored in separate columns: currency and total_cost.
+        Currency symbols are mapped to currency codes, unknown currencies are kept as they are.
         """
-        granted_list = df.select(GRANTED).collect()
-
-        currency_column = []
-        total_cost_column = []
-
-        for granted_row in granted_list:
-            granted = granted_row[GRANTED] or None
-
-            if granted:
-                currency = self.map_currency_symbol(self, granted[CURRENCY]) or None
-                total_cost = None if granted[TOTALCOST] is None else granted[TOTALCOST]
-
-                currency_column.append(currency)
-                total_cost_column.append(total_cost)
-            else:
-                currency_column.append(None)
-                total_cost_column.append(None)
-
-        harvested_properties[CURRENCY] = currency_column
-        harvested_properties[TOTAL_COST] = total_cost_column
+        currency = col(GRANTED)[CURRENCY]
+
+        return df.withColumns(
+            {
+                CURRENCY: none_if_empty(
+                    coalesce(lookup_values(currency, currency_mapping), currency)
+                ),
+                TOTAL_COST: col(GRANTED)[TOTALCOST],
+            }
+        )
 
     @staticmethod
-    def harvest_keywords(df: DataFrame, harvested_properties: dict) -> None:
+    def harvest_keywords(df: DataFrame) -> DataFrame:
         """
         Temp method until openaire relase keyword fix
-        Harvests keywords from the specified DataFrame columns, converts them from strings to lists,
-        and store them in the output dictionary.
+        Harvests keywords from the specified DataFrame columns, converts them from strings to lists.
         """
-        keywords_list = df.select(KEYWORDS).collect()
-
-        keywords_column = []
-
-        for keywords_row in keywords_list:
-            keywords = keywords_row[KEYWORDS] or None
-
-            if keywords:
-                keywords_to_list = [
-                    keyword.strip()
-                    for keyword in keywords.split(",")
-                    if keyword.strip()
-                ]
-
-                keywords_column.append(keywords_to_list)
-            else:
-                keywords_column.append(None)
+        keywords = filter(
+            transform(split(col(KEYWORDS), ","), lambda keyword: trim(keyword)),
+            lambda keyword: keyword != "",
+        )
 
-        harvested_properties[KEYWORDS] = keywords_column
+        return df.withColumn(
+            KEYWORDS, when(none_if_empty(col(KEYWORDS)).isNotNull(), keywords)
+        )
@@ -49,8 +49,7 @@ class ProviderTransformer(BaseTransformer):
         """Harvest properties that requires more complex transformations
         Basically from those harvested properties there will be created another dataframe
         which will be later on merged with the main dataframe"""
-        harvest_popularity(df, self.harvested_properties)
-        return df
+        return harvest_popularity(df)
 
     @staticmethod
     def simplify_urls(df: DataFrame) -> DataFrame:
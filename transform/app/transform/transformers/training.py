@@ -1,14 +1,32 @@
 # pylint: disable=line-too-long, wildcard-import, invalid-name, unused-wildcard-import, duplicate-code
 """Transform trainings"""
-import json
-from datetime import datetime
-from itertools import chain
 from logging import getLogger
 
 import pycountry
-from dateutil import parser
-from pyspark.sql import DataFrame, SparkSession
-from pyspark.sql.functions import col, lit, split
+from pyspark.sql import Column, DataFrame, SparkSession
+from pyspark.sql.functions import (
+    aggregate,
+    array,
+    array_contains,
+    coalesce,
+    col,
+    concat,
+    date_from_unix_date,
+    element_at,
+)
+from pyspark.sql.functions import filter as filter_array
+from pyspark.sql.functions import (
+    flatten,
+    floor,
+    length,
+    lit,
+    lower,
+    split,
+    to_json,
+    transform,
+    upper,
+    when,
+)
 from pyspark.sql.types import (
     ArrayType,
     BooleanType,
@@ -18,19 +36,20 @@ from pyspark.sql.types import (
     StructType,
 )
 
+from app.mappings.scientific_domain import sd_training_temp_mapping
 from app.services.mp_pc.data import get_providers_mapping
 from app.settings import settings
-from app.mappings.scientific_domain import sd_training_temp_mapping
-from schemas.old.output.training import training_output_schema
 from app.transform.transformers.base.base import BaseTransformer
 from app.transform.utils.common import (
     create_open_access,
     create_unified_categories,
+    lookup_values,
     map_best_access_right,
     remove_commas,
     transform_date,
 )
 from app.transform.utils.utils import sort_schema
+from schemas.old.output.training import training_output_schema
 from schemas.properties.data import *
 
 logger = getLogger(__name__)
@@ -71,8 +90,8 @@ class TrainingTransformer(BaseTransformer):
         """Harvest oag properties that requires more complex transformations
         Basically from those harvested properties there will be created another dataframe
         which will be later on merged with the main dataframe"""
-        df = map_best_access_right(df, self.harvested_properties, self.type)
-        create_open_access(self.harvested_properties)
+        df = map_best_access_right(df, self.type)
+        df = create_open_access(df)
         df = self.map_arr_that_ends_with(df, (CONTENT_TYPE, TARGET_GROUP))
         df = self.map_lvl_of_expertise(df)
         df = self.map_geo_av(df)
@@ -83,8 +102,8 @@ class TrainingTransformer(BaseTransformer):
         df = self.serialize_alternative_ids(df, ALTERNATIVE_IDS)
         df = self.map_providers_and_orgs(df)
 
-        create_unified_categories(df, self.harvested_properties)
-        df = remove_commas(df, "author_names", self.harvested_properties)
+        df = create_unified_categories(df)
+        df = remove_commas(df, "author_names")
 
         return df
 
@@ -157,78 +176,70 @@ class TrainingTransformer(BaseTransformer):
             "versionDate": "publication_date",
         }
 
+    @staticmethod
+    def capitalize_suffix(column: Column) -> Column:
+        """Take the part after the last dash, capitalized"""
+        suffix = element_at(split(column, "-"), -1)
+        return concat(
+            upper(suffix.substr(1, 1)), lower(suffix.substr(lit(2), length(suffix)))
+        )
+
     def map_arr_that_ends_with(self, df, cols_list) -> DataFrame:
         """Map content_type target_group values.
         E.g.
         tr_content_resource_type-text -> Text
         tr_content_resource_type-video -> Video
         target_user-researchers -> Researchers"""
-
-        for _col in cols_list:
-            df_raw = df.select(_col).collect()
-            df_column = []
-
-            for column in chain.from_iterable(df_raw):
-                df_column.append([row.split("-")[-1].capitalize() for row in column])
-
-            self.harvested_properties[_col] = df_column
-            df = df.drop(_col)
-
-        return df
+        return df.withColumns(
+            {_col: transform(col(_col), self.capitalize_suffix) for _col in cols_list}
+        )
 
     def map_lvl_of_expertise(self, df) -> DataFrame:
         """Map level_of_expertise values.
         E.g.
         tr_expertise_level-beginner -> Beginner
         tr_expertise_level-all -> All"""
+        return df.withColumn(
+            LVL_OF_EXPERTISE, self.capitalize_suffix(col(LVL_OF_EXPERTISE))
+        )
 
-        lvl_of_exp_raw = df.select(LVL_OF_EXPERTISE).collect()
-        lvl_of_exp_column = [
-            lvl.split("-")[-1].capitalize()
-            for lvl in chain.from_iterable(lvl_of_exp_raw)
-        ]
-
-        self.harvested_properties[LVL_OF_EXPERTISE] = lvl_of_exp_column
-
-        return df.drop(LVL_OF_EXPERTISE)
-
-    def map_geo_av(self, df) -> DataFrame:
+    @staticmethod
+    def map_geo_av(df) -> DataFrame:
         """Map geographical_availabilities values.
         E.g.
         WW -> World"""
-        geo_av_raw = df.select(GEO_AV).collect()
-        geo_av_column = []
-
-        for geo_av in chain.from_iterable(geo_av_raw):
-            geo_av_row = []
-            for ga in geo_av:
-                if ga == "WW":
-                    geo_av_row.append("World")
-                elif ga == "EO":
-                    geo_av_row.append("Europe")
-                else:
-                    geo_av_row.append(pycountry.countries.get(alpha_2=ga).name)
-            geo_av_column.append(geo_av_row)
-
-        self.harvested_properties[GEO_AV] = geo_av_column
-
-        return df.drop(GEO_AV)
+        geo_av_lookup = {
+            **{country.alpha_2: country.name for country in pycountry.countries},
+            "WW": "World",
+            "EO": "Europe",
+        }
+        return df.withColumn(
+            GEO_AV,
+            transform(
+                col(GEO_AV), lambda ga: coalesce(lookup_values(ga, geo_av_lookup), ga)
+            ),
+        )
 
-    def map_lang(self, df) -> DataFrame:
+    @staticmethod
+    def map_lang(df) -> DataFrame:
         """Map language values.
         E.g.
         en -> English"""
-        lang_raw = df.select(LANGUAGE).collect()
-        lang_column = []
-
-        for lang in chain.from_iterable(lang_raw):
-            lang_column.append([pycountry.languages.get(alpha_2=l).name for l in lang])
-
-        self.harvested_properties[LANGUAGE] = lang_column
-
-        return df.drop(LANGUAGE)
+        lang_lookup = {
+            lang.alpha_2: lang.name
+            for lang in pycountry.languages
+            if hasattr(lang, "alpha_2")
+        }
+        return df.withColumn(
+            LANGUAGE,
+            transform(
+                col(LANGUAGE),
+                lambda lang: coalesce(lookup_values(lang, lang_lookup), lang),
+            ),
+        )
 
-    def map_resource_type(self, df) -> DataFrame:
+    @staticmethod
+    def map_resource_type(df) -> DataFrame:
         """Map resource_type values.
         E.g.
         tr_dcmi_type-lesson_plan -> Lesson Plan
@@ -249,120 +260,95 @@ class TrainingTransformer(BaseTransformer):
             "tr_dcmi_type-unit_plan": "Unit Plan",
         }
 
-        resource_type_raw = df.select(RESOURCE_TYPE).collect()
-        resource_type_column = []
-
-        for resource_type in chain.from_iterable(resource_type_raw):
-            resource_type_column.append(
-                [mapping_dict.get(rt, rt) for rt in resource_type]
-            )
-
-        self.harvested_properties[RESOURCE_TYPE] = resource_type_column
-
-        return df.drop(RESOURCE_TYPE)
+        return df.withColumn(
+            RESOURCE_TYPE,
+            transform(
+                col(RESOURCE_TYPE),
+                lambda rt: coalesce(lookup_values(rt, mapping_dict), rt),
+            ),
+        )
 
-    def map_sci_domains(self, df) -> DataFrame:
+    @staticmethod
+    def map_sci_domains(df) -> DataFrame:
         """Map scientific_domains values.
         E.g.
         {scientific_domain-generic, scientific_subdomain-generic-generic}
-        -> ['Generic', 'Generic>Generic']"""
-
-        def map_scientific_domain(sd_raw: str, sd_list: list[str]) -> list[str] | None:
-            """Map scientific domain"""
-            try:
-                sd_mapped = sd_training_temp_mapping[sd_raw.lower()]
-
-                if ">" in sd_mapped:  # If a child is being added
-                    if sd_mapped not in sd_list:
-                        # Assumption: trusting the data to automatically assign parents to individual children.
-                        # Looking at the results, we actually have the most happy paths here.
-                        # When we previously added a child along with their parent,
-                        # there were almost always more parents than children, and there were definitely fewer happy paths.
-                        return [sd_mapped]
-                    return None
-                else:  # If a parent is being added
-                    return [sd_mapped]
-            except KeyError:
-                if sd_raw != "null":
-                    logger.warning(f"Unexpected scientific domain: {sd_raw=}")
-                return None  # Don't add unexpected scientific domain to not destroy filter's tree structure
-
-        sci_domains_raw = df.select(SCIENTIFIC_DOMAINS).collect()
-        sci_domains_column = []
-
-        for sci_domain in chain.from_iterable(sci_domains_raw):
-            sci_domain_row = []
-            for sd in chain.from_iterable(sci_domain):
-                result_raw = sd.split("-", 1)[1]
-                final_sd = map_scientific_domain(result_raw, sci_domain_row)
-                if final_sd:
-                    sci_domain_row.extend(final_sd)
-
-            sci_domains_column.append([sci_domain_row])
-        self.harvested_properties[SCIENTIFIC_DOMAINS] = sci_domains_column
-
-        return df.drop(SCIENTIFIC_DOMAINS)
-
-    def ts_to_iso(self, df: DataFrame) -> DataFrame:
-        """Reformat certain columns from unix ts into iso format
-        timestamp is provided with millisecond-precision -> 13digits"""
-        pub_date_raw = df.select(PUBLICATION_DATE).collect()
-        pub_date_column = [
-            parser.parse(
-                datetime.utcfromtimestamp(int(row) / 1000).isoformat(timespec="seconds")
+        -> ['Generic', 'Generic>Generic']
+
+        Unexpected scientific domains are skipped to not destroy filter's tree structure.
+        Assumption: trusting the data to automatically assign parents to individual children.
+        Looking at the results, we actually have the most happy paths here.
+        When we previously added a child along with their parent,
+        there were almost always more parents than children, and there were definitely fewer happy paths.
+        """
+        sd_fields = df.schema[SCIENTIFIC_DOMAINS].dataType.elementType.fieldNames()
+        sds_raw = flatten(
+            transform(
+                col(SCIENTIFIC_DOMAINS),
+                lambda sd: array(*(sd[field] for field in sd_fields)),
             )
-            for row in chain.from_iterable(pub_date_raw)
-        ]
-        self.harvested_properties[PUBLICATION_DATE] = pub_date_column
+        )
+        sds_mapped = filter_array(
+            transform(
+                sds_raw,
+                lambda sd: lookup_values(
+                    lower(split(sd, "-", 2)[1]), sd_training_temp_mapping
+                ),
+            ),
+            lambda sd: sd.isNotNull(),
+        )
+        # Parents are always added, children only once
+        sds = aggregate(
+            sds_mapped,
+            array().cast(ArrayType(StringType())),
+            lambda acc, sd: when(
+                sd.contains(">") & array_contains(acc, sd), acc
+            ).otherwise(concat(acc, array(sd))),
+        )
+
+        return df.withColumn(SCIENTIFIC_DOMAINS, array(sds))
 
-        return df.drop(PUBLICATION_DATE)
+    @staticmethod
+    def ts_to_iso(df: DataFrame) -> DataFrame:
+        """Reformat certain columns from unix ts into dates
+        timestamp is provided with millisecond-precision -> 13digits"""
+        return df.withColumn(
+            PUBLICATION_DATE,
+            date_from_unix_date(
+                floor(col(PUBLICATION_DATE).cast("long") / (1000 * 60 * 60 * 24))
+            ),
+        )
 
-    def serialize_alternative_ids(self, df: DataFrame, _col: str) -> DataFrame:
+    @staticmethod
+    def serialize_alternative_ids(df: DataFrame, _col: str) -> DataFrame:
         """Serialize a single column. Define this column also in harvested_schema.
         Assumption: column is an array of values e.g. dicts"""
         if _col in df.columns:
-            raw_prop_col = df.select(_col).collect()
-            serialized_prop_col = []
-
-            for rows in chain.from_iterable(raw_prop_col):
-                row_list = []
-                for row in rows:
-                    row_list.append(json.dumps(row.asDict()))
-                serialized_prop_col.append(row_list)
-
-            self.harvested_properties[_col] = serialized_prop_col
-
-            return df.drop(_col)
-        else:
-            length = df.count()
-            empty_lists = [[] for _ in range(length)]
-            self.harvested_properties[_col] = empty_lists
-            return df
+            return df.withColumn(
+                _col,
+                transform(
+                    col(_col),
+                    lambda row: to_json(row, {"ignoreNullFields": "false"}),
+                ),
+            )
+        return df.withColumn(_col, array().cast(ArrayType(StringType())))
 
-    def map_providers_and_orgs(self, df: DataFrame) -> DataFrame:
+    @staticmethod
+    def map_providers_and_orgs(df: DataFrame) -> DataFrame:
         """Map pids into names - providers and organisation columns.
+        Unknown pids are kept as they are.
         Note: organisations are providers - and they are mandatory, providers are not"""
-
-        def _map(pids_list: str | list[str]) -> list[str]:
-            """Map list of pids into a list of names"""
-            if isinstance(pids_list, str):
-                pids_list = [pids_list]
-            output = []
-            for pid in pids_list:
-                if pid in providers_mapping:
-                    output.append(providers_mapping[pid])
-                else:
-                    logger.warning(f"Unknown training's {pid=}")
-                    output.append(pid)
-            return output
-
         providers_mapping = get_providers_mapping()
 
-        for _col in (PROVIDERS, RESOURCE_ORGANISATION):
-            pids_col = df.select(_col).collect()
-            names_col = [_map(pids) for pids in chain.from_iterable(pids_col)]
-
-            self.harvested_properties[_col] = names_col
-            df = df.drop(_col)
+        def _map(pid: Column) -> Column:
+            """Map pid into a name"""
+            return coalesce(lookup_values(pid, providers_mapping), pid)
 
-        return df
+        if not providers_mapping:
+            return df
+        return df.withColumns(
+            {
+                PROVIDERS: transform(col(PROVIDERS), _map),
+                RESOURCE_ORGANISATION: _map(col(RESOURCE_ORGANISATION)),
+            }
+        )
@@ -0,0 +1,129 @@
+# pylint: disable=line-too-long, logging-fstring-interpolation
+"""Compact summaries of offers and their services embedded into bundles"""
+import json
+import logging
+from typing import Iterable
+
+import requests
+
+from app.services.solr.errors import SolrException
+from app.services.solr.fetch import (
+    MAX_VALUES_PER_REQUEST,
+    any_of,
+    chunked,
+    get_docs,
+    select_docs,
+)
+from app.settings import settings
+from app.transform.utils.send import req_headers
+from schemas.properties.data import ID
+
+logger = logging.getLogger(__name__)
+
+OFFERS_SUMMARY = "offers_summary"
+# Fields of offers and services used to render bundles
+OFFER_SUMMARY_FIELDS = ("id", "title", "service_id", "best_access_right")
+SERVICE_SUMMARY_FIELDS = ("id", "title", "resource_organisation", "pid")
+BUNDLE_FIELDS = (ID, "main_offer_id", "offer_ids")
+
+
+def get_offers_summaries(offer_ids: Iterable[str]) -> dict[str, dict]:
+    """Get summaries of the offers, including summaries of their services. Keys are offers IDs"""
+    offers = get_docs(settings.OFFER, offer_ids, OFFER_SUMMARY_FIELDS)
+    services = {
+        service[ID]: service
+        for service in get_docs(
+            settings.SERVICE,
+            {str(offer["service_id"]) for offer in offers if "service_id" in offer},
+            SERVICE_SUMMARY_FIELDS,
+        )
+    }
+    return {
+        offer[ID]: {**offer, "service": services.get(str(offer.get("service_id")))}
+        for offer in offers
+    }
+
+
+def summarize_bundle_offers(
+    main_offer_id: str | int | None,
+    offer_ids: list[int] | None,
+    summaries: dict[str, dict],
+) -> list[str] | None:
+    """Offers summaries of a bundle, main offer first, serialized to json strings.
+    None if any of the offers is missing, e.g. not indexed yet, so that
+    the backend retrieves the offers of the bundle when it's displayed"""
+    bundle_offer_ids = [
+        str(offer_id)
+        for offer_id in [main_offer_id] + (offer_ids or [])
+        if offer_id is not None
+    ]
+    if not bundle_offer_ids or any(
+        offer_id not in summaries for offer_id in bundle_offer_ids
+    ):
+        return None
+    return [json.dumps(summaries[offer_id]) for offer_id in bundle_offer_ids]
+
+
+def select_changed_bundles(type_: str, ids: list[str]) -> list[dict]:
+    """Bundles that reference the offers or services of the given IDs.
+    Queries are split, so that they don't exceed the limits of Solr"""
+    if type_ == settings.SERVICE:
+        ids = [
+            offer[ID]
+            for ids_chunk in chunked(ids, MAX_VALUES_PER_REQUEST)
+            for offer in select_docs(
+                settings.OFFER, any_of("service_id", ids_chunk), (ID,)
+            )
+        ]
+
+    bundles = {}
+    # Each offer ID is matched against two fields
+    for ids_chunk in chunked(ids, MAX_VALUES_PER_REQUEST // 2):
+        for bundle in select_docs(
+            settings.BUNDLE,
+            f"{any_of('main_offer_id', ids_chunk)} OR {any_of('offer_ids', ids_chunk)}",
+            BUNDLE_FIELDS,
+        ):
+            bundles[bundle[ID]] = bundle
+    return list(bundles.values())
+
+
+def refresh_bundles_offers_summaries(
+    type_: str, ids: list[str], full_update: bool = False
+) -> None:
+    """Re-index summaries of the bundles that reference changed offers or services.
+    All the bundles are refreshed after a full update"""
+    if full_update:
+        bundles = select_docs(settings.BUNDLE, "*:*", BUNDLE_FIELDS)
+    else:
+        bundles = select_changed_bundles(type_, ids)
+    if not bundles:
+        return
+
+    summaries = get_offers_summaries(
+        {
+            str(offer_id)
+            for bundle in bundles
+            for offer_id in [bundle.get("main_offer_id")] + bundle.get("offer_ids", [])
+            if offer_id is not None
+        }
+    )
+    updates = [
+        {
+            ID: bundle[ID],
+            OFFERS_SUMMARY: {
+                "set": summarize_bundle_offers(
+                    bundle.get("main_offer_id"), bundle.get("offer_ids"), summaries
+                )
+            },
+        }
+        for bundle in bundles
+    ]
+    for s_col_name in settings.COLLECTIONS[settings.BUNDLE]["SOLR_COL_NAMES"]:
+        url = f"{settings.SOLR_URL}solr/{s_col_name}/update?commitWithin=100"
+        req = requests.post(url, json=updates, headers=req_headers, timeout=180)
+        if req.status_code != 200:
+            raise SolrException(req.json())
+    logger.info(
+        f"Offers summaries of {len(updates)} bundles were refreshed after {type_} update"
+    )
@@ -1,9 +1,16 @@
 # pylint: disable=line-too-long, too-many-arguments, consider-using-with, invalid-name, logging-fstring-interpolation
 """Module to send data"""
+import gzip
+import json
 import logging
+from functools import partial
+from time import sleep
+from typing import Iterable, Iterator
 
 import requests
+from pyspark.sql import DataFrame
 from requests.exceptions import ConnectionError as ReqConnectionError
+from requests.exceptions import Timeout
 
 from app.services.solr.errors import SolrException
 from app.settings import settings
@@ -14,6 +21,9 @@ SOLR = "SOLR"
 S3 = "S3"
 
 req_headers = {"Accept": "application/json", "Content-Type": "application/json"}
+# Solr responses after which a batch is resent
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+RETRY_BACKOFF = 1.0  # Seconds, doubled after each attempt
 # failed_files = {
 #     PROVIDER: {SOLR: [], S3: []},
 #     SERVICE: {SOLR: [], S3: []},
@@ -69,6 +79,116 @@ def send_json_string_to_solr(
             raise SolrException(e)
 
 
+def index_df_in_solr(df: DataFrame, col_name: str) -> int:
+    """Stream documents from each partition of the dataframe to solr.
+    Collections are committed once all documents are sent. Returns the number of sent documents
+    """
+    solr_col_names = settings.COLLECTIONS[col_name]["SOLR_COL_NAMES"]
+    # Executors get plain values, settings are resolved on the driver
+    send_partition = partial(
+        send_docs_to_solr,
+        urls=[
+            f"{settings.SOLR_URL}solr/{s_col_name}/update/json/docs"
+            for s_col_name in solr_col_names
+        ],
+        max_batch_bytes=settings.SOLR_INDEX_BATCH_BYTES,
+        gzip_body=settings.SOLR_INDEX_GZIP,
+        retries=settings.SOLR_INDEX_RETRIES,
+    )
+
+    docs = df.toJSON()
+    if docs.getNumPartitions() > settings.SOLR_INDEX_PARALLELISM:
+        docs = docs.coalesce(settings.SOLR_INDEX_PARALLELISM)
+    docs_num = docs.mapPartitions(send_partition).sum()
+
+    for s_col_name in solr_col_names:
+        commit_solr_collection(s_col_name, settings.SOLR_INDEX_RETRIES)
+    logger.info(
+        f"{docs_num} documents were indexed. Data type={col_name}, solr_cols={solr_col_names}"
+    )
+    return docs_num
+
+
+def batch_docs(docs: Iterable[str], max_batch_bytes: int) -> Iterator[list[bytes]]:
+    """Group json documents into batches of up to max_batch_bytes.
+    A document larger than the limit is sent in its own batch"""
+    batch, batch_bytes = [], 0
+    for doc in docs:
+        doc = doc.encode("utf-8")
+        if batch and batch_bytes + len(doc) + 1 > max_batch_bytes:
+            yield batch
+            batch, batch_bytes = [], 0
+        batch.append(doc)
+        batch_bytes += len(doc) + 1
+    if batch:
+        yield batch
+
+
+def send_docs_to_solr(
+    docs: Iterable[str],
+    urls: list[str],
+    max_batch_bytes: int,
+    gzip_body: bool,
+    retries: int,
+) -> Iterator[int]:
+    """Send json documents to solr in JSON lines batches, without committing them.
+    Yields the number of documents in each sent batch"""
+    headers = dict(req_headers)
+    if gzip_body:
+        headers["Content-Encoding"] = "gzip"
+
+    with requests.Session() as session:
+        for batch in batch_docs(docs, max_batch_bytes):
+            body = b"\n".join(batch)
+            if gzip_body:
+                body = gzip.compress(body)
+            for url in urls:
+                post_with_retries(session, url, body, headers, retries)
+            yield len(batch)
+
+
+def post_with_retries(
+    session: requests.Session,
+    url: str,
+    body: bytes,
+    headers: dict[str, str],
+    retries: int,
+    timeout: int = 180,
+) -> None:
+    """Post the body to solr, resend it after connection errors and transient failures"""
+    for attempt in range(retries + 1):
+        try:
+            req = session.post(url, data=body, headers=headers, timeout=timeout)
+        except (ReqConnectionError, Timeout) as e:
+            error = SolrException(e)
+        else:
+            if req.status_code == 200:
+                return
+            error = SolrException(f"{req.status_code} update failed {url=}: {req.text}")
+            if req.status_code not in RETRY_STATUS_CODES:
+                raise error
+
+        if attempt < retries:
+            logger.warning(f"Sending to solr has failed, retrying. Details: {error}")
+            sleep(RETRY_BACKOFF * 2**attempt)
+
+    raise error
+
+
+def commit_solr_collection(s_col_name: str, retries: int) -> None:
+    """Commit pending updates of the solr collection.
+    The commit is retried after transient failures, e.g. when solr is still warming
+    searchers opened by a previous commit"""
+    url = f"{settings.SOLR_URL}solr/{s_col_name}/update"
+    body = json.dumps({"commit": {}}).encode("utf-8")
+    with requests.Session() as session:
+        try:
+            post_with_retries(session, url, body, req_headers, retries, timeout=600)
+        except SolrException as e:
+            logger.error(f"Commit failed, solr_col={s_col_name}. Details: {e}")
+            raise
+
+
 # def send_to_solr(
 #     col_name: str,
 #     file: str,
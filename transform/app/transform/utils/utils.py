@@ -7,12 +7,13 @@ from typing import List
 
 import pandas as pd
 from pyspark.sql import DataFrame
-from pyspark.sql.functions import col, lit, split, when
+from pyspark.sql.functions import col, lit, size, split, when
 from pyspark.sql.types import StringType, StructType
 
 from app.services.spark.logger import Log4J
 from app.settings import settings
 from app.transform.utils.send import S3, SOLR
+from schemas.properties.data import RELATED_IDS_NUMBERS
 
 logger = getLogger(__name__)
 
@@ -61,6 +62,20 @@ def add_columns(df: DataFrame, cols: tuple) -> DataFrame:
     return df
 
 
+def add_relation_counts(df: DataFrame, ids_cols: tuple[str, ...]) -> DataFrame:
+    """Add the number of related ids of each related ids column.
+    Counts are indexed, so the related ids don't need to be retrieved to show them"""
+    for ids_col in ids_cols:
+        count = (
+            when(col(ids_col).isNull(), 0).otherwise(size(col(ids_col)))
+            if ids_col in df.columns
+            else lit(0)
+        )
+        df = df.withColumn(RELATED_IDS_NUMBERS[ids_col], count)
+
+    return df
+
+
 def print_results(failed_files: dict, logger: Log4J) -> None:
     """Print results"""
 
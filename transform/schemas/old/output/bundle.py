@@ -16,6 +16,7 @@ bundle_output_schema = {
     "iid": "bigint",
     "main_offer_id": "string",
     "offer_ids": "array<int>",
+    "offers_summary": "array<string>",
     "popularity": "int",
     "providers": "array<string>",
     "publication_date": "date",
@@ -24,6 +24,8 @@ guideline_output_schema = {
     "providers": "list",
     "publication_date": "str",
     "publication_year": "int",
+    "related_services_summary": "str",
+    "related_services_updated_at": "str",
     "related_standards_id": "list",
     "related_standards_uri": "list",
     "right_id": "list",
@@ -8,10 +8,15 @@ organisation_output_schema = {
     "title": "string",
     "pids": "string",
     "related_dataset_ids": "array<string>",
+    "related_dataset_number": "int",
     "related_other_ids": "array<string>",
+    "related_other_number": "int",
     "related_publication_ids": "array<string>",
+    "related_publication_number": "int",
     "related_project_ids": "array<string>",
+    "related_project_number": "int",
     "related_software_ids": "array<string>",
+    "related_software_number": "int",
     "type": "string",
     "url": "string",
 }
@@ -16,10 +16,14 @@ project_output_schema = {
     "open_access_mandate_for_dataset": "boolean",
     "open_access_mandate_for_publications": "boolean",
     "related_dataset_ids": "array<string>",
+    "related_dataset_number": "int",
     "related_organisation_titles": "array<string>",
     "related_other_ids": "array<string>",
+    "related_other_number": "int",
     "related_publication_ids": "array<string>",
+    "related_publication_number": "int",
     "related_software_ids": "array<string>",
+    "related_software_number": "int",
     "start_date": "date",
     "subject": "array<string>",
     "title": "string",
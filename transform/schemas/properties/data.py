@@ -64,11 +64,16 @@ PROVIDERS = "providers"
 PUBLICATION_DATE = "publication_date"
 PUBLISHER = "publisher"
 RELATED_DATASET_IDS = "related_dataset_ids"
+RELATED_DATASET_NUMBER = "related_dataset_number"
 RELATED_ORGANISATION_TITLES = "related_organisation_titles"
 RELATED_OTHER_IDS = "related_other_ids"
+RELATED_OTHER_NUMBER = "related_other_number"
 RELATED_PROJECT_IDS = "related_project_ids"
+RELATED_PROJECT_NUMBER = "related_project_number"
 RELATED_PUBLICATION_IDS = "related_publication_ids"
+RELATED_PUBLICATION_NUMBER = "related_publication_number"
 RELATED_SOFTWARE_IDS = "related_software_ids"
+RELATED_SOFTWARE_NUMBER = "related_software_number"
 RELATIONS = "relations"
 RELATIONS_LONG = "relations_long"
 RESEARCH_COMMUNITY = "research_community"
@@ -103,3 +108,12 @@ EOSC_IF_TG = "eosc_if_tg"
 # AGGREGATED COLUMNS -> these columns are added to each other, so can not be tuples
 SELECTED_COLUMNS = [ID]
 ADDITIONAL_COLUMNS = [LEGALNAME]
+
+# RELATION COUNTS -> related ids columns mapped to the columns with their number
+RELATED_IDS_NUMBERS = {
+    RELATED_DATASET_IDS: RELATED_DATASET_NUMBER,
+    RELATED_OTHER_IDS: RELATED_OTHER_NUMBER,
+    RELATED_PROJECT_IDS: RELATED_PROJECT_NUMBER,
+    RELATED_PUBLICATION_IDS: RELATED_PUBLICATION_NUMBER,
+    RELATED_SOFTWARE_IDS: RELATED_SOFTWARE_NUMBER,
+}
@@ -0,0 +1,25 @@
+from unittest.mock import MagicMock
+
+from pytest_mock import MockerFixture
+
+from app.services.solr.fetch import select_docs
+
+
+def test_select_docs_pages_with_cursor(mocker: MockerFixture) -> None:
+    pages = [
+        {"response": {"docs": [{"id": "1"}, {"id": "2"}]}, "nextCursorMark": "a"},
+        {"response": {"docs": [{"id": "3"}]}, "nextCursorMark": "b"},
+        {"response": {"docs": []}, "nextCursorMark": "b"},
+    ]
+    post = mocker.patch(
+        "app.services.solr.fetch.requests.post",
+        side_effect=[MagicMock(status_code=200, json=lambda p=p: p) for p in pages],
+    )
+
+    docs = select_docs("offer", "service_id:1", ("id",), rows=2)
+
+    assert docs == [{"id": "1"}, {"id": "2"}, {"id": "3"}]
+    assert [
+        call.kwargs["json"]["params"]["cursorMark"] for call in post.call_args_list
+    ] == ["*", "a", "b"]
+    assert post.call_args_list[0].args[0].endswith("solr/offer/select")
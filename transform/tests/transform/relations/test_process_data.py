@@ -0,0 +1,51 @@
+import pandas as pd
+
+from app.transform.relations.process_data import update_json_file
+from app.transform.utils.json_io import read_json, write_json
+
+
+def test_update_json_file_stores_relation_counts(tmp_path) -> None:
+    file_path = str(tmp_path / "organisation.json")
+    write_json(file_path, [{"id": "org1"}, {"id": "org2"}])
+    df_group = pd.DataFrame(
+        [
+            {
+                "target": "org1",
+                "source_type": "publication",
+                "target_file_path": file_path,
+                "source": ["pub1", "pub2"],
+            },
+            {
+                "target": "org2",
+                "source_type": "software",
+                "target_file_path": file_path,
+                "source": ["sw1"],
+            },
+        ]
+    )
+
+    update_json_file(
+        file_path,
+        df_group,
+        "target_file_path",
+        "target",
+        "source_type",
+        {
+            "publication": "related_publication_ids",
+            "software": "related_software_ids",
+        },
+        "source",
+    )
+
+    assert read_json(file_path) == [
+        {
+            "id": "org1",
+            "related_publication_ids": ["pub1", "pub2"],
+            "related_publication_number": 2,
+        },
+        {
+            "id": "org2",
+            "related_software_ids": ["sw1"],
+            "related_software_number": 1,
+        },
+    ]
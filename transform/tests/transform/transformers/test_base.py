@@ -0,0 +1,66 @@
+from pyspark.sql import DataFrame, SparkSession
+from pyspark.sql.functions import lit, upper
+from pyspark.sql.types import StringType, StructField, StructType
+from pytest_mock import MockerFixture
+
+from app.transform.transformers.base.base import BaseTransformer
+
+
+class TitleTransformer(BaseTransformer):
+    def __init__(self, spark: SparkSession):
+        super().__init__(
+            "title", None, ("raw",), {}, {"id": "string", "title": "string"}, spark
+        )
+
+    def apply_simple_trans(self, df: DataFrame) -> DataFrame:
+        return df.withColumn("title", lit(None))
+
+    def apply_complex_trans(self, df: DataFrame) -> DataFrame:
+        # Triggers a Spark job
+        assert not df.isEmpty()
+        return df.withColumn("title", upper("raw"))
+
+    @staticmethod
+    def cast_columns(df: DataFrame) -> DataFrame:
+        return df
+
+    @property
+    def harvested_schema(self) -> StructType:
+        return StructType([StructField("title", StringType())])
+
+    @property
+    def cols_to_rename(self) -> dict[str, str]:
+        return {}
+
+
+def test_transformer_persists_input_and_tracks_jobs(
+    spark: SparkSession, mocker: MockerFixture
+) -> None:
+    mocker.patch("app.settings.settings.TRANSFORM_STORAGE_LEVEL", "MEMORY_AND_DISK")
+    transformer = TitleTransformer(spark)
+    df = spark.createDataFrame([("1", "a"), ("2", "b")], "id string, raw string")
+
+    df_trans = transformer(df)
+
+    assert sorted(df_trans.collect()) == [("1", "A"), ("2", "B")]
+    assert transformer.jobs_per_stage["simple"] == 0
+    assert transformer.jobs_per_stage["complex"] > 0
+    assert transformer.jobs_per_stage["common"] == 0
+    [persisted_df] = transformer._persisted_dfs  # pylint: disable=protected-access
+    assert persisted_df.is_cached
+
+    transformer.unpersist()
+
+    assert not persisted_df.is_cached
+
+
+def test_transformer_persistence_can_be_disabled(
+    spark: SparkSession, mocker: MockerFixture
+) -> None:
+    mocker.patch("app.settings.settings.TRANSFORM_STORAGE_LEVEL", "NONE")
+    transformer = TitleTransformer(spark)
+    df = spark.createDataFrame([("1", "a")], "id string, raw string")
+
+    transformer(df)
+
+    assert not transformer._persisted_dfs  # pylint: disable=protected-access
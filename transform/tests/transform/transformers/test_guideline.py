@@ -0,0 +1,42 @@
+import json
+from unittest.mock import MagicMock
+
+import pandas as pd
+import requests
+from pytest_mock import MockerFixture
+
+from app.transform.transformers.guideline import harvest_related_services
+
+
+def test_harvest_related_services(mocker: MockerFixture) -> None:
+    related = {"ig1": ["pid.a", "pid.b"], "ig2": []}
+
+    def get(url: str, timeout: int) -> MagicMock:
+        guideline_id = url.rsplit("/", 1)[-1]
+        if guideline_id not in related:
+            raise requests.ConnectionError()
+        return MagicMock(json=lambda: related[guideline_id])
+
+    mocker.patch("app.transform.transformers.guideline.requests.get", side_effect=get)
+    select_docs = mocker.patch(
+        "app.transform.transformers.guideline.select_docs",
+        return_value=[
+            {"pid": "pid.a", "title": ["A"]},
+            {"pid": ["pid.b"], "title": ["B"], "type": "data source"},
+            {"pid": "pid.a", "title": ["A duplicate"]},
+        ],
+    )
+    df = pd.DataFrame({"id": ["ig1", "ig2", "ig3"]})
+
+    harvest_related_services(df)
+
+    select_docs.assert_called_once()
+    assert select_docs.call_args.kwargs["s_col_name"].endswith("all_collection")
+    assert "rows" not in select_docs.call_args.kwargs
+    assert json.loads(df["related_services_summary"][0]) == [
+        {"pid": "pid.a", "title": ["A"]},
+        {"pid": ["pid.b"], "title": ["B"], "type": "data source"},
+    ]
+    assert json.loads(df["related_services_summary"][1]) == []
+    assert pd.isna(df["related_services_summary"][2])
+    assert df["related_services_updated_at"][0].endswith("Z")
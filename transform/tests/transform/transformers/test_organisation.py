@@ -0,0 +1,82 @@
+import json
+
+from pyspark.sql import SparkSession
+
+from app.settings import settings
+from app.transform.transformers.organisation import OrganisationTransformer
+from app.transform.utils.load import load_request_data
+
+ORGANISATION_SCHEMA = (
+    "alternativenames array<string>, title string, abbreviation string,"
+    " country struct<code:string, label:string>,"
+    " pid array<struct<type:string, value:string>>"
+)
+
+
+def test_harvest_organisation_properties(spark: SparkSession) -> None:
+    df = spark.createDataFrame(
+        [
+            (
+                ["Uni B", "University", "Uni A", "UNI"],
+                "University",
+                "UNI",
+                ("PL", "Poland"),
+                [("ROR", "r1"), ("GRID", "g1"), ("ror", "r1"), ("", "x")],
+            ),
+            (["Title"], "Title", None, None, None),
+        ],
+        ORGANISATION_SCHEMA,
+    )
+
+    df = OrganisationTransformer.harvest_alternative_names(df)
+    df = OrganisationTransformer.harvest_country(df)
+    rows = OrganisationTransformer.harvest_pids(df).collect()
+
+    assert rows[0].alternative_names == ["Uni A", "Uni B"]
+    assert rows[0].country == ["Poland"]
+    assert json.loads(rows[0].pids) == {"grid": ["g1"], "ror": ["r1"]}
+
+    assert rows[1].alternative_names is None
+    assert rows[1].country == [None]
+    assert json.loads(rows[1].pids) == {}
+
+
+def test_organisation_transformer(spark: SparkSession) -> None:
+    data = [
+        {
+            "alternativenames": ["Uni", "University"],
+            "country": {"code": "PL", "label": "Poland"},
+            "id": "organisation1",
+            "legalname": "University",
+            "legalshortname": "UNI",
+            "pid": [{"type": "ROR", "value": "r1"}],
+            "related_dataset_ids": ["d1"],
+            "related_organisation_titles": [],
+            "related_other_ids": [],
+            "related_publication_ids": ["p1", "p2"],
+            "related_software_ids": [],
+            "websiteurl": "https://university.pl",
+        }
+    ]
+    df = load_request_data(
+        spark,
+        data,
+        settings.COLLECTIONS[settings.ORGANISATION]["INPUT_SCHEMA"],
+        "organisation",
+    )
+    transformer = OrganisationTransformer(spark)
+
+    try:
+        rows = transformer(df).collect()
+    finally:
+        transformer.unpersist()
+
+    assert len(rows) == 1
+    organisation = rows[0].asDict()
+    assert set(organisation) <= set(
+        settings.COLLECTIONS[settings.ORGANISATION]["OUTPUT_SCHEMA"]
+    )
+    assert organisation["type"] == "organisation"
+    assert organisation["title"] == "University"
+    assert organisation["alternative_names"] == ["Uni"]
+    assert organisation["related_publication_number"] == 2
@@ -0,0 +1,125 @@
+from pyspark.sql import SparkSession
+
+from app.settings import settings
+from app.transform.transformers.project import ProjectTransformer
+from app.transform.utils.load import load_request_data
+
+PROJECT_SCHEMA = (
+    "abbreviation string, code string, description string, end_date string,"
+    " open_access_mandate_for_dataset boolean, open_access_mandate_for_publications"
+    " boolean, start_date string, subject string, title string,"
+    " granted struct<currency:string, totalcost:double>, keywords string,"
+    " funding array<struct<funding_stream:struct<description:string>, name:string>>"
+)
+
+
+def test_harvest_project_properties(spark: SparkSession) -> None:
+    df = spark.createDataFrame(
+        [
+            (
+                "AB",
+                "123",
+                "Description",
+                "2021-12-31",
+                True,
+                None,
+                "2020-01-01",
+                "Subject",
+                "Title",
+                ("€", 100.5),
+                "a, b ,, c",
+                [(("H2020",), "EC"), ((None,), "EC")],
+            ),
+            (
+                "",
+                None,
+                None,
+                "2019-01-01",
+                None,
+                None,
+                "2020-01-01",
+                None,
+                "Title",
+                None,
+                " , ",
+                None,
+            ),
+        ],
+        PROJECT_SCHEMA,
+    )
+
+    df = ProjectTransformer.harvest_granted(df)
+    df = ProjectTransformer.harvest_keywords(df)
+    df = ProjectTransformer.harvest_funding(df)
+    df = ProjectTransformer.harvest_eosc_score(df)
+    rows = ProjectTransformer.harvest_date_range(df).collect()
+
+    assert rows[0].currency == "EUR"
+    assert rows[0].total_cost == 100.5
+    assert rows[0].keywords == ["a", "b", "c"]
+    assert sorted(rows[0].funding_stream_title, key=str) == ["H2020", None]
+    assert rows[0].funding_title == ["EC"]
+    assert rows[0].eosc_score == 13
+    assert rows[0].date_range == "[2020-01-01 TO 2021-12-31]"
+
+    assert rows[1].currency is None
+    assert rows[1].keywords == []
+    assert rows[1].funding_title == []
+    assert rows[1].eosc_score == 3
+    assert rows[1].date_range is None
+
+
+def test_project_transformer(spark: SparkSession) -> None:
+    data = [
+        {
+            "acronym": "AB",
+            "callidentifier": "H2020-1",
+            "code": "123",
+            "enddate": "2021-12-31",
+            "funding": [
+                {
+                    "funding_stream": {"description": "H2020", "id": "1"},
+                    "jurisdiction": "EU",
+                    "name": "EC",
+                    "shortName": "EC",
+                }
+            ],
+            "granted": {"currency": "€", "fundedamount": 50.0, "totalcost": 100.5},
+            "h2020programme": [{"code": "1", "description": "Programme"}],
+            "id": "project1",
+            "keywords": "a, b",
+            "openaccessmandatefordataset": True,
+            "openaccessmandateforpublications": False,
+            "related_dataset_ids": ["d1", "d2"],
+            "related_organisation_titles": ["Organisation"],
+            "related_other_ids": [],
+            "related_publication_ids": ["p1"],
+            "related_software_ids": [],
+            "startdate": "2020-01-01",
+            "subject": ["Subject"],
+            "summary": "Description",
+            "title": "Title",
+            "websiteurl": "https://project.eu",
+        }
+    ]
+    df = load_request_data(
+        spark, data, settings.COLLECTIONS[settings.PROJECT]["INPUT_SCHEMA"], "project"
+    )
+    transformer = ProjectTransformer(spark)
+
+    try:
+        rows = transformer(df).collect()
+    finally:
+        transformer.unpersist()
+
+    assert len(rows) == 1
+    project = rows[0].asDict()
+    assert set(project) <= set(settings.COLLECTIONS[settings.PROJECT]["OUTPUT_SCHEMA"])
+    assert project["type"] == "project"
+    assert project["abbreviation"] == "AB"
+    assert project["currency"] == "EUR"
+    assert project["keywords"] == ["a", "b"]
+    assert project["funding_title"] == ["EC"]
+    assert project["related_dataset_number"] == 2
+    assert project["related_other_number"] == 0
+    assert project["date_range"] == "[2020-01-01 TO 2021-12-31]"
@@ -0,0 +1,106 @@
+import json
+from unittest.mock import MagicMock
+
+from pytest_mock import MockerFixture
+
+from app.transform.utils.bundles import (
+    get_offers_summaries,
+    refresh_bundles_offers_summaries,
+    select_changed_bundles,
+    summarize_bundle_offers,
+)
+
+
+def test_get_offers_summaries(mocker: MockerFixture) -> None:
+    offers = [{"id": "10001", "title": ["Offer"], "service_id": 1}]
+    services = [{"id": "1", "title": ["Service"], "resource_organisation": "org"}]
+    responses = [
+        MagicMock(status_code=200, json=lambda: {"response": {"docs": offers}}),
+        MagicMock(status_code=200, json=lambda: {"response": {"docs": services}}),
+    ]
+    get = mocker.patch("app.services.solr.fetch.requests.get", side_effect=responses)
+
+    summaries = get_offers_summaries(["10001", "10002"])
+
+    assert summaries == {"10001": {**offers[0], "service": services[0]}}
+    assert get.call_count == 2
+    assert get.call_args_list[1].kwargs["params"]["ids"] == "1"
+
+
+def test_get_offers_summaries_splits_ids(mocker: MockerFixture) -> None:
+    mocker.patch("app.services.solr.fetch.MAX_VALUES_PER_REQUEST", 2)
+    get = mocker.patch(
+        "app.services.solr.fetch.requests.get",
+        return_value=MagicMock(
+            status_code=200, json=lambda: {"response": {"docs": []}}
+        ),
+    )
+
+    assert not get_offers_summaries(["1", "2", "3"])
+    assert [call.kwargs["params"]["ids"] for call in get.call_args_list] == [
+        "1,2",
+        "3",
+    ]
+
+
+def test_summarize_bundle_offers() -> None:
+    summaries = {"10001": {"id": "10001"}, "10003": {"id": "10003"}}
+
+    assert [
+        json.loads(offer)
+        for offer in summarize_bundle_offers("10001", [10003], summaries)
+    ] == [{"id": "10001"}, {"id": "10003"}]
+    assert summarize_bundle_offers(None, None, summaries) is None
+
+
+def test_summarize_bundle_offers_with_missing_offer() -> None:
+    summaries = {"10001": {"id": "10001"}, "10003": {"id": "10003"}}
+
+    assert summarize_bundle_offers("10001", [10002, 10003], summaries) is None
+
+
+def test_refresh_bundles_after_full_update(mocker: MockerFixture) -> None:
+    select_docs = mocker.patch(
+        "app.transform.utils.bundles.select_docs",
+        return_value=[{"id": "b1", "main_offer_id": 10001}],
+    )
+    mocker.patch(
+        "app.transform.utils.bundles.get_offers_summaries",
+        return_value={"10001": {"id": "10001"}},
+    )
+    post = mocker.patch(
+        "app.transform.utils.bundles.requests.post",
+        return_value=MagicMock(status_code=200),
+    )
+
+    refresh_bundles_offers_summaries("offer", [], full_update=True)
+
+    select_docs.assert_called_once()
+    assert select_docs.call_args.args[:2] == ("bundle", "*:*")
+    assert post.call_args.kwargs["json"] == [
+        {"id": "b1", "offers_summary": {"set": ['{"id": "10001"}']}}
+    ]
+
+
+def test_select_changed_bundles_splits_queries(mocker: MockerFixture) -> None:
+    mocker.patch("app.transform.utils.bundles.MAX_VALUES_PER_REQUEST", 4)
+    select_docs = mocker.patch(
+        "app.transform.utils.bundles.select_docs",
+        side_effect=[
+            [{"id": "1"}, {"id": "2"}, {"id": "3"}],
+            [],
+            [{"id": "b1"}],
+            [{"id": "b1"}, {"id": "b2"}],
+        ],
+    )
+
+    bundles = select_changed_bundles("service", ["s1", "s2", "s3", "s4", "s5"])
+
+    assert bundles == [{"id": "b1"}, {"id": "b2"}]
+    queries = [call.args[1] for call in select_docs.call_args_list]
+    assert queries == [
+        'service_id:("s1" OR "s2" OR "s3" OR "s4")',
+        'service_id:("s5")',
+        'main_offer_id:("1" OR "2") OR offer_ids:("1" OR "2")',
+        'main_offer_id:("3") OR offer_ids:("3")',
+    ]
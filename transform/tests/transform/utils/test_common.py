@@ -0,0 +1,124 @@
+import json
+
+from pyspark.sql import SparkSession
+from pyspark.sql.functions import col
+
+from app.transform.utils.common import (
+    extract_doi,
+    harvest_exportation,
+    harvest_pids,
+    harvest_relations,
+    map_best_access_right,
+)
+
+INSTANCE_SCHEMA = (
+    "instance array<struct<url:array<string>, type:string, publicationdate:string,"
+    " license:string, hostedby:struct<key:string, value:string>>>"
+)
+
+
+def test_extract_doi(spark: SparkSession) -> None:
+    df = spark.createDataFrame(
+        [
+            (["https://zenodo.org/record/1", "https://doi.org/10.5281/1"],),
+            (["https://zenodo.org/record/1"],),
+            ([],),
+        ],
+        "urls array<string>",
+    )
+
+    dois = [
+        row.doi for row in df.select(extract_doi(col("urls")).alias("doi")).collect()
+    ]
+
+    assert dois == ["/10.5281/1", None, None]
+
+
+def test_harvest_exportation(spark: SparkSession) -> None:
+    df = spark.createDataFrame(
+        [
+            (
+                [
+                    (
+                        ["https://doi.org/10.1/x", "https://zenodo.org/1"],
+                        "Article",
+                        "2020-01-02",
+                        "CC-BY",
+                        ("key", "Zenodo"),
+                    ),
+                    ([], "", "", None, ("key", "Unknown Repository")),
+                ],
+            ),
+            (None,),
+        ],
+        INSTANCE_SCHEMA,
+    )
+
+    exportation = [row.exportation for row in harvest_exportation(df).collect()]
+
+    assert [json.loads(instance) for instance in exportation[0]] == [
+        {
+            "url": "https://doi.org/10.1/x",
+            "documentType": "Article",
+            "publicationYear": "2020",
+            "license": "CC-BY",
+            "hostedby": "Zenodo",
+            "extractedDoi": "/10.1/x",
+        },
+        {
+            "url": None,
+            "documentType": None,
+            "publicationYear": None,
+            "license": None,
+            "hostedby": "",
+            "extractedDoi": None,
+        },
+    ]
+    assert exportation[1] == []
+
+
+def test_harvest_pids(spark: SparkSession) -> None:
+    df = spark.createDataFrame(
+        [([("doi", "10.1/x"), ("pmid", "1"), ("doi", "10.1/y")],), (None,)],
+        "pid array<struct<scheme:string, value:string>>",
+    )
+
+    rows = harvest_pids(df).collect()
+
+    assert json.loads(rows[0].pids) == {
+        "arXiv": [],
+        "doi": ["10.1/x", "10.1/y"],
+        "handle": [],
+        "pdb": [],
+        "pmc": [],
+        "pmid": ["1"],
+        "w3id": [],
+    }
+    assert rows[0].doi == ["10.1/x", "10.1/y"]
+    assert rows[1].doi == []
+
+
+def test_harvest_relations(spark: SparkSession) -> None:
+    df = spark.createDataFrame(
+        [([("t1", ("IsCitedBy", "citation"))],), (None,)],
+        "relations array<struct<target:string, reltype:struct<name:string, type:string>>>",
+    )
+
+    rows = harvest_relations(df).collect()
+
+    assert rows[0].relations == ["t1"]
+    assert rows[0].relations_long == ["[t1, IsCitedBy, citation]"]
+    assert rows[1].relations == []
+    assert rows[1].relations_long == []
+
+
+def test_map_best_access_right(spark: SparkSession) -> None:
+    df = spark.createDataFrame(
+        [("open_access",), ("unexpected",), ("",), (None,)], "best_access_right string"
+    )
+
+    access_rights = [
+        row.best_access_right for row in map_best_access_right(df, "service").collect()
+    ]
+
+    assert access_rights == ["Open access", "unexpected", None, None]
@@ -0,0 +1,22 @@
+from pyspark.sql import SparkSession
+
+from app.transform.utils.join_dfs import join_different_dfs
+
+
+def test_join_different_dfs(spark: SparkSession) -> None:
+    main_df = spark.createDataFrame(
+        [("1", "a"), ("2", "b"), ("3", "c")], "id string, title string"
+    )
+    countries_df = spark.createDataFrame(
+        [("3", "PL"), ("1", "DE")], "id string, country string"
+    )
+    urls_df = spark.createDataFrame([("2", "https://b")], "id string, url string")
+
+    df = join_different_dfs((main_df, countries_df, urls_df))
+
+    assert sorted(df.collect()) == [
+        ("1", "a", "DE", None),
+        ("2", "b", None, "https://b"),
+        ("3", "c", "PL", None),
+    ]
+    assert df.columns == ["id", "title", "country", "url"]
@@ -0,0 +1,127 @@
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+from unittest.mock import MagicMock
+
+import pytest
+from pyspark.sql import SparkSession
+from pytest_mock import MockerFixture
+
+from app.services.solr.errors import SolrException
+from app.transform.utils.send import (
+    batch_docs,
+    commit_solr_collection,
+    index_df_in_solr,
+    post_with_retries,
+)
+
+
+def test_batch_docs() -> None:
+    docs = ['{"id":"1"}', '{"id":"2"}', '{"id":"3","title":"long title"}']
+
+    assert list(batch_docs(docs, 22)) == [
+        [b'{"id":"1"}', b'{"id":"2"}'],
+        [b'{"id":"3","title":"long title"}'],
+    ]
+    assert list(batch_docs([], 22)) == []
+
+
+def test_post_with_retries(mocker: MockerFixture) -> None:
+    sleep = mocker.patch("app.transform.utils.send.sleep")
+    session = MagicMock()
+    session.post.side_effect = [MagicMock(status_code=503), MagicMock(status_code=200)]
+
+    post_with_retries(session, "http://solr/update", b"{}", {}, retries=3)
+
+    assert session.post.call_count == 2
+    sleep.assert_called_once_with(1.0)
+
+
+def test_post_with_retries_fails_on_client_errors(mocker: MockerFixture) -> None:
+    mocker.patch("app.transform.utils.send.sleep")
+    session = MagicMock()
+    session.post.return_value = MagicMock(status_code=400, text="Bad request")
+
+    with pytest.raises(SolrException):
+        post_with_retries(session, "http://solr/update", b"{}", {}, retries=3)
+
+    assert session.post.call_count == 1
+
+
+def test_commit_solr_collection_retries(mocker: MockerFixture) -> None:
+    sleep = mocker.patch("app.transform.utils.send.sleep")
+    post = mocker.patch(
+        "app.transform.utils.send.requests.Session.post",
+        side_effect=[MagicMock(status_code=503), MagicMock(status_code=200)],
+    )
+
+    commit_solr_collection("training", retries=3)
+
+    assert post.call_count == 2
+    assert post.call_args.kwargs["data"] == b'{"commit": {}}'
+    sleep.assert_called_once_with(1.0)
+
+
+@pytest.fixture
+def solr_requests() -> Iterator[tuple[str, list[tuple[str, bytes]]]]:
+    """Local HTTP server recording paths and decompressed bodies of the requests"""
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:  # pylint: disable=invalid-name
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            if self.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            received.append((self.path, body))
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/", received
+    server.shutdown()
+
+
+def test_index_df_in_solr(
+    spark: SparkSession,
+    mocker: MockerFixture,
+    solr_requests: tuple[str, list[tuple[str, bytes]]],
+) -> None:
+    solr_url, received = solr_requests
+    mocker.patch("app.settings.settings.SOLR_URL", solr_url)
+    mocker.patch(
+        "app.settings.settings.COLLECTIONS",
+        {"training": {"SOLR_COL_NAMES": ["all_collection", "training"]}},
+    )
+    mocker.patch("app.settings.settings.SOLR_INDEX_BATCH_BYTES", 70)
+    mocker.patch("app.settings.settings.SOLR_INDEX_PARALLELISM", 2)
+    mocker.patch("app.settings.settings.SOLR_INDEX_GZIP", True)
+    df = spark.createDataFrame(
+        [(str(i), f"Training {i}") for i in range(10)], "id string, title string"
+    ).repartition(4)
+
+    assert index_df_in_solr(df, "training") == 10
+
+    updates = [
+        (path, body) for path, body in received if path.endswith("/update/json/docs")
+    ]
+    for s_col_name in ("all_collection", "training"):
+        batches = [
+            body.splitlines()
+            for path, body in updates
+            if path.startswith(f"/solr/{s_col_name}/")
+        ]
+        assert all(len(batch) <= 2 for batch in batches)
+        assert sorted(json.loads(doc)["id"] for batch in batches for doc in batch) == [
+            str(i) for i in range(10)
+        ]
+    assert received[-2:] == [
+        ("/solr/all_collection/update", b'{"commit": {}}'),
+        ("/solr/training/update", b'{"commit": {}}'),
+    ]